@@ -0,0 +1,101 @@
+import bisect
+import copy
+from dataclasses import dataclass, field
+from enum import Enum
+
+# Upper bounds (seconds) of the fixed latency histogram buckets; one
+# extra overflow bucket counts anything slower than the last bound.
+# Spans a fast arm command through a slow clip download.
+LATENCY_BUCKET_BOUNDS_SECONDS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+class CallOutcome(Enum):
+    """How a single instrumented API call ended."""
+
+    SUCCESS = "success"
+    TIMEOUT = "timeout"
+    ERROR = "error"
+    # Refused before reaching the API (open circuit, exhausted deadline);
+    # counted, but has no latency.
+    REJECTED = "rejected"
+
+
+def _empty_buckets() -> list[int]:
+    """One zeroed counter per bucket, plus the overflow bucket."""
+    return [0] * (len(LATENCY_BUCKET_BOUNDS_SECONDS) + 1)
+
+
+@dataclass
+class OperationMetrics:
+    """Outcome counters and a fixed-bucket latency histogram for one
+    operation. Memory use is constant regardless of call volume."""
+
+    success: int = 0
+    timeout: int = 0
+    error: int = 0
+    rejected: int = 0
+    bucket_counts: list[int] = field(default_factory=_empty_buckets)
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def calls(self) -> int:
+        """Number of calls that actually reached the API (and so have a
+        recorded latency) — rejected calls are excluded."""
+        return self.success + self.timeout + self.error
+
+    @property
+    def mean_seconds(self) -> float | None:
+        """Mean latency of measured calls, or None if there are none."""
+        return self.total_seconds / self.calls if self.calls else None
+
+    def record(self, outcome: CallOutcome, seconds: float | None) -> None:
+        """Count one call; `seconds` is ignored for REJECTED calls."""
+        if outcome is CallOutcome.REJECTED:
+            self.rejected += 1
+            return
+        setattr(self, outcome.value, getattr(self, outcome.value) + 1)
+        seconds = seconds or 0.0
+        index = bisect.bisect_left(LATENCY_BUCKET_BOUNDS_SECONDS, seconds)
+        self.bucket_counts[index] += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Estimate the latency below which `fraction` (0..1] of measured
+        calls fell, as the upper bound of the bucket it lands in (the
+        observed maximum for the overflow bucket). None if no calls."""
+        if not self.calls:
+            return None
+        target = fraction * self.calls
+        seen = 0
+        for index, count in enumerate(self.bucket_counts):
+            seen += count
+            if seen >= target and count:
+                if index < len(LATENCY_BUCKET_BOUNDS_SECONDS):
+                    return min(
+                        LATENCY_BUCKET_BOUNDS_SECONDS[index], self.max_seconds
+                    )
+                return self.max_seconds
+        return self.max_seconds
+
+
+class ApiMetrics:
+    """Per-operation OperationMetrics, keyed by operation name."""
+
+    def __init__(self) -> None:
+        """Start with no operations recorded."""
+        self._operations: dict[str, OperationMetrics] = {}
+
+    def record(
+        self, operation: str, outcome: CallOutcome, seconds: float | None
+    ) -> None:
+        """Record one call of `operation`."""
+        metrics = self._operations.get(operation)
+        if metrics is None:
+            metrics = self._operations[operation] = OperationMetrics()
+        metrics.record(outcome, seconds)
+
+    def snapshot(self) -> dict[str, OperationMetrics]:
+        """Return an independent copy of every operation's metrics."""
+        return copy.deepcopy(self._operations)
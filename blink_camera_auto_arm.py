@@ -10,8 +10,12 @@ from dataclasses import dataclass, field
 
 from dotenv import load_dotenv
 
-from blink_service import BlinkService, ConnectResult
+from blink_service import BlinkService, ConnectResult, MotionClip
+from clip_archiver import ClipArchiver
+from clip_index import ClipIndex
 from config import AppConfig, Config
+from media_worker import MediaWorker
+from motion_index import MotionIndex
 from presence_monitor import Presence, PresenceMonitor
 from state import AppState
 from telegram_bot import TelegramBot
@@ -25,6 +29,15 @@ _BACKOFF_MAX_SECONDS = 1800
 # Minimum time between repeated "still can't connect" notifications while
 # backed off, so a prolonged outage doesn't spam Telegram every retry.
 _CONNECT_FAILURE_NOTIFY_INTERVAL_SECONDS = 900
+# Upper bound on the total time Blink API calls may take within one
+# main-loop iteration (see BlinkService.deadline()) — long enough for a
+# slow clip download, short enough that a degraded Blink cloud can't
+# stall the loop for many minutes.
+_ITERATION_DEADLINE_SECONDS = 240
+# How often the local clip index picks up new entries from Blink's video
+# history — fresh enough for `/cambot clips` searches, rare enough to
+# cost one history request per few minutes.
+_CLIP_INDEX_SYNC_SECONDS = 300
 
 
 @dataclass
@@ -34,8 +47,23 @@ class LoopContext:
     not user-facing).
     """
 
-    last_motion_seen: dict[str, str | None] = field(default_factory=dict)
-    motion_alerts_primed: bool = False
+    # Delivered motion clips, persisted across restarts.
+    motion_index: MotionIndex
+    # Copies every new motion clip to local storage, if configured.
+    clip_archiver: ClipArchiver | None = None
+    # Local index of clip metadata, kept in step with Blink's history.
+    clip_index: ClipIndex | None = None
+    next_clip_index_sync: float = 0.0
+    # The clip index sync in progress, run beside the loop so a long
+    # history backfill never holds up an iteration.
+    clip_index_sync_task: asyncio.Task[None] | None = None
+    # Downloads and sends motion clips in a child process, if enabled.
+    media_worker: MediaWorker | None = None
+    # Clip follow-ups handed to the media worker and not yet finished.
+    media_tasks: set[asyncio.Task[None]] = field(default_factory=set)
+    # Set once commanded_camera_states has been seeded from the first
+    # successful refresh.
+    commanded_states_seeded: bool = False
     # Connection-failure backoff/notification bookkeeping.
     connect_failure_count: int = 0
     next_connect_attempt_time: float = 0.0
@@ -56,6 +84,30 @@ def _connect_backoff_seconds(failure_count: int) -> float:
     return backoff + jitter
 
 
+async def _confirm_arm_command(
+    blink: BlinkService, bot: TelegramBot, camera_name: str, armed: bool
+) -> None:
+    """Poll the status of the arm/disarm command just sent to
+    `camera_name` and alert if Blink reports it failed, rather than
+    waiting for the next refresh to show the camera in the wrong state.
+    """
+    verb = "arm" if armed else "disarm"
+    try:
+        confirmed = await blink.confirm_arm_command(camera_name)
+    except Exception:
+        _LOGGER.exception(
+            "Could not confirm %s command for camera '%s'.", verb, camera_name
+        )
+        return
+    if confirmed is False:
+        _LOGGER.warning(
+            "Blink did not complete %s command for camera '%s'.",
+            verb,
+            camera_name,
+        )
+        await bot.send_message(f"Camera failed to {verb}: {camera_name}.")
+
+
 async def run_iteration(
     cfg: AppConfig,
     state: AppState,
@@ -143,11 +195,18 @@ async def run_iteration(
             return  # do NOT disable the app — retry next iteration
 
     # --- Periodic refresh ---
-    try:
-        await blink.refresh()
-    except Exception:
-        _LOGGER.exception("Failed to refresh Blink data.")
-        return
+    # Paced by BlinkService's adaptive cadence, not made every iteration:
+    # a short ping interval or a throttled account would otherwise keep
+    # hitting Blink's rate limits. Until it's due again, the rest of the
+    # iteration works from the last refresh's data. Only the controlled
+    # cameras (and any the bot was just asked about) are refreshed; the
+    # rest of the account is left to `/cambot cameras refresh`.
+    if blink.refresh_due():
+        try:
+            await blink.refresh(cfg.controlled_cameras)
+        except Exception:
+            _LOGGER.exception("Failed to refresh Blink data.")
+            return
 
     # --- Stale camera reconciliation ---
     # A camera renamed (or deleted) on the Blink side leaves a stale
@@ -166,8 +225,23 @@ async def run_iteration(
             "<name>."
         )
 
+    cameras = blink.list_all_cameras()
+
+    # --- Seed commanded state (first refresh after startup only) ---
+    # Adopt the armed state Blink reports as what was last commanded, so
+    # a restart doesn't re-send arm/disarm (and a notification) to every
+    # controlled camera that is already in the desired state. Anything
+    # commanded before this point (e.g. via Telegram) takes precedence.
+    # A camera whose state Blink doesn't know is left unseeded, so it is
+    # still sent whatever presence calls for.
+    if not ctx.commanded_states_seeded:
+        for cam in cameras:
+            if cam.arm_state_known:
+                state.commanded_camera_states.setdefault(cam.name, cam.armed)
+        ctx.commanded_states_seeded = True
+
     # --- Update camera status cache (display only) ---
-    for cam in blink.list_all_cameras():
+    for cam in cameras:
         state.camera_armed_status[cam.name] = cam.armed
         expected = state.commanded_camera_states.get(cam.name)
         if expected is not None and cam.armed != expected:
@@ -205,6 +279,10 @@ async def run_iteration(
     else:
         someone_home = presence is Presence.HOME
         # --- Auto arm/disarm ---
+        # Commands sent, as (camera, armed), confirmed only once every
+        # camera has had its command, so no camera's command waits on
+        # another's confirmation.
+        sent: list[tuple[str, bool]] = []
         for camera_name in cfg.controlled_cameras:
             currently_commanded = state.commanded_camera_states.get(camera_name)
             try:
@@ -220,6 +298,7 @@ async def run_iteration(
                         await bot.send_message(
                             f"Nobody home. Arming: {camera_name}."
                         )
+                        sent.append((camera_name, True))
                     else:
                         _LOGGER.warning(
                             "Controlled camera '%s' not found in Blink "
@@ -238,6 +317,7 @@ async def run_iteration(
                         await bot.send_message(
                             f"Someone home. Disarming: {camera_name}."
                         )
+                        sent.append((camera_name, False))
                     else:
                         _LOGGER.warning(
                             "Controlled camera '%s' not found in Blink "
@@ -249,29 +329,131 @@ async def run_iteration(
                     "Failed to arm/disarm camera '%s'.", camera_name
                 )
                 continue
+        if cfg.arm_confirmation_enabled and sent:
+            await asyncio.gather(
+                *(
+                    _confirm_arm_command(blink, bot, camera_name, armed)
+                    for camera_name, armed in sent
+                )
+            )
 
-    # --- Motion alerts ---
-    if cfg.motion_alerts_enabled:
+    # --- Motion alerts / clip archiving ---
+    if cfg.motion_alerts_enabled or ctx.clip_archiver is not None:
         # Scope motion polling to controlled cameras only — matches the
         # documented behavior. An uncontrolled camera must never
         # generate a proactive alert.
-        events = await blink.get_new_motion_events(
-            ctx.last_motion_seen, camera_names=cfg.controlled_cameras
+        index = ctx.motion_index
+        clips = await blink.new_motion_clips(
+            index.last_seen(), camera_names=cfg.controlled_cameras
+        )
+        new_clips = [
+            clip
+            for clip in clips
+            if not index.is_delivered(clip.camera_name, clip.clip_url)
+        ]
+        # A camera not yet in the index (first run, newly controlled)
+        # only has its existing clips recorded — nothing is sent or
+        # downloaded for them.
+        to_send = [
+            clip
+            for clip in new_clips
+            if cfg.motion_alerts_enabled and index.is_tracked(clip.camera_name)
+        ]
+        if ctx.clip_archiver is not None and new_clips:
+            # Archived in the background, after any downloads below.
+            ctx.clip_archiver.submit(new_clips)
+        # Alert first, from the thumbnail already in memory, so the
+        # notification doesn't wait on the clip download and upload.
+        for clip in to_send:
+            msg = f"Motion detected: {clip.camera_name} at {clip.clip_time}."
+            if clip.thumbnail is not None:
+                await bot.send_photo(msg, clip.thumbnail)
+            else:
+                await bot.send_message(msg)
+        # Alerted clips count as delivered even if their follow-up fails
+        # — re-polling them would only repeat the alert.
+        for clip in new_clips:
+            index.mark_delivered(
+                clip.camera_name, clip.clip_time, clip.clip_url
+            )
+        index.track(cfg.controlled_cameras)
+        if to_send and ctx.media_worker is not None:
+            # Downloaded and uploaded by the worker process, in the
+            # background: a job can take minutes, or wait for an archive
+            # copy already running in the worker, and neither this
+            # iteration nor the next arm/disarm should wait for that.
+            task = asyncio.create_task(
+                _send_clips_via_worker(ctx.media_worker, blink, to_send)
+            )
+            ctx.media_tasks.add(task)
+            task.add_done_callback(ctx.media_tasks.discard)
+        elif to_send:
+            # Follow up with each clip as its download finishes (oldest
+            # first per camera), closing its spooled file once sent.
+            async with contextlib.aclosing(
+                blink.iter_motion_clip_downloads(to_send)
+            ) as events:
+                async for event in events:
+                    if event.clip_file is None:
+                        continue
+                    with event.clip_file:
+                        await bot.send_video(
+                            f"Motion clip: {event.camera_name} at "
+                            f"{event.clip_time}.",
+                            event.clip_file,
+                        )
+        index.flush_if_due()
+
+    # --- Clip index sync ---
+    # Started in the background, not awaited: its BACKGROUND-priority
+    # history reads yield to every other Blink call, which would make
+    # this iteration (and the next arm/disarm) wait for all of them. It
+    # still shares this iteration's deadline (see BlinkService.deadline).
+    now = time.monotonic()
+    if (
+        ctx.clip_index is not None
+        and now >= ctx.next_clip_index_sync
+        and (
+            ctx.clip_index_sync_task is None or ctx.clip_index_sync_task.done()
+        )
+    ):
+        ctx.next_clip_index_sync = now + _CLIP_INDEX_SYNC_SECONDS
+        ctx.clip_index_sync_task = asyncio.create_task(
+            _sync_clip_index(ctx.clip_index, blink)
         )
-        should_send = ctx.motion_alerts_primed
-        for event in events:
-            ctx.last_motion_seen[event.camera_name] = event.clip_time
-        ctx.motion_alerts_primed = True
-        if should_send:
-            for event in events:
-                msg = (
-                    f"Motion detected: {event.camera_name} at "
-                    f"{event.clip_time}."
-                )
-                if event.clip_bytes:
-                    await bot.send_video(msg, event.clip_bytes)
-                else:
-                    await bot.send_message(msg)
+
+
+async def _send_clips_via_worker(
+    media_worker: MediaWorker, blink: BlinkService, clips: list[MotionClip]
+) -> None:
+    """Have the media worker send each clip to the chat, in order."""
+    for clip in clips:
+        try:
+            headers = blink.media_headers(clip.camera_name)
+        except Exception:
+            _LOGGER.exception(
+                "Could not send '%s' clip at %s.",
+                clip.camera_name,
+                clip.clip_time,
+            )
+            continue
+        if headers is None:
+            continue
+        await media_worker.send_clip(
+            clip.clip_url,
+            headers,
+            f"Motion clip: {clip.camera_name} at {clip.clip_time}.",
+        )
+
+
+async def _sync_clip_index(clip_index: ClipIndex, blink: BlinkService) -> None:
+    """Bring the clip index up to date, logging (not raising) failures."""
+    try:
+        changes = await clip_index.sync(blink)
+        if changes:
+            _LOGGER.debug("Clip index: %d entries updated.", changes)
+    except Exception:
+        _LOGGER.exception("Failed to sync the clip index.")
 
 
 async def run_main_loop(
@@ -280,18 +462,37 @@ async def run_main_loop(
     blink: BlinkService,
     monitor: PresenceMonitor,
     bot: TelegramBot,
+    motion_index: MotionIndex,
+    clip_archiver: ClipArchiver | None = None,
+    clip_index: ClipIndex | None = None,
+    media_worker: MediaWorker | None = None,
 ) -> None:
     """Main control loop. Runs concurrently with bot.start() as a sibling
     asyncio task; both are expected to run until cancelled by main()'s
     shutdown sequence.
     """
-    ctx = LoopContext()
-    while True:
-        await asyncio.sleep(cfg.ping_interval_seconds)
-        try:
-            await run_iteration(cfg, state, blink, monitor, bot, ctx)
-        except Exception:
-            _LOGGER.exception("Unhandled error in main loop iteration.")
+    ctx = LoopContext(
+        motion_index=motion_index,
+        clip_archiver=clip_archiver,
+        clip_index=clip_index,
+        media_worker=media_worker,
+    )
+    try:
+        while True:
+            await asyncio.sleep(cfg.ping_interval_seconds)
+            try:
+                with blink.deadline(_ITERATION_DEADLINE_SECONDS):
+                    await run_iteration(cfg, state, blink, monitor, bot, ctx)
+            except Exception:
+                _LOGGER.exception("Unhandled error in main loop iteration.")
+    finally:
+        # Stop background work before main() closes what it uses.
+        background = [*ctx.media_tasks]
+        if ctx.clip_index_sync_task is not None:
+            background.append(ctx.clip_index_sync_task)
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
 
 
 def _configure_logging() -> None:
@@ -315,9 +516,33 @@ async def main() -> None:
     config = Config()
     cfg = config.load()
     state = AppState()
+    motion_index = MotionIndex()
+    motion_index.load()
+    clip_index = ClipIndex()
+    clip_index.open()
 
     monitor = PresenceMonitor(cfg.monitored_ips, cfg.absence_checks)
-    blink = BlinkService(cfg.blink_username, cfg.blink_password)
+    blink = BlinkService(
+        cfg.blink_username,
+        cfg.blink_password,
+        clip_spool_dir=cfg.clip_spool_dir,
+    )
+    media_worker = None
+    if cfg.media_worker_enabled:
+        media_worker = MediaWorker(
+            cfg.telegram_bot_token,
+            cfg.telegram_chat_id,
+            spool_dir=cfg.clip_spool_dir,
+        )
+    clip_archiver = None
+    if cfg.clip_archive_dir:
+        clip_archiver = ClipArchiver(
+            blink,
+            cfg.clip_archive_dir,
+            clip_index=clip_index,
+            media_worker=media_worker,
+        )
+        await clip_archiver.start()
     bot = TelegramBot(
         token=cfg.telegram_bot_token,
         chat_id=cfg.telegram_chat_id,
@@ -327,6 +552,7 @@ async def main() -> None:
         state=state,
         blink=blink,
         monitor=monitor,
+        clip_index=clip_index,
     )
 
     loop = asyncio.get_running_loop()
@@ -347,7 +573,17 @@ async def main() -> None:
             loop.add_signal_handler(sig, _request_shutdown)
 
     main_loop_task = asyncio.create_task(
-        run_main_loop(cfg, state, blink, monitor, bot)
+        run_main_loop(
+            cfg,
+            state,
+            blink,
+            monitor,
+            bot,
+            motion_index,
+            clip_archiver,
+            clip_index,
+            media_worker,
+        )
     )
     bot_task = asyncio.create_task(bot.start())
     stop_task = asyncio.create_task(stop_event.wait())
@@ -370,6 +606,13 @@ async def main() -> None:
         await asyncio.gather(
             main_loop_task, bot_task, stop_task, return_exceptions=True
         )
+        motion_index.flush()
+        if clip_archiver is not None:
+            await clip_archiver.close()
+        if media_worker is not None:
+            await media_worker.close()
+        clip_index.close()
+        await blink.close()
         await bot.shutdown()
 
 
@@ -1,16 +1,46 @@
 import asyncio
+import contextlib
+import contextvars
+import dataclasses
+import functools
+import hashlib
+import json
 import logging
 import os
-from collections.abc import Awaitable
+import tempfile
+import time
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+)
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
-from typing import TypeVar
+from types import MappingProxyType
+from typing import IO, TypeVar
+from urllib.parse import urljoin
 
+from aiohttp import ClientSession, TCPConnector
+from blinkpy import api
 from blinkpy.auth import Auth, BlinkTwoFARequiredError
 from blinkpy.blinkpy import Blink
-from blinkpy.helpers.util import json_load
+from blinkpy.helpers.util import json_load, to_alphanumeric
+
+from api_metrics import ApiMetrics, CallOutcome, OperationMetrics
+from circuit_breaker import CircuitBreaker, CircuitStatus
+from config import write_json_atomically
+from local_storage import LocalClip, LocalManifest
+from priority_lock import Priority, PriorityLock
+from refresh_scheduler import (
+    RefreshCadence,
+    RefreshScheduler,
+    parse_retry_after,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,6 +54,75 @@ DEFAULT_CREDENTIALS_FILE = APP_DIR / "blink_credentials.json"
 # not block the main loop indefinitely.
 BLINK_CALL_TIMEOUT_SECONDS = 30
 
+# Per-operation overrides of BLINK_CALL_TIMEOUT_SECONDS, keyed like the
+# circuit breaker (operation name before any ':'). Arm/disarm is a small
+# command that should fail fast, while clip downloads and video-history
+# paging legitimately take longer. Extended/overridden per instance via
+# BlinkService(operation_timeouts=...).
+BLINK_OPERATION_TIMEOUT_SECONDS: dict[str, float] = {
+    "arm_camera": 10,
+    "download_clip": 120,
+    "list_videos": 60,
+    "local_clip": 120,
+}
+
+# Circuit breaker for Blink API calls, tracked per operation (the part
+# of the operation name before any ':'): after this many consecutive
+# failures/timeouts the operation fails fast with BlinkUnavailableError
+# instead of burning its timeout per call, until a single probe call is
+# let through after BREAKER_RESET_SECONDS.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_SECONDS = 60
+# Operations whose circuit is tracked per target (the full operation
+# name, e.g. "arm_camera:Backyard") instead: one camera that keeps
+# failing must never stop the others from being armed.
+_PER_TARGET_CIRCUITS = frozenset({"arm_camera"})
+
+# A successful refresh younger than this is reused by refresh() instead
+# of triggering another round trip — the main loop and
+# `/cambot cameras refresh` landing within a few seconds of each other
+# don't need two copies of the same account state.
+REFRESH_MAX_AGE_SECONDS = 5
+
+# The main loop's periodic refresh is paced by an adaptive cadence (see
+# refresh_due()) rather than made every iteration: at most every
+# REFRESH_MIN_INTERVAL_SECONDS (blinkpy's own refresh rate, below which
+# blink.refresh() is a no-op anyway) while Blink is happy, backing off
+# to as much as REFRESH_MAX_INTERVAL_SECONDS while it throttles us.
+REFRESH_MIN_INTERVAL_SECONDS = 30
+REFRESH_MAX_INTERVAL_SECONDS = 15 * 60
+
+# A partial refresh (refresh(camera_names)) also covers any camera a
+# snapshot or clip was requested for within this long, so the status of
+# a camera the user is looking at stays current even if it isn't one
+# the main loop manages.
+ON_DEMAND_REFRESH_SECONDS = 15 * 60
+
+# snapshot() serves a camera's last snapshot from memory for this long
+# instead of waking a battery camera again — repeated `/cambot snapshot`
+# requests within the window return instantly.
+SNAPSHOT_CACHE_TTL_SECONDS = 30
+
+# After asking a camera for a new picture, snapshot() polls the camera's
+# info until its thumbnail changes — first after the initial delay, then
+# at doubling intervals capped at the maximum (0.5, 1, 2, 4, 4, ... s),
+# giving up after the timeout. Most cameras upload within a few seconds,
+# so the first polls are cheap and close together and a slow camera
+# costs a handful of calls, not one per second.
+SNAPSHOT_POLL_INITIAL_SECONDS = 0.5
+SNAPSHOT_POLL_MAX_INTERVAL_SECONDS = 4
+SNAPSHOT_POLL_TIMEOUT_SECONDS = 20
+
+# Maximum number of cameras snapshots() wakes at once — each snapshot is
+# mostly waiting for its camera to upload, so a handful overlap nicely
+# without flooding the sync modules.
+SNAPSHOT_CONCURRENCY = 4
+
+# Maximum number of motion clips iter_motion_clip_downloads() fetches at
+# once — enough to overlap a burst across several cameras without
+# opening an unbounded number of connections on the router.
+MOTION_CLIP_DOWNLOAD_CONCURRENCY = 3
+
 # How far back get_latest_clip() looks in Blink's cloud video history
 # when searching for a camera's most recent clip, and how many ~25-item
 # pages of that history it is willing to page through. Generous enough
@@ -32,8 +131,64 @@ BLINK_CALL_TIMEOUT_SECONDS = 30
 CLIP_LOOKUP_LOOKBACK_DAYS = 7
 CLIP_LOOKUP_MAX_PAGES = 10
 
+# A sync module's local-storage manifest (the list of clips on its USB
+# drive) is cached and reused for this long. Building a manifest makes
+# the sync module scan its storage, so repeated clip requests for a
+# local-only camera must not each trigger a new one.
+LOCAL_MANIFEST_MAX_AGE_SECONDS = 300
+
+# Sync-module commands (manifest builds, uploading a local clip to the
+# cloud for download) are polled at this interval, taking the lock
+# afresh for each poll, and given up on after the timeout.
+COMMAND_POLL_SECONDS = 1
+COMMAND_TIMEOUT_SECONDS = 60
+
+# confirm_arm_command() polls an arm/disarm command's status after
+# short, doubling intervals (0.5, 1, 2, 2, ... s) — Blink usually
+# completes it within a couple of seconds — and gives up after the
+# timeout, reporting the command as failed.
+ARM_CONFIRM_POLL_INITIAL_SECONDS = 0.5
+ARM_CONFIRM_POLL_MAX_INTERVAL_SECONDS = 2
+ARM_CONFIRM_TIMEOUT_SECONDS = 15
+
+# Motion clips are streamed from Blink in chunks of this size into a
+# spooled temporary file that also rolls over to disk at this size, so
+# peak memory per download is bounded by one chunk rather than by the
+# clip size — a burst of multi-megabyte clips must not pile up in RAM
+# on the router. The file rolls over into BlinkService's
+# `clip_spool_dir`: on routers whose /tmp is RAM-backed (tmpfs), point
+# that at real storage or the clips still end up in RAM.
+CLIP_DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+# The OAuth access token is refreshed in the background once less than
+# this much of its lifetime remains — well before blinkpy's own inline
+# refresh (60 s before expiry) would tack the token round trip onto
+# whichever call happens to come next, such as an arm command.
+TOKEN_REFRESH_MARGIN_SECONDS = 15 * 60
+# Delay before retrying a failed background token refresh.
+TOKEN_REFRESH_RETRY_SECONDS = 60
+
+# Tuning of the long-lived HTTP session BlinkService shares between
+# blinkpy and clip downloads. Idle connections are kept longer than the
+# main loop's default 60 s ping interval, so each iteration's refresh
+# and arm reuse a warm TLS connection instead of handshaking again, and
+# DNS answers are cached well beyond aiohttp's 10 s default because the
+# router's resolver is slow. The pool comfortably covers
+# MOTION_CLIP_DOWNLOAD_CONCURRENCY downloads alongside API calls.
+HTTP_POOL_SIZE = 10
+HTTP_POOL_SIZE_PER_HOST = 6
+HTTP_KEEPALIVE_SECONDS = 120
+HTTP_DNS_CACHE_TTL_SECONDS = 300
+
 T = TypeVar("T")
 
+# Absolute time.monotonic() deadline set by BlinkService.deadline(); a
+# context variable so it follows the caller into every nested call,
+# including tasks spawned on its behalf (which copy the context).
+_DEADLINE: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "blink_deadline", default=None
+)
+
 
 class ConnectResult(Enum):
     """Outcome of a BlinkService.connect() attempt."""
@@ -44,10 +199,47 @@ class ConnectResult(Enum):
 
 
 class BlinkTimeoutError(Exception):
-    """Raised when a Blink API call exceeds BLINK_CALL_TIMEOUT_SECONDS."""
+    """Raised when a Blink API call exceeds its operation's timeout
+    (BLINK_OPERATION_TIMEOUT_SECONDS, else BLINK_CALL_TIMEOUT_SECONDS)."""
 
 
-@dataclass
+class BlinkDeadlineExceededError(BlinkTimeoutError):
+    """Raised when a Blink API call is cut short, or not started at all,
+    because the caller's BlinkService.deadline() budget ran out."""
+
+
+class BlinkUnavailableError(Exception):
+    """Raised without calling Blink when the operation's circuit breaker
+    is open after repeated failures."""
+
+
+class _ThrottleAwareAuth(Auth):
+    """blinkpy Auth that reports Blink's throttling responses — a 429,
+    or an error carrying a Retry-After hint — to `on_throttle` (if set)
+    before handling them as usual.
+
+    Every blinkpy API request passes through validate_response(), so
+    this sees throttling on any call (a burst of arm commands as much as
+    a refresh), whichever HTTP session is in use.
+    """
+
+    on_throttle: Callable[[float | None], None] | None = None
+
+    async def validate_response(self, response, json_resp):
+        """Report throttling, then validate `response` as blinkpy does."""
+        status = getattr(response, "status", None)
+        if (
+            self.on_throttle is not None
+            and isinstance(status, int)
+            and status >= 400
+        ):
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if status == 429 or retry_after is not None:
+                self.on_throttle(retry_after)
+        return await super().validate_response(response, json_resp)
+
+
+@dataclass(frozen=True, slots=True)
 class CameraInfo:
     """Snapshot of a single Blink camera's identity and status."""
 
@@ -56,50 +248,307 @@ class CameraInfo:
     network_id: str
     product_type: str
     online: bool
+    # False while Blink hasn't reported an arm state (e.g. "unknown");
+    # `armed` is then False.
     armed: bool
     battery: str | None
+    arm_state_known: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class CameraTable:
+    """Immutable, versioned view of every camera on the account.
+
+    Built at most once per successful refresh/connect (see
+    BlinkService.camera_table) and shared by all readers until the next
+    one; `version` increases with every rebuild, so callers can tell
+    whether anything may have changed since they last looked.
+    """
+
+    version: int
+    cameras: tuple[CameraInfo, ...]
+    by_name: Mapping[str, CameraInfo]
+    by_id: Mapping[str, CameraInfo]
+
+    @classmethod
+    def build(
+        cls, version: int, cameras: tuple[CameraInfo, ...]
+    ) -> "CameraTable":
+        """Index `cameras` by name and camera ID into read-only maps."""
+        return cls(
+            version=version,
+            cameras=cameras,
+            by_name=MappingProxyType({cam.name: cam for cam in cameras}),
+            by_id=MappingProxyType({cam.camera_id: cam for cam in cameras}),
+        )
+
+
+@dataclass
+class RefreshStats:
+    """Counters for BlinkService.refresh() round trips made vs. saved."""
+
+    performed: int = 0
+    # Callers that joined a refresh already in flight.
+    coalesced: int = 0
+    # Callers served by a refresh younger than the max age.
+    reused: int = 0
+
+    @property
+    def saved(self) -> int:
+        """Round trips avoided by coalescing or reuse."""
+        return self.coalesced + self.reused
+
+
+@dataclass
+class MotionClip:
+    """A new motion clip noticed by the last refresh, not yet downloaded.
+
+    `thumbnail` is the camera's latest thumbnail JPEG, available without
+    another API call, or None if there is none to show for this clip.
+    """
+
+    camera_name: str
+    clip_time: str
+    clip_url: str
+    thumbnail: bytes | None
+
+
+@dataclass
+class ClipMetadata:
+    """One entry of Blink's cloud video history (see clip_history())."""
+
+    camera_name: str
+    clip_time: str
+    clip_url: str
+    updated_at: str
+    deleted: bool
+
+
+@dataclass
+class ClipHistory:
+    """Result of BlinkService.clip_history()."""
+
+    clips: list[ClipMetadata]
+    # False if the page limit was reached before the end of the history.
+    complete: bool
 
 
 @dataclass
 class MotionEvent:
-    """A single detected-motion clip for a camera."""
+    """A single detected-motion clip for a camera.
+
+    `clip_file` is an open, rewound spooled temporary file holding the
+    clip (or None if the download failed); the receiver owns it and
+    must close it once the clip has been delivered or discarded.
+    """
 
     camera_name: str
     clip_time: str
-    clip_bytes: bytes | None
+    clip_file: IO[bytes] | None
 
 
 class BlinkService:
     """Correct async wrapper around blinkpy 0.25.x (OAuth2+PKCE auth).
 
     All methods that touch the underlying `Blink`/session object acquire
-    an internal asyncio.Lock, serializing access between the main loop
-    and concurrent Telegram command handlers (snapshot/clip/etc.). Each
-    call is also bounded by BLINK_CALL_TIMEOUT_SECONDS so a hung network
+    an internal PriorityLock, serializing access between the main loop
+    and concurrent Telegram command handlers (snapshot/clip/etc.).
+    Waiting arm/disarm commands are let in before everything else and
+    media work last, and media work takes the lock in short steps, so
+    arming never waits behind a download. Each call is also bounded by
+    its operation's timeout (BLINK_OPERATION_TIMEOUT_SECONDS, falling
+    back to BLINK_CALL_TIMEOUT_SECONDS) and, inside a deadline() block,
+    by what remains of that block's overall budget, so a hung network
     call cannot stall the main loop indefinitely.
     """
 
     CREDENTIALS_FILE = str(DEFAULT_CREDENTIALS_FILE)
 
-    def __init__(self, username: str, password: str):
-        """Store Blink account credentials; connection is lazy via connect()."""
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        refresh_max_age_seconds: float = REFRESH_MAX_AGE_SECONDS,
+        snapshot_ttl_seconds: float = SNAPSHOT_CACHE_TTL_SECONDS,
+        operation_timeouts: Mapping[str, float] | None = None,
+        session: ClientSession | None = None,
+        clip_spool_dir: str | Path | None = None,
+    ):
+        """Store Blink account credentials; connection is lazy via connect().
+
+        `session`, if given, is the aiohttp ClientSession blinkpy makes
+        every request through (e.g. one pointed at a local fake Blink
+        API) and stays owned by the caller. By default BlinkService
+        creates a tuned one on first connect() (see HTTP_POOL_SIZE etc.),
+        reuses it across reconnects and closes it in close().
+
+        Downloaded clips are spooled to files in `clip_spool_dir` (by
+        default the system temporary directory).
+        """
         self._username = username
+        self._clip_spool_dir = clip_spool_dir
         self._password = password
+        self._session = session
+        self._owns_session = session is None
         self._blink: Blink | None = None
-        self._lock = asyncio.Lock()
+        self._lock = PriorityLock()
+        self._operation_timeouts = {
+            **BLINK_OPERATION_TIMEOUT_SECONDS,
+            **(operation_timeouts or {}),
+        }
+        # Single-flight refresh bookkeeping — see refresh().
+        self._refresh_max_age_seconds = refresh_max_age_seconds
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._last_refresh_time: float | None = None
+        # Camera names the in-flight / last refresh covered; None means
+        # the whole account.
+        self._refresh_task_scope: frozenset[str] | None = None
+        self._last_refresh_scope: frozenset[str] | None = None
+        # {camera name: time.monotonic()} of the last on-demand request
+        # for it — see ON_DEMAND_REFRESH_SECONDS.
+        self._on_demand_cameras: dict[str, float] = {}
+        self._refresh_stats = RefreshStats()
+        self._refresh_scheduler = RefreshScheduler(
+            REFRESH_MIN_INTERVAL_SECONDS, REFRESH_MAX_INTERVAL_SECONDS
+        )
+        # Per-camera snapshot cache {name: (monotonic time, image)} and
+        # in-flight snapshot tasks — see snapshot().
+        self._snapshot_ttl_seconds = snapshot_ttl_seconds
+        self._snapshot_cache: dict[str, tuple[float, bytes]] = {}
+        self._snapshot_tasks: dict[str, asyncio.Task[bytes | None]] = {}
+        # Thumbnail URL of each camera's last snapshot. camera.thumbnail
+        # only moves on at the next refresh, so a snapshot taken before
+        # then must not mistake this one for its own new picture.
+        self._snapshot_urls: dict[str, str] = {}
+        # Local-storage manifests per sync module (by network ID) and
+        # in-flight manifest fetches — see local_clips().
+        self._local_manifests: dict[str, LocalManifest] = {}
+        self._manifest_tasks: dict[str, asyncio.Task[bool]] = {}
+        # Blink's response to the last arm/disarm command per camera,
+        # until confirm_arm_command() checks it.
+        self._arm_commands: dict[str, object] = {}
+        # Cached camera table, dropped whenever blink.cameras may have
+        # changed (refresh/connect/2FA) and rebuilt lazily on next read.
+        self._camera_table: CameraTable | None = None
+        self._camera_table_version = 0
+        self._breaker = CircuitBreaker(
+            BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS
+        )
+        self._metrics = ApiMetrics()
+        # Hash of the login attributes in CREDENTIALS_FILE, if known —
+        # see save_credentials().
+        self._saved_credentials_fingerprint: str | None = None
+        # Background task refreshing the OAuth token ahead of expiry —
+        # see _refresh_token_ahead().
+        self._token_refresh_task: asyncio.Task[None] | None = None
 
     async def _with_timeout(self, coro: Awaitable[T], operation: str) -> T:
         """Await `coro` with a hard deadline, converting timeout into a
         BlinkTimeoutError so callers can distinguish it from other
-        failures without swallowing cancellation."""
+        failures without swallowing cancellation.
+
+        The deadline is the operation's timeout profile (falling back to
+        BLINK_CALL_TIMEOUT_SECONDS), shortened to whatever remains of an
+        enclosing deadline() budget. With no budget left the call is not
+        started and BlinkDeadlineExceededError is raised; a call cut
+        short by the budget raises it too.
+
+        The call also goes through the operation's circuit breaker (or
+        its target's — see _PER_TARGET_CIRCUITS): if
+        it is open, `coro` is discarded unawaited and
+        BlinkUnavailableError is raised immediately. Timeouts and errors
+        count as failures; a 2FA challenge counts as success, since
+        Blink did answer, and running out of our own budget counts as
+        neither.
+
+        Every call is recorded in the per-operation metrics() with its
+        outcome and latency; calls refused up front count as rejected.
+        """
+        key = operation.split(":", 1)[0]
+        circuit = operation if key in _PER_TARGET_CIRCUITS else key
+        timeout = self._operation_timeouts.get(key, BLINK_CALL_TIMEOUT_SECONDS)
+        budget = _DEADLINE.get()
+        remaining = None if budget is None else budget - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            _close_unawaited(coro)
+            self._metrics.record(key, CallOutcome.REJECTED, None)
+            raise BlinkDeadlineExceededError(
+                f"Blink API call '{operation}' skipped: deadline exceeded."
+            )
+        if not self._breaker.allow(circuit):
+            _close_unawaited(coro)
+            self._metrics.record(key, CallOutcome.REJECTED, None)
+            raise BlinkUnavailableError(
+                f"Blink API call '{operation}' skipped: circuit open after "
+                "repeated failures."
+            )
+        cut_by_budget = remaining is not None and remaining < timeout
+        outcome: CallOutcome | None = None
+        started = time.monotonic()
         try:
-            async with asyncio.timeout(BLINK_CALL_TIMEOUT_SECONDS):
-                return await coro
+            async with asyncio.timeout(remaining if cut_by_budget else timeout):
+                result = await coro
         except TimeoutError as e:
+            outcome = CallOutcome.TIMEOUT
+            if cut_by_budget:
+                self._breaker.release(circuit)
+                raise BlinkDeadlineExceededError(
+                    f"Blink API call '{operation}' cut short: deadline "
+                    "exceeded."
+                ) from e
+            self._breaker.record_failure(circuit)
             raise BlinkTimeoutError(
-                f"Blink API call '{operation}' timed out after "
-                f"{BLINK_CALL_TIMEOUT_SECONDS}s."
+                f"Blink API call '{operation}' timed out after {timeout}s."
             ) from e
+        except BlinkTwoFARequiredError:
+            outcome = CallOutcome.SUCCESS
+            self._breaker.record_success(circuit)
+            raise
+        except asyncio.CancelledError:
+            self._breaker.release(circuit)
+            raise
+        except Exception:
+            outcome = CallOutcome.ERROR
+            self._breaker.record_failure(circuit)
+            raise
+        else:
+            outcome = CallOutcome.SUCCESS
+            self._breaker.record_success(circuit)
+            return result
+        finally:
+            # Cancelled calls (outcome still None) are not recorded.
+            if outcome is not None:
+                self._metrics.record(key, outcome, time.monotonic() - started)
+
+    def metrics(self) -> dict[str, OperationMetrics]:
+        """Per-operation latency histograms and outcome counters for every
+        Blink API call made through this service, keyed like the circuit
+        breaker (operation name before any ':')."""
+        return self._metrics.snapshot()
+
+    @staticmethod
+    @contextlib.contextmanager
+    def deadline(seconds: float) -> Iterator[None]:
+        """Bound every Blink call made inside this block (including from
+        tasks it spawns) to finish within `seconds` from now in total.
+
+        Nested budgets can only tighten an enclosing one, never extend
+        it.
+        """
+        deadline = time.monotonic() + seconds
+        enclosing = _DEADLINE.get()
+        if enclosing is not None:
+            deadline = min(deadline, enclosing)
+        token = _DEADLINE.set(deadline)
+        try:
+            yield
+        finally:
+            _DEADLINE.reset(token)
+
+    def circuit_status(self) -> dict[str, CircuitStatus]:
+        """Status of every Blink operation whose circuit is not cleanly
+        closed (open, half-open, or closed with recent failures)."""
+        return self._breaker.status()
 
     # --- Authentication ---
 
@@ -111,10 +560,13 @@ class BlinkService:
         internal refresh->fresh-login fallback has credentials to use),
         construct Blink + Auth, call blink.start().
         """
-        async with self._lock:
+        async with self._lock(Priority.NORMAL):
             saved_data = {}
             if os.path.exists(self.CREDENTIALS_FILE):
                 saved_data = await json_load(self.CREDENTIALS_FILE) or {}
+            self._saved_credentials_fingerprint = (
+                _credentials_fingerprint(saved_data) if saved_data else None
+            )
 
             login_data = {
                 **saved_data,
@@ -122,61 +574,285 @@ class BlinkService:
                 "password": self._password,
             }
 
-            blink = Blink()
-            blink.auth = Auth(login_data, no_prompt=True)
+            session = self._ensure_session()
+            blink = Blink(session=session)
+            blink.auth = _ThrottleAwareAuth(
+                login_data, no_prompt=True, session=session
+            )
+            blink.auth.on_throttle = self._on_throttled
             self._blink = blink
+            self._last_refresh_time = None
+            self._snapshot_cache.clear()
+            self._snapshot_urls.clear()
+            self._camera_table = None
+            self._cancel_token_refresh()
 
             try:
                 success = await self._with_timeout(blink.start(), "connect")
             except BlinkTwoFARequiredError:
                 return ConnectResult.NEEDS_2FA
 
-            return ConnectResult.OK if success else ConnectResult.FAILED
+            if not success:
+                return ConnectResult.FAILED
+            self._schedule_token_refresh(blink)
+            return ConnectResult.OK
 
     async def submit_2fa_code(self, code: str) -> bool:
         """Complete 2FA via Blink.send_2fa_code(code)."""
-        async with self._lock:
+        async with self._lock(Priority.NORMAL):
             blink = self._require_blink()
-            return await self._with_timeout(
+            success = await self._with_timeout(
                 blink.send_2fa_code(code), "submit_2fa_code"
             )
+            self._camera_table = None
+            if success:
+                self._schedule_token_refresh(blink)
+            return success
 
     async def save_credentials(self) -> None:
-        """Save blink login attributes to CREDENTIALS_FILE, then restrict
-        file permissions to owner-only (contains account tokens)."""
-        async with self._lock:
+        """Save blink login attributes to CREDENTIALS_FILE, owner-only
+        (it contains account tokens).
+
+        The file is replaced atomically and fsynced, like config.json.
+        The write is skipped when the attributes match what was last
+        loaded or saved, which only spares repeat saves between token
+        changes: blink.start() (Auth.startup()) always trades the
+        refresh token for a new access token and expiry, so every
+        successful connect() is followed by one write.
+        """
+        async with self._lock(Priority.NORMAL):
             blink = self._require_blink()
+            attributes = dict(blink.auth.login_attributes)
+            fingerprint = _credentials_fingerprint(attributes)
+            if fingerprint == self._saved_credentials_fingerprint:
+                return
             await self._with_timeout(
-                blink.save(self.CREDENTIALS_FILE), "save_credentials"
+                asyncio.to_thread(
+                    write_json_atomically,
+                    self.CREDENTIALS_FILE,
+                    attributes,
+                    indent=4,
+                ),
+                "save_credentials",
+            )
+            self._saved_credentials_fingerprint = fingerprint
+
+    async def close(self) -> None:
+        """Stop background work (the token refresher) and close the HTTP
+        session if BlinkService created it."""
+        self._cancel_token_refresh()
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _ensure_session(self) -> ClientSession:
+        """Return the shared HTTP session, creating the tuned, owned one
+        on first use."""
+        if self._session is None:
+            self._session = ClientSession(
+                connector=TCPConnector(
+                    limit=HTTP_POOL_SIZE,
+                    limit_per_host=HTTP_POOL_SIZE_PER_HOST,
+                    keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+                    ttl_dns_cache=HTTP_DNS_CACHE_TTL_SECONDS,
+                )
             )
-        _restrict_permissions(self.CREDENTIALS_FILE)
+        return self._session
+
+    # --- Token refresh ---
+
+    def _schedule_token_refresh(self, blink: Blink) -> None:
+        """(Re)start the background token refresher for `blink`."""
+        self._cancel_token_refresh()
+        self._token_refresh_task = asyncio.create_task(
+            self._refresh_token_ahead(blink)
+        )
+
+    def _cancel_token_refresh(self) -> None:
+        """Cancel the background token refresher, if running."""
+        if self._token_refresh_task is not None:
+            self._token_refresh_task.cancel()
+            self._token_refresh_task = None
+
+    async def _refresh_token_ahead(self, blink: Blink) -> None:
+        """Refresh `blink`'s OAuth token TOKEN_REFRESH_MARGIN_SECONDS
+        before it expires, then persist the new tokens; repeat for as
+        long as `blink` is the active session.
+
+        Runs without the service lock: the current token stays valid
+        until the new one arrives, so arm/disarm and other calls carry
+        on unhindered rather than queueing behind the refresh.
+        """
+        # Spawned from within connect(), so the task inherited the
+        # caller's deadline() budget; the refresher outlives it.
+        _DEADLINE.set(None)
+        while self._blink is blink:
+            expires_at = blink.auth.expiration_date
+            if expires_at is None:
+                return
+            delay = expires_at - TOKEN_REFRESH_MARGIN_SECONDS - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self._blink is not blink:
+                return
+            try:
+                await self._with_timeout(
+                    blink.auth.refresh_tokens(refresh=True), "refresh_token"
+                )
+                await self.save_credentials()
+            except Exception:
+                _LOGGER.exception(
+                    "Background Blink token refresh failed; retrying in %ss.",
+                    TOKEN_REFRESH_RETRY_SECONDS,
+                )
+                await asyncio.sleep(TOKEN_REFRESH_RETRY_SECONDS)
+            else:
+                _LOGGER.info("Refreshed Blink access token ahead of expiry.")
 
     # --- Camera discovery & status ---
 
-    def list_all_cameras(self) -> list[CameraInfo]:
-        """Return info for every camera known to the Blink account."""
+    def list_all_cameras(self) -> tuple[CameraInfo, ...]:
+        """Return info for every camera known to the Blink account.
+
+        The tuple is shared from the current camera_table, so repeated
+        calls within one refresh cycle allocate nothing.
+        """
+        return self.camera_table.cameras
+
+    @property
+    def camera_table(self) -> CameraTable:
+        """The current CameraTable, rebuilt from blink.cameras only if a
+        refresh/connect has happened since it was last built."""
         blink = self._require_blink()
-        cameras = []
-        for cam in blink.cameras.values():
-            armed = cam.arm if isinstance(cam.arm, bool) else False
-            cameras.append(
-                CameraInfo(
-                    name=cam.name,
-                    camera_id=cam.camera_id,
-                    network_id=cam.network_id,
-                    product_type=cam.product_type,
-                    online=cam.online,
-                    armed=armed,
-                    battery=cam.battery,
-                )
+        if self._camera_table is None:
+            self._camera_table_version += 1
+            self._camera_table = CameraTable.build(
+                self._camera_table_version,
+                tuple(_camera_info(cam) for cam in blink.cameras.values()),
             )
-        return cameras
+        return self._camera_table
 
-    async def refresh(self) -> None:
-        """Call blink.refresh(). Respects blinkpy's built-in throttle."""
-        async with self._lock:
+    async def refresh(self, camera_names: Iterable[str] | None = None) -> None:
+        """Call blink.refresh() with single-flight semantics.
+
+        With `camera_names`, only those cameras (plus any asked about on
+        demand within ON_DEMAND_REFRESH_SECONDS) are updated — see
+        _refresh_cameras() — so the cost of a refresh scales with the
+        cameras actually managed rather than with the account.
+
+        Concurrent callers share one in-flight refresh (and its outcome,
+        including any exception) instead of queueing on the lock for a
+        round trip each, and a successful refresh younger than
+        `refresh_max_age_seconds` is reused outright — as long as it
+        covered every camera asked for. The shared refresh is shielded,
+        so one caller being cancelled doesn't abort it for the others.
+        Respects blinkpy's built-in throttle.
+        """
+        scope = self._refresh_scope(camera_names)
+        if self._refresh_task is not None and _covers(
+            self._refresh_task_scope, scope
+        ):
+            self._refresh_stats.coalesced += 1
+            await asyncio.shield(self._refresh_task)
+            return
+        if (
+            self._last_refresh_time is not None
+            and time.monotonic() - self._last_refresh_time
+            < self._refresh_max_age_seconds
+            and _covers(self._last_refresh_scope, scope)
+        ):
+            self._refresh_stats.reused += 1
+            return
+        task = asyncio.create_task(self._refresh_once(scope))
+        task.add_done_callback(self._on_refresh_done)
+        self._refresh_task = task
+        self._refresh_task_scope = scope
+        await asyncio.shield(task)
+
+    def _refresh_scope(
+        self, camera_names: Iterable[str] | None
+    ) -> frozenset[str] | None:
+        """The cameras a refresh of `camera_names` covers: None (the
+        whole account) or those names plus recent on-demand cameras."""
+        if camera_names is None:
+            return None
+        cutoff = time.monotonic() - ON_DEMAND_REFRESH_SECONDS
+        self._on_demand_cameras = {
+            name: asked
+            for name, asked in self._on_demand_cameras.items()
+            if asked > cutoff
+        }
+        return frozenset(camera_names).union(self._on_demand_cameras)
+
+    def _note_on_demand(self, camera_name: str) -> None:
+        """Include `camera_name` in partial refreshes for a while."""
+        self._on_demand_cameras[camera_name] = time.monotonic()
+
+    async def _refresh_once(self, scope: frozenset[str] | None) -> None:
+        """Perform one real refresh round trip under the lock, of the
+        whole account or (with a `scope`) just those cameras."""
+        async with self._lock(Priority.NORMAL):
             blink = self._require_blink()
-            await self._with_timeout(blink.refresh(), "refresh")
+            try:
+                await self._with_timeout(
+                    (
+                        blink.refresh()
+                        if scope is None
+                        else _refresh_cameras(blink, scope)
+                    ),
+                    "refresh",
+                )
+            except (BlinkDeadlineExceededError, BlinkUnavailableError):
+                # Not (fully) asked — says nothing about Blink's limits.
+                raise
+            except Exception:
+                # A failing or stalling refresh is as likely Blink
+                # shedding load as anything else; back off.
+                self._refresh_scheduler.record_throttle()
+                raise
+            self._refresh_scheduler.record_refresh()
+            self._refresh_stats.performed += 1
+            self._last_refresh_time = time.monotonic()
+            self._last_refresh_scope = scope
+            self._camera_table = None
+
+    def _on_refresh_done(self, task: asyncio.Task[None]) -> None:
+        """Clear the in-flight slot and mark the outcome as retrieved, so
+        a refresh whose callers were all cancelled doesn't log "exception
+        was never retrieved"."""
+        if self._refresh_task is task:
+            self._refresh_task = None
+        if not task.cancelled():
+            task.exception()
+
+    def refresh_due(self) -> bool:
+        """True if the periodic refresh is due under the adaptive cadence:
+        REFRESH_MIN_INTERVAL_SECONDS after the last refresh while Blink is
+        happy, longer while it throttles us (429s, Retry-After hints or
+        failing refreshes, on any call), and never before a Retry-After
+        Blink gave has passed. Explicit refresh() calls aren't gated."""
+        return self._refresh_scheduler.due()
+
+    def refresh_cadence(self) -> RefreshCadence:
+        """Current periodic-refresh interval and time until the next."""
+        return self._refresh_scheduler.status()
+
+    def _on_throttled(self, retry_after: float | None) -> None:
+        """Back the refresh cadence off after Blink throttled a call."""
+        self._refresh_scheduler.record_throttle(retry_after)
+        cadence = self._refresh_scheduler.status()
+        _LOGGER.warning(
+            "Blink is throttling requests%s; next refresh in %.0fs "
+            "(interval now %.0fs).",
+            "" if retry_after is None else f" (retry after {retry_after:.0f}s)",
+            cadence.next_refresh_in_seconds,
+            cadence.interval_seconds,
+        )
+
+    @property
+    def refresh_stats(self) -> RefreshStats:
+        """Copy of the refresh() performed/coalesced/reused counters."""
+        return dataclasses.replace(self._refresh_stats)
 
     def has_camera(self, camera_name: str) -> bool:
         """True if `camera_name` exists on the connected Blink account.
@@ -186,8 +862,7 @@ class BlinkService:
         yet" before calling snapshot()/get_latest_clip(), which both
         return None for either situation.
         """
-        blink = self._require_blink()
-        return camera_name in blink.cameras
+        return camera_name in self.camera_table.by_name
 
     # --- Arm/disarm (per-camera motion detection) ---
 
@@ -210,7 +885,7 @@ class BlinkService:
         disarm's success indistinguishable from a not-found camera, since
         both would read as False).
         """
-        async with self._lock:
+        async with self._lock(Priority.ARM):
             blink = self._require_blink()
             results: dict[str, bool] = {}
             for name in names:
@@ -218,28 +893,186 @@ class BlinkService:
                 if camera is None:
                     results[name] = False
                     continue
-                await self._with_timeout(
+                self._arm_commands[name] = await self._with_timeout(
                     camera.async_arm(armed), f"arm_camera:{name}"
                 )
                 results[name] = True
             return results
 
+    async def confirm_arm_command(self, camera_name: str) -> bool | None:
+        """Wait for the last arm/disarm command sent to `camera_name` to
+        complete, by polling Blink's status for just that command rather
+        than refreshing the whole account.
+
+        Returns True once Blink reports it complete, False if Blink
+        reports it failed or it isn't complete within
+        ARM_CONFIRM_TIMEOUT_SECONDS, and None if there is nothing to
+        check (no command sent since the last check, or Blink's response
+        didn't identify it). Polls run at ARM priority.
+        """
+        response = self._arm_commands.pop(camera_name, None)
+        if response is None:
+            return None
+        if not isinstance(response, dict) or not (
+            response.get("id") and response.get("network_id")
+        ):
+            return None
+        return await self._wait_for_command(
+            response,
+            Priority.ARM,
+            initial_delay=ARM_CONFIRM_POLL_INITIAL_SECONDS,
+            max_delay=ARM_CONFIRM_POLL_MAX_INTERVAL_SECONDS,
+            timeout=ARM_CONFIRM_TIMEOUT_SECONDS,
+        )
+
     # --- On-demand media (independent of auto-arm loop) ---
 
     async def snapshot(self, camera_name: str) -> bytes | None:
-        """Trigger snap_picture() for named camera."""
-        async with self._lock:
+        """Return a snapshot image for the named camera.
+
+        A snapshot taken less than `snapshot_ttl_seconds` ago is returned
+        from the cache without touching the camera, and concurrent
+        requests for the same camera share one shielded snapshot request
+        rather than waking it once each. Failed or empty snapshots
+        are not cached.
+        """
+        self._note_on_demand(camera_name)
+        cached = self._snapshot_cache.get(camera_name)
+        if (
+            cached is not None
+            and time.monotonic() - cached[0] < self._snapshot_ttl_seconds
+        ):
+            return cached[1]
+        task = self._snapshot_tasks.get(camera_name)
+        if task is None:
+            task = asyncio.create_task(self._snapshot_once(camera_name))
+            task.add_done_callback(
+                functools.partial(self._on_snapshot_done, camera_name)
+            )
+            self._snapshot_tasks[camera_name] = task
+        return await asyncio.shield(task)
+
+    async def snapshots(
+        self, camera_names: list[str]
+    ) -> dict[str, bytes | None]:
+        """Take snapshots of `camera_names` concurrently (at most
+        SNAPSHOT_CONCURRENCY cameras at a time) and return each camera's
+        image, or None where snapshot() returned none or failed.
+
+        snapshot() only holds the lock for its individual requests, so
+        the cameras' uploads overlap and the whole batch takes about as
+        long as its slowest camera.
+        """
+        semaphore = asyncio.Semaphore(SNAPSHOT_CONCURRENCY)
+
+        async def take(name: str) -> bytes | None:
+            async with semaphore:
+                try:
+                    return await self.snapshot(name)
+                except Exception:
+                    _LOGGER.exception(
+                        "Failed to take snapshot of camera '%s'.", name
+                    )
+                    return None
+
+        images = await asyncio.gather(*(take(name) for name in camera_names))
+        return dict(zip(camera_names, images, strict=True))
+
+    async def _snapshot_once(self, camera_name: str) -> bytes | None:
+        """Ask the named camera for a new picture, wait for its thumbnail
+        to change and return (and cache) the new image.
+
+        blinkpy's snap_picture() fetches the thumbnail straight after the
+        request, before the camera has uploaded anything, so it usually
+        returns the previous picture. Instead the camera's info is polled
+        with backoff (see SNAPSHOT_POLL_INITIAL_SECONDS) until it points
+        at a new thumbnail, which is then downloaded. Returns None if the
+        camera is unknown, no new thumbnail appears in time or the
+        download fails. Each step takes the lock separately, at MEDIA
+        priority.
+        """
+        async with self._lock(Priority.MEDIA):
             blink = self._require_blink()
             camera = blink.cameras.get(camera_name)
             if camera is None:
                 return None
-            await self._with_timeout(camera.snap_picture(), "snapshot")
-            return camera.image_from_cache
+            # Neither the last refreshed thumbnail nor our own previous
+            # snapshot's counts as the picture just requested.
+            previous = {camera.thumbnail, self._snapshot_urls.get(camera_name)}
+            # `force` skips blinkpy's throttle, which is shared by every
+            # camera and would sleep 5 s here, holding the lock, before
+            # each of several concurrent snapshots. Repeats for one
+            # camera are already absorbed by the snapshot cache.
+            await self._with_timeout(
+                api.request_new_image(
+                    blink,
+                    camera.network_id,
+                    camera.camera_id,
+                    camera_type=camera.camera_type,
+                    force=True,
+                ),
+                "snapshot",
+            )
+
+        url = None
+        delay = SNAPSHOT_POLL_INITIAL_SECONDS
+        give_up_at = time.monotonic() + SNAPSHOT_POLL_TIMEOUT_SECONDS
+        while url is None:
+            if time.monotonic() + delay > give_up_at:
+                _LOGGER.warning(
+                    "No new snapshot from camera '%s' within %ss.",
+                    camera_name,
+                    SNAPSHOT_POLL_TIMEOUT_SECONDS,
+                )
+                return None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, SNAPSHOT_POLL_MAX_INTERVAL_SECONDS)
+            async with self._lock(Priority.MEDIA):
+                blink = self._require_blink()
+                if blink.cameras.get(camera_name) is not camera:
+                    return None
+                info = await self._with_timeout(
+                    self._fetch_camera_info(blink, camera), "snapshot_poll"
+                )
+            latest = _thumbnail_url(camera, (info or {}).get("thumbnail"))
+            if latest is not None and latest not in previous:
+                url = latest
+
+        response = await self._with_timeout(
+            camera.get_thumbnail(url), "snapshot_fetch"
+        )
+        if not response or response.status != 200:
+            return None
+        image = await response.read()
+        self._snapshot_urls[camera_name] = url
+        self._snapshot_cache[camera_name] = (time.monotonic(), image)
+        return image
 
-    async def get_latest_clip(self, camera_name: str) -> bytes | None:
-        """Return bytes of the most recent motion clip for `camera_name`,
-        queried live from Blink's cloud video history rather than the
-        local `camera.recent_clips` cache.
+    @staticmethod
+    async def _fetch_camera_info(blink: Blink, camera) -> dict | None:
+        """Fetch the camera's current info from Blink, as a sync module
+        refresh would. Minis and doorbells are only described by the
+        homescreen, so for them that is re-read first."""
+        sync = camera.sync
+        if sync.get_unique_info(camera.name) is not None:
+            await blink.get_homescreen()
+        return await sync.get_camera_info(
+            camera.camera_id, unique_info=sync.get_unique_info(camera.name)
+        )
+
+    def _on_snapshot_done(
+        self, camera_name: str, task: asyncio.Task[bytes | None]
+    ) -> None:
+        """Clear the camera's in-flight slot (see _on_refresh_done)."""
+        self._snapshot_tasks.pop(camera_name, None)
+        if not task.cancelled():
+            task.exception()
+
+    async def get_latest_clip(self, camera_name: str) -> IO[bytes] | None:
+        """Return the most recent motion clip for `camera_name` as an
+        open spooled temporary file (closed by the caller), queried live
+        from Blink's cloud video history rather than the local
+        `camera.recent_clips` cache.
 
         `camera.recent_clips` is only populated opportunistically during
         `refresh()`'s own `update_images()` cycle, and entries are
@@ -247,46 +1080,311 @@ class BlinkService:
         makes on-demand clip requests racy against the main loop's own
         refresh/expiry cadence (a clip that existed a minute ago may
         already be gone from the cache, even though it's still present
-        in Blink's cloud history). Querying
-        `Blink.get_videos_metadata()` (Blink's `/media/changed` video
-        history endpoint) directly avoids that race, at the cost of one
+        in Blink's cloud history). Querying Blink's `/media/changed` video
+        history endpoint directly avoids that race, at the cost of one
         extra API call per on-demand request.
+
+        The history is read one page per MEDIA-priority lock hold and
+        the clip is downloaded outside the lock, so an arm/disarm issued
+        meanwhile waits for at most one page request.
+        """
+        self._note_on_demand(camera_name)
+        since = (
+            datetime.now(timezone.utc)
+            - timedelta(days=CLIP_LOOKUP_LOOKBACK_DAYS)
+        ).timestamp()
+        camera_videos = []
+        # Same paging as Blink.get_videos_metadata(stop=...), which can't
+        # be paused between pages.
+        for page in range(1, CLIP_LOOKUP_MAX_PAGES):
+            async with self._lock(Priority.MEDIA):
+                blink = self._require_blink()
+                if camera_name not in blink.cameras:
+                    return None
+                videos = await self._request_video_page(blink, since, page)
+            if not videos:
+                break
+            camera_videos.extend(
+                video
+                for video in videos
+                if video.get("device_name") == camera_name
+                and not video.get("deleted")
+            )
+        if not camera_videos:
+            return await self._latest_local_clip(camera_name)
+        blink = self._require_blink()
+        camera = blink.cameras.get(camera_name)
+        if camera is None:
+            return None
+        latest = max(camera_videos, key=lambda v: v["created_at"])
+        url = f"{blink.urls.base_url}{latest['media']}"
+        return await self._download_clip(camera, url)
+
+    # --- Sync-module local storage ---
+
+    async def local_clips(self, camera_name: str) -> list[LocalClip]:
+        """Return the clips of `camera_name` on its sync module's local
+        (USB) storage, newest first — empty if the camera is unknown or
+        its sync module has no active local storage.
+
+        Served from a manifest cached per sync module and only fetched
+        again once older than LOCAL_MANIFEST_MAX_AGE_SECONDS; concurrent
+        callers share one fetch. If a fetch fails, times out or is refused
+        by an open circuit breaker, the previous manifest (if any) is
+        served rather than nothing.
+        """
+        manifest = await self._local_manifest(camera_name)
+        return [] if manifest is None else manifest.clips(camera_name)
+
+    async def get_local_clip(
+        self, camera_name: str, clip: LocalClip
+    ) -> IO[bytes] | None:
+        """Return one local-storage clip of `camera_name` as an open
+        spooled temporary file (closed by the caller), or None if it
+        couldn't be retrieved.
+
+        The sync module first uploads the clip to Blink's cloud, which
+        is waited for one MEDIA-priority status poll at a time; the
+        download then holds no lock. A failed upload usually means the
+        cached manifest is outdated, so it is fetched again next time.
         """
-        async with self._lock:
+        async with self._lock(Priority.MEDIA):
             blink = self._require_blink()
             camera = blink.cameras.get(camera_name)
             if camera is None:
                 return None
-            since = (
-                datetime.now(timezone.utc)
-                - timedelta(days=CLIP_LOOKUP_LOOKBACK_DAYS)
-            ).strftime("%Y/%m/%d %H:%M:%S")
-            videos = await self._with_timeout(
-                blink.get_videos_metadata(
-                    since=since, stop=CLIP_LOOKUP_MAX_PAGES
-                ),
-                "get_latest_clip:list_videos",
+            manifest = self._local_manifests.get(str(camera.sync.network_id))
+            if manifest is None or manifest.manifest_id is None:
+                return None
+            url = blink.urls.base_url + _local_clip_path(
+                blink, camera.sync, manifest.manifest_id, clip.clip_id
             )
-            camera_videos = [
-                video
-                for video in videos
-                if video.get("device_name") == camera_name
-                and not video.get("deleted")
-            ]
-            if not camera_videos:
+            response = await self._with_timeout(
+                api.http_post(blink, url), "local_clip"
+            )
+        if not await self._wait_for_command(response, Priority.MEDIA):
+            _LOGGER.warning(
+                "Sync module did not upload local clip %d of '%s'.",
+                clip.clip_id,
+                camera_name,
+            )
+            manifest.fetched_at = None
+            return None
+        return await self._download_clip(camera, url)
+
+    async def _latest_local_clip(self, camera_name: str) -> IO[bytes] | None:
+        """get_latest_clip() for a camera that only records locally."""
+        clips = await self.local_clips(camera_name)
+        if not clips:
+            return None
+        return await self.get_local_clip(camera_name, clips[0])
+
+    async def _local_manifest(self, camera_name: str) -> LocalManifest | None:
+        """The cached manifest of `camera_name`'s sync module, fetched
+        first if missing or stale; None if there's none to serve."""
+        async with self._lock(Priority.MEDIA):
+            camera = self._require_blink().cameras.get(camera_name)
+            if camera is None or not camera.sync.local_storage:
                 return None
-            latest = max(camera_videos, key=lambda v: v["created_at"])
-            url = f"{blink.urls.base_url}{latest['media']}"
-            return await self._download_clip(camera, url)
+            sync = camera.sync
+        key = str(sync.network_id)
+        manifest = self._local_manifests.setdefault(key, LocalManifest())
+        if manifest.is_fresh(time.monotonic(), LOCAL_MANIFEST_MAX_AGE_SECONDS):
+            return manifest
+        task = self._manifest_tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._fetch_local_manifest(sync, manifest)
+            )
+            task.add_done_callback(
+                functools.partial(self._on_manifest_done, key)
+            )
+            self._manifest_tasks[key] = task
+        try:
+            await asyncio.shield(task)
+        except Exception as err:
+            # Timed out, circuit open or a bad response: the fetch is
+            # over either way, so serve what's cached (if anything).
+            _LOGGER.warning(
+                "Could not fetch the local-storage manifest of sync "
+                "module '%s' (%r); serving the cached one.",
+                sync.name,
+                err,
+            )
+        return manifest if manifest.manifest_id is not None else None
+
+    async def _fetch_local_manifest(
+        self, sync, manifest: LocalManifest
+    ) -> bool:
+        """Have the sync module build a manifest, then read it and merge
+        it into `manifest`. Every request takes the lock separately."""
+        async with self._lock(Priority.MEDIA):
+            blink = self._require_blink()
+            response = await self._with_timeout(
+                api.http_post(blink, _local_manifest_url(blink, sync)),
+                "local_manifest",
+            )
+        if not await self._wait_for_command(response, Priority.MEDIA):
+            _LOGGER.warning(
+                "Sync module '%s' did not build a local-storage manifest.",
+                sync.name,
+            )
+            return False
+        deadline = time.monotonic() + COMMAND_TIMEOUT_SECONDS
+        while True:
+            async with self._lock(Priority.MEDIA):
+                blink = self._require_blink()
+                result = await self._with_timeout(
+                    api.get_local_storage_manifest(
+                        blink, sync.network_id, sync.sync_id, response["id"]
+                    ),
+                    "local_manifest",
+                )
+            if (
+                isinstance(result, dict)
+                and "clips" in result
+                and result.get("manifest_id") is not None
+            ):
+                break
+            if time.monotonic() >= deadline:
+                _LOGGER.warning(
+                    "Local-storage manifest of sync module '%s' not ready.",
+                    sync.name,
+                )
+                return False
+            await asyncio.sleep(COMMAND_POLL_SECONDS)
+        added = manifest.merge(
+            str(result["manifest_id"]),
+            result["clips"],
+            {to_alphanumeric(name): name for name in sync.cameras},
+            time.monotonic(),
+        )
+        _LOGGER.debug(
+            "Local-storage manifest of '%s': %d new clip(s).", sync.name, added
+        )
+        return True
+
+    def _on_manifest_done(self, key: str, task: asyncio.Task[bool]) -> None:
+        """Clear the sync module's in-flight slot (see _on_refresh_done)."""
+        self._manifest_tasks.pop(key, None)
+        if not task.cancelled():
+            task.exception()
+
+    async def _wait_for_command(
+        self,
+        response: object,
+        priority: Priority,
+        *,
+        initial_delay: float | None = None,
+        max_delay: float | None = None,
+        timeout: float | None = None,
+    ) -> bool:
+        """Poll the sync-module command `response` started until it
+        completes. False if it fails, can't be identified, or isn't done
+        within `timeout` (default COMMAND_TIMEOUT_SECONDS).
+
+        Polls are `initial_delay` apart (default COMMAND_POLL_SECONDS),
+        doubling up to `max_delay` if that is given. Like blinkpy's
+        api.wait_for_command(), but the lock is only held for each
+        status request, not for the whole wait.
+        """
+        if not isinstance(response, dict):
+            return False
+        network_id = response.get("network_id")
+        command_id = response.get("id")
+        if not network_id or not command_id:
+            return False
+        delay = COMMAND_POLL_SECONDS if initial_delay is None else initial_delay
+        max_delay = delay if max_delay is None else max_delay
+        deadline = time.monotonic() + (
+            COMMAND_TIMEOUT_SECONDS if timeout is None else timeout
+        )
+        while True:
+            async with self._lock(priority):
+                blink = self._require_blink()
+                status = await self._with_timeout(
+                    api.request_command_status(blink, network_id, command_id),
+                    "command_status",
+                )
+            if isinstance(status, dict) and status:
+                # blinkpy's reading: any code but 908 means the command
+                # failed.
+                if status.get("status_code", 0) != 908:
+                    return False
+                if status.get("complete"):
+                    return True
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_delay)
+
+    async def clip_history(
+        self, since: float, max_pages: int, first_page: int = 1
+    ) -> ClipHistory:
+        """Return every clip in Blink's cloud video history added or
+        changed since the epoch time `since`, for all cameras, including
+        deletions (flagged), in the order Blink lists them (newest
+        first), starting at page `first_page`.
+
+        At most `max_pages` pages are read, one BACKGROUND-priority lock
+        hold each, so every other Blink call gets ahead of the next page.
+        A long read therefore yields to other work rather than delaying
+        it, but can itself take a while: callers that must not wait
+        (like the main loop's clip index sync) run it as a background
+        task.
+        """
+        clips: list[ClipMetadata] = []
+        for page in range(first_page, first_page + max_pages):
+            async with self._lock(Priority.BACKGROUND):
+                blink = self._require_blink()
+                videos = await self._request_video_page(blink, since, page)
+                base_url = blink.urls.base_url
+            if not videos:
+                return ClipHistory(clips=clips, complete=True)
+            clips.extend(
+                ClipMetadata(
+                    camera_name=video["device_name"],
+                    clip_time=video["created_at"],
+                    clip_url=f"{base_url}{video['media']}",
+                    updated_at=video.get("updated_at") or video["created_at"],
+                    deleted=bool(video.get("deleted")),
+                )
+                for video in videos
+                if video.get("device_name")
+                and video.get("created_at")
+                and video.get("media")
+            )
+        return ClipHistory(clips=clips, complete=False)
+
+    async def _request_video_page(
+        self, blink: Blink, since: float, page: int
+    ) -> list[dict]:
+        """One page of the video history since `since` (empty once the
+        history is exhausted). The caller holds the lock."""
+        response = await self._with_timeout(
+            api.request_videos(blink, time=since, page=page), "list_videos"
+        )
+        videos = response.get("media") if isinstance(response, dict) else None
+        return videos or []
 
     # --- Motion alert polling ---
 
-    async def get_new_motion_events(
+    async def new_motion_clips(
         self,
         last_seen: dict[str, str | None],
         camera_names: list[str] | None = None,
-    ) -> list[MotionEvent]:
-        """Compare camera.recent_clips against last_seen timestamps.
+    ) -> list[MotionClip]:
+        """Return every clip in camera.recent_clips newer than that
+        camera's last_seen timestamp, oldest first per camera, without
+        downloading anything.
+
+        Only in-memory state from the last refresh() is read, so this is
+        instant — callers alert on the result straight away and fetch
+        the clips afterwards with iter_motion_clip_downloads(). The
+        newest clip of each camera carries the camera's current
+        thumbnail (fetched by refresh() when it changes); older ones in
+        the same batch have none, as it would only show the later
+        motion.
 
         If `camera_names` is given, only those cameras are considered —
         used to scope proactive motion alerts to the controlled-camera
@@ -294,37 +1392,195 @@ class BlinkService:
         all account cameras are checked (used by callers that want the
         full account view).
         """
-        async with self._lock:
+        async with self._lock(Priority.NORMAL):
             blink = self._require_blink()
-            events: list[MotionEvent] = []
+            clips: list[MotionClip] = []
             for camera in blink.cameras.values():
                 if camera_names is not None and camera.name not in camera_names:
                     continue
                 baseline = last_seen.get(camera.name)
-                new_clips = [
-                    clip
-                    for clip in camera.recent_clips
-                    if baseline is None or clip["time"] > baseline
-                ]
-                for clip in sorted(new_clips, key=lambda c: c["time"]):
-                    clip_bytes = await self._download_clip(camera, clip["clip"])
-                    events.append(
-                        MotionEvent(
-                            camera_name=camera.name,
-                            clip_time=clip["time"],
-                            clip_bytes=clip_bytes,
+                new_clips = sorted(
+                    (
+                        clip
+                        for clip in camera.recent_clips
+                        if baseline is None or clip["time"] > baseline
+                    ),
+                    key=lambda c: c["time"],
+                )
+                clips.extend(
+                    MotionClip(
+                        camera_name=camera.name,
+                        clip_time=clip["time"],
+                        clip_url=clip["clip"],
+                        thumbnail=(
+                            camera.image_from_cache
+                            if index == len(new_clips) - 1
+                            else None
+                        ),
+                    )
+                    for index, clip in enumerate(new_clips)
+                )
+            return clips
+
+    async def iter_motion_clip_downloads(
+        self, clips: list[MotionClip]
+    ) -> AsyncIterator[MotionEvent]:
+        """Download `clips` and yield a MotionEvent for each.
+
+        The downloads run concurrently outside the service lock (at most
+        MOTION_CLIP_DOWNLOAD_CONCURRENCY at a time), so a motion burst
+        never holds up arm/disarm. Events are yielded as their downloads
+        finish, except that a camera's clips are always yielded in the
+        order given. A clip whose download fails, or whose camera has
+        since disappeared, is still yielded, with `clip_file=None`.
+
+        Consume with `contextlib.aclosing()` so that stopping early
+        cancels outstanding downloads and closes their files.
+        """
+        semaphore = asyncio.Semaphore(MOTION_CLIP_DOWNLOAD_CONCURRENCY)
+
+        async def download(clip: MotionClip) -> MotionEvent:
+            async with semaphore:
+                clip_file = None
+                camera = (
+                    self._blink.cameras.get(clip.camera_name)
+                    if self._blink is not None
+                    else None
+                )
+                try:
+                    if camera is not None:
+                        clip_file = await self._download_clip(
+                            camera, clip.clip_url
                         )
+                except Exception:
+                    _LOGGER.exception(
+                        "Failed to download motion clip for '%s' at %s.",
+                        clip.camera_name,
+                        clip.clip_time,
                     )
-            return events
+            return MotionEvent(
+                camera_name=clip.camera_name,
+                clip_time=clip.clip_time,
+                clip_file=clip_file,
+            )
 
-    async def _download_clip(self, camera, url: str) -> bytes | None:
-        """Fetch a motion clip's bytes from its URL, or None on failure."""
-        response = await self._with_timeout(
-            camera.get_video_clip(url=url), "download_clip"
+        # Each download's (camera, position) in that camera's oldest-first
+        # order; finished downloads wait in `finished` until every
+        # earlier clip of the same camera has been yielded.
+        positions: dict[asyncio.Task[MotionEvent], tuple[str, int]] = {}
+        queued: dict[str, int] = {}
+        for clip in clips:
+            position = queued.get(clip.camera_name, 0)
+            queued[clip.camera_name] = position + 1
+            task = asyncio.create_task(download(clip))
+            positions[task] = (clip.camera_name, position)
+        next_position = dict.fromkeys(queued, 0)
+        finished: dict[str, dict[int, asyncio.Task[MotionEvent]]] = {}
+        delivered: set[asyncio.Task[MotionEvent]] = set()
+
+        pending = set(positions)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    name, position = positions[task]
+                    finished.setdefault(name, {})[position] = task
+                for name, tasks in finished.items():
+                    while next_position[name] in tasks:
+                        task = tasks.pop(next_position[name])
+                        next_position[name] += 1
+                        delivered.add(task)
+                        yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            # Close the files of any downloads the consumer never got.
+            for task in positions:
+                if task in delivered or task.cancelled():
+                    continue
+                clip_file = task.result().clip_file
+                if clip_file is not None:
+                    clip_file.close()
+
+    async def _download_clip(self, camera, url: str) -> IO[bytes] | None:
+        """Stream a motion clip from its URL into a rewound spooled
+        temporary file, or return None on a non-200 response."""
+        return await self._with_timeout(
+            self._fetch_clip(camera, url), "download_clip"
         )
-        if response and response.status == 200:
-            return await response.read()
-        return None
+
+    async def _fetch_clip(self, camera, url: str) -> IO[bytes] | None:
+        """Request `url` and copy the response body into a spooled file
+        (in the clip spool directory) CLIP_DOWNLOAD_CHUNK_BYTES at a
+        time."""
+        response = await camera.get_video_clip(url=url)
+        if not response or response.status != 200:
+            return None
+        # Not a `with` block: ownership of the open file passes to the
+        # caller on success.
+        spool = tempfile.SpooledTemporaryFile(  # noqa: SIM115
+            max_size=CLIP_DOWNLOAD_CHUNK_BYTES, dir=self._clip_spool_dir
+        )
+        try:
+            await _copy_clip_body(response, spool)
+        except BaseException:
+            spool.close()
+            raise
+        spool.seek(0)
+        return spool
+
+    async def download_clip_to(
+        self, camera_name: str, clip_url: str, path: Path
+    ) -> bool:
+        """Stream a motion clip of `camera_name` straight into the file
+        at `path` (created or truncated). Returns False if the camera is
+        unknown or Blink doesn't answer 200; the file may then be partly
+        written and is the caller's to remove.
+
+        For background work such as archiving: the camera is looked up
+        at BACKGROUND priority, i.e. only once no other Blink operation
+        is running or waiting, and the download itself holds no lock.
+        """
+        async with self._lock(Priority.BACKGROUND):
+            camera = self._require_blink().cameras.get(camera_name)
+        if camera is None:
+            return False
+        return await self._with_timeout(
+            self._fetch_clip_to(camera, clip_url, path), "download_clip"
+        )
+
+    def media_headers(self, camera_name: str) -> dict[str, str] | None:
+        """HTTP headers authorizing a direct download of `camera_name`'s
+        clips outside blinkpy (e.g. by the media worker process), or None
+        if the camera is unknown or there is no access token.
+
+        The token is kept fresh by the background refresher, so headers
+        taken just before a download stay valid for it.
+        """
+        blink = self._require_blink()
+        if camera_name not in blink.cameras:
+            return None
+        return blink.auth.header
+
+    @staticmethod
+    async def _fetch_clip_to(camera, url: str, path: Path) -> bool:
+        """Request `url` and copy the response body into `path`
+        CLIP_DOWNLOAD_CHUNK_BYTES at a time. The file is opened, written
+        and closed in worker threads: `path` may be on a slow (USB) disk
+        that must not stall the event loop."""
+        response = await camera.get_video_clip(url=url)
+        if not response or response.status != 200:
+            return False
+        f = await asyncio.to_thread(open, path, "wb")
+        try:
+            await _copy_clip_body(response, f, in_thread=True)
+        finally:
+            await asyncio.to_thread(f.close)
+        return True
 
     # --- Internal ---
 
@@ -340,15 +1596,138 @@ class BlinkService:
         return bool(self._blink and self._blink.cameras)
 
 
-def _restrict_permissions(path: str) -> None:
-    """Best-effort restriction of a file's permissions to owner-only.
+def _close_unawaited(awaitable: Awaitable) -> None:
+    """Close a coroutine that will never be awaited, avoiding a
+    "coroutine was never awaited" warning."""
+    if asyncio.iscoroutine(awaitable):
+        awaitable.close()
+
+
+async def _copy_clip_body(
+    response, sink: IO[bytes], in_thread: bool = False
+) -> None:
+    """Copy a clip response's body into `sink` CLIP_DOWNLOAD_CHUNK_BYTES
+    at a time, so memory use doesn't grow with the clip size; the
+    response is released afterwards. With `in_thread`, each write runs
+    in a worker thread."""
+    try:
+        async for chunk in response.content.iter_chunked(
+            CLIP_DOWNLOAD_CHUNK_BYTES
+        ):
+            if in_thread:
+                await asyncio.to_thread(sink.write, chunk)
+            else:
+                sink.write(chunk)
+    finally:
+        response.release()
+
+
+def _local_manifest_url(blink: Blink, sync) -> str:
+    """URL asking `sync` to build a local-storage manifest (as used by
+    api.request_local_storage_manifest(), which also waits for it)."""
+    return (
+        f"{blink.urls.base_url}/api/v1/accounts/{blink.account_id}"
+        f"/networks/{sync.network_id}/sync_modules/{sync.sync_id}"
+        "/local_storage/manifest/request"
+    )
+
 
-    No-op on Windows, where POSIX mode bits are not meaningfully
-    enforced; the router deployment target is embedded Linux.
+def _local_clip_path(blink: Blink, sync, manifest_id: str, clip_id: int) -> str:
+    """Path of a local-storage clip: POSTing to it has the sync module
+    upload the clip, GETting it afterwards downloads it."""
+    return (
+        f"/api/v1/accounts/{blink.account_id}/networks/{sync.network_id}"
+        f"/sync_modules/{sync.sync_id}/local_storage/manifest/{manifest_id}"
+        f"/clip/request/{clip_id}"
+    )
+
+
+def _covers(
+    covered: frozenset[str] | None, wanted: frozenset[str] | None
+) -> bool:
+    """True if a refresh of `covered` cameras serves a request for
+    `wanted` ones (None meaning the whole account)."""
+    return covered is None or (wanted is not None and wanted <= covered)
+
+
+async def _refresh_cameras(blink: Blink, camera_names: frozenset[str]) -> bool:
+    """blink.refresh(), but only updating the cameras in `camera_names`.
+
+    The account homescreen (one request, needed for arm state and for
+    Minis/doorbells) is still read, but sync modules without any of the
+    cameras are skipped entirely, and the per-camera info, sensor and
+    thumbnail requests are made for the named cameras only. Mirrors the
+    steps of Blink.refresh() and SyncModule.refresh(); returns False
+    (doing nothing) within blinkpy's refresh rate, as they do.
+
+    Unlike SyncModule.refresh(), no local-storage manifest is built:
+    that makes the sync module scan its USB drive on every refresh,
+    while local_clips() keeps its own cached manifest, fetched only on
+    demand. blinkpy's local-storage motion records are therefore not
+    updated by a partial refresh.
     """
-    if os.name != "posix":
-        return
+    if not blink.check_if_ok_to_update():
+        return False
+    if not blink.available:
+        await blink.setup_post_verify()
+    await blink.get_homescreen()
+    for sync in blink.sync.values():
+        cameras = {
+            name: camera
+            for name, camera in sync.cameras.items()
+            if name in camera_names
+        }
+        if not cameras or not await sync.get_network_info():
+            continue
+        await sync.check_new_videos()
+        for name, camera in cameras.items():
+            camera_info = await sync.get_camera_info(
+                camera.camera_id, unique_info=sync.get_unique_info(name)
+            )
+            await camera.update(camera_info)
+        sync.available = True
+    blink.last_refresh = int(time.time())
+    return True
+
+
+def _camera_info(cam) -> CameraInfo:
+    """Convert a blinkpy camera object into a CameraInfo."""
+    return CameraInfo(
+        name=cam.name,
+        camera_id=cam.camera_id,
+        network_id=cam.network_id,
+        product_type=cam.product_type,
+        online=cam.online,
+        armed=cam.arm if isinstance(cam.arm, bool) else False,
+        battery=cam.battery,
+        arm_state_known=isinstance(cam.arm, bool),
+    )
+
+
+def _thumbnail_url(camera, thumbnail: object) -> str | None:
+    """The URL blinkpy would build for a camera info's "thumbnail" value
+    (see BlinkCamera.update_images()), or None if there is none."""
+    if not thumbnail:
+        return None
     try:
-        os.chmod(path, 0o600)
-    except OSError:
-        _LOGGER.warning("Could not restrict permissions on '%s'.", path)
+        int(thumbnail)
+    except (TypeError, ValueError):
+        # Older API: the value is already a (partial) URL.
+        path = str(thumbnail)
+        if not path.endswith("&ext="):
+            path = f"{path}.jpg"
+    else:
+        # Current API: the value is just the thumbnail's timestamp.
+        path = (
+            f"/api/v3/media/accounts/{camera.sync.blink.account_id}"
+            f"/networks/{camera.network_id}/{camera.product_type}"
+            f"/{camera.camera_id}/thumbnail/thumbnail.jpg"
+            f"?ts={thumbnail}&ext="
+        )
+    return urljoin(camera.sync.urls.base_url, path)
+
+
+def _credentials_fingerprint(attributes: Mapping[str, object]) -> str:
+    """Order-independent digest of blinkpy login attributes."""
+    encoded = json.dumps(attributes, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
@@ -0,0 +1,117 @@
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+
+
+class CircuitState(Enum):
+    """State of a single named circuit in a CircuitBreaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitStatus:
+    """Point-in-time view of one circuit, for status reporting."""
+
+    state: CircuitState
+    consecutive_failures: int
+    # Seconds until an OPEN circuit lets a probe call through; 0 when
+    # not OPEN (or when a probe is already due).
+    retry_in_seconds: float
+
+
+@dataclass
+class _Circuit:
+    """Mutable per-key bookkeeping behind a CircuitStatus."""
+
+    state: CircuitState = CircuitState.CLOSED
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+
+
+class CircuitBreaker:
+    """Per-key circuit breaker: fail fast while a dependency is down.
+
+    Each key (e.g. an API operation name) is tracked independently.
+    After `failure_threshold` consecutive failures its circuit OPENs and
+    allow() refuses calls outright. Once `reset_timeout_seconds` have
+    passed, exactly one probe call is let through (HALF_OPEN): its
+    success closes the circuit, its failure re-opens it for another full
+    timeout. Not thread-safe — meant for use from a single asyncio loop.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Configure thresholds; all circuits start CLOSED."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_seconds = reset_timeout_seconds
+        self._clock = clock
+        self._circuits: dict[str, _Circuit] = {}
+
+    def allow(self, key: str) -> bool:
+        """Return True if a call for `key` may proceed now.
+
+        An OPEN circuit whose reset timeout has elapsed moves to
+        HALF_OPEN and admits this caller as its single probe; further
+        callers are refused until the probe reports back.
+        """
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.state is CircuitState.CLOSED:
+            return True
+        if circuit.state is CircuitState.HALF_OPEN:
+            return False
+        if self._clock() - circuit.opened_at < self._reset_timeout_seconds:
+            return False
+        circuit.state = CircuitState.HALF_OPEN
+        return True
+
+    def record_success(self, key: str) -> None:
+        """Close `key`'s circuit and clear its failure count."""
+        self._circuits.pop(key, None)
+
+    def record_failure(self, key: str) -> None:
+        """Count a failure for `key`, opening its circuit at the
+        threshold — or immediately, if it was a HALF_OPEN probe."""
+        circuit = self._circuits.setdefault(key, _Circuit())
+        circuit.consecutive_failures += 1
+        if (
+            circuit.state is CircuitState.HALF_OPEN
+            or circuit.consecutive_failures >= self._failure_threshold
+        ):
+            circuit.state = CircuitState.OPEN
+            circuit.opened_at = self._clock()
+
+    def release(self, key: str) -> None:
+        """Report that an admitted call ended without an outcome (e.g.
+        it was cancelled). A HALF_OPEN probe is handed back so the next
+        caller can probe instead of the circuit waiting forever."""
+        circuit = self._circuits.get(key)
+        if circuit is not None and circuit.state is CircuitState.HALF_OPEN:
+            circuit.state = CircuitState.OPEN
+
+    def status(self) -> dict[str, CircuitStatus]:
+        """Return the status of every circuit that is not cleanly CLOSED
+        (i.e. OPEN, HALF_OPEN, or CLOSED with recent failures)."""
+        now = self._clock()
+        return {
+            key: CircuitStatus(
+                state=circuit.state,
+                consecutive_failures=circuit.consecutive_failures,
+                retry_in_seconds=(
+                    max(
+                        0.0,
+                        circuit.opened_at + self._reset_timeout_seconds - now,
+                    )
+                    if circuit.state is CircuitState.OPEN
+                    else 0.0
+                ),
+            )
+            for key, circuit in self._circuits.items()
+        }
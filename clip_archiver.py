@@ -0,0 +1,289 @@
+import asyncio
+import contextlib
+import logging
+import os
+import re
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from blink_service import BlinkService, MotionClip
+from clip_index import ClipIndex, media_id
+from media_worker import MediaWorker
+
+_LOGGER = logging.getLogger(__name__)
+
+# Archived clips older than this are deleted.
+CLIP_ARCHIVE_RETENTION_DAYS = 30
+# Once the archive grows past this size, its oldest clips are deleted
+# until it fits again.
+CLIP_ARCHIVE_MAX_BYTES = 20 * 1024**3
+# Clips waiting to be archived; further clips are dropped (and logged)
+# rather than piling up in memory while the disk or Blink is stuck.
+CLIP_ARCHIVE_QUEUE_SIZE = 200
+# Retention deletes files in batches of this many, each in a worker
+# thread, so catching up after e.g. a lowered limit never holds up the
+# event loop (or the archive's next clip) for long on a slow USB disk.
+CLIP_ARCHIVE_CLEANUP_BATCH = 20
+# Retention runs at start(), after each archived clip and, so that clips
+# still expire while there is no motion, at least this often.
+CLIP_ARCHIVE_CLEANUP_INTERVAL_SECONDS = 3600
+
+_CLIP_SUFFIX = ".mp4"
+_PARTIAL_SUFFIX = ".part"
+# Characters kept as-is in camera-name directories and clip file names.
+_UNSAFE_NAME_CHARS = re.compile(r"[^\w.-]+")
+
+
+def _safe_name(text: str) -> str:
+    """`text` reduced to characters safe in a file name on any disk."""
+    return _UNSAFE_NAME_CHARS.sub("_", text).strip("_") or "_"
+
+
+@dataclass
+class _ArchivedFile:
+    """One clip on disk, for retention bookkeeping."""
+
+    path: Path
+    size: int
+    mtime: float
+
+
+class ClipArchiver:
+    """Background stage that copies motion clips to a local directory
+    (e.g. the router's USB disk), independently of Blink's cloud
+    retention.
+
+    The main loop submit()s every new motion clip; a single worker task
+    streams them to `<archive_dir>/<camera>/<clip time>_<media id>.mp4`
+    one at a time via BlinkService.download_clip_to(), which only starts
+    when no other Blink operation is running or waiting. Clips whose
+    media ID is already archived are skipped. On start, after each clip
+    and every CLIP_ARCHIVE_CLEANUP_INTERVAL_SECONDS, files older than
+    the retention period, or the oldest ones while the archive exceeds
+    its size limit, are deleted a batch at a time. All disk access runs
+    in worker threads. Archived and deleted paths are recorded in
+    `clip_index`, if given.
+    """
+
+    def __init__(
+        self,
+        blink: BlinkService,
+        archive_dir: str | Path,
+        retention_days: float = CLIP_ARCHIVE_RETENTION_DAYS,
+        max_bytes: int = CLIP_ARCHIVE_MAX_BYTES,
+        queue_size: int = CLIP_ARCHIVE_QUEUE_SIZE,
+        clock: Callable[[], float] = time.time,
+        clip_index: ClipIndex | None = None,
+        media_worker: MediaWorker | None = None,
+    ) -> None:
+        """Configure the archive; nothing touches the disk until start().
+
+        With a `media_worker`, clips are downloaded in its process rather
+        than in this one.
+        """
+        self._blink = blink
+        self._clip_index = clip_index
+        self._media_worker = media_worker
+        self._archive_dir = Path(archive_dir)
+        self._retention_seconds = retention_days * 24 * 3600
+        self._max_bytes = max_bytes
+        self._clock = clock
+        self._queue: asyncio.Queue[MotionClip] = asyncio.Queue(queue_size)
+        self._task: asyncio.Task[None] | None = None
+        # Archived media IDs, and the archived files oldest first with
+        # their total size — see _enforce_retention().
+        self._media_ids: set[str] = set()
+        self._files: deque[_ArchivedFile] = deque()
+        self._total_bytes = 0
+
+    async def start(self) -> None:
+        """Index the existing archive and start the worker task."""
+        files = await asyncio.to_thread(self._scan)
+        for archived in files:
+            self._remember(archived)
+        if self._clip_index is not None:
+            await asyncio.to_thread(
+                self._clip_index.update_local_paths,
+                {
+                    _media_id_of(archived.path): str(archived.path)
+                    for archived in files
+                },
+            )
+        self._task = asyncio.create_task(self._run())
+        _LOGGER.info(
+            "Archiving motion clips to '%s' (%d clips, %.1f MB so far).",
+            self._archive_dir,
+            len(files),
+            self._total_bytes / 1024**2,
+        )
+
+    async def close(self) -> None:
+        """Stop the worker; clips still queued are not archived."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def submit(self, clips: list[MotionClip]) -> None:
+        """Queue `clips` for archiving without waiting."""
+        for clip in clips:
+            try:
+                self._queue.put_nowait(clip)
+            except asyncio.QueueFull:
+                _LOGGER.warning(
+                    "Clip archive queue full; not archiving '%s' clip at %s.",
+                    clip.camera_name,
+                    clip.clip_time,
+                )
+
+    async def _run(self) -> None:
+        """Enforce retention, then archive queued clips one at a time
+        (enforcing it again after each, or after an idle interval),
+        forever."""
+        while True:
+            try:
+                await self._clean_up()
+            except Exception:
+                _LOGGER.exception("Failed to clean up the clip archive.")
+            try:
+                async with asyncio.timeout(
+                    CLIP_ARCHIVE_CLEANUP_INTERVAL_SECONDS
+                ):
+                    clip = await self._queue.get()
+            except TimeoutError:
+                continue
+            try:
+                await self._archive(clip)
+            except Exception:
+                _LOGGER.exception(
+                    "Failed to archive '%s' clip at %s.",
+                    clip.camera_name,
+                    clip.clip_time,
+                )
+
+    async def _clean_up(self) -> None:
+        """Delete every file past retention or over the size limit, one
+        batch (and thread) at a time."""
+        while True:
+            deleted = await asyncio.to_thread(self._enforce_retention)
+            if self._clip_index is not None and deleted:
+                await asyncio.to_thread(
+                    self._clip_index.update_local_paths,
+                    dict.fromkeys(deleted),
+                )
+            if len(deleted) < CLIP_ARCHIVE_CLEANUP_BATCH:
+                return
+
+    async def _archive(self, clip: MotionClip) -> None:
+        """Download one clip into the archive unless it's already there.
+
+        The download goes to a ".part" file renamed into place once
+        complete, so the archive never holds a truncated clip.
+        """
+        clip_media_id = media_id(clip.clip_url)
+        if clip_media_id in self._media_ids:
+            return
+        directory = self._archive_dir / _safe_name(clip.camera_name)
+        path = directory / (
+            f"{_safe_name(clip.clip_time)}_{_safe_name(clip_media_id)}"
+            f"{_CLIP_SUFFIX}"
+        )
+        partial = path.with_name(path.name + _PARTIAL_SUFFIX)
+        await asyncio.to_thread(directory.mkdir, parents=True, exist_ok=True)
+        try:
+            complete = await self._download(clip, partial)
+            if not complete:
+                _LOGGER.warning(
+                    "Could not download '%s' clip at %s for the archive.",
+                    clip.camera_name,
+                    clip.clip_time,
+                )
+                return
+            archived = await asyncio.to_thread(_move_into_place, partial, path)
+        finally:
+            await asyncio.to_thread(partial.unlink, missing_ok=True)
+        self._remember(archived)
+        if self._clip_index is not None:
+            await asyncio.to_thread(
+                self._clip_index.record_local_path,
+                clip.camera_name,
+                clip.clip_time,
+                clip.clip_url,
+                str(path),
+            )
+
+    async def _download(self, clip: MotionClip, path: Path) -> bool:
+        """Download `clip` into `path`, through the media worker if there
+        is one."""
+        if self._media_worker is None:
+            return await self._blink.download_clip_to(
+                clip.camera_name, clip.clip_url, path
+            )
+        headers = self._blink.media_headers(clip.camera_name)
+        return headers is not None and await self._media_worker.save_clip(
+            clip.clip_url, headers, path
+        )
+
+    def _remember(self, archived: _ArchivedFile) -> None:
+        """Add a file to the retention bookkeeping (newest last)."""
+        self._media_ids.add(_media_id_of(archived.path))
+        self._files.append(archived)
+        self._total_bytes += archived.size
+
+    def _scan(self) -> list[_ArchivedFile]:
+        """List the archived clips on disk, oldest first, deleting any
+        ".part" file left behind by an interrupted download."""
+        files = []
+        if not self._archive_dir.is_dir():
+            return files
+        for path in self._archive_dir.glob("*/*"):
+            if path.name.endswith(_PARTIAL_SUFFIX):
+                path.unlink(missing_ok=True)
+            elif path.suffix == _CLIP_SUFFIX:
+                stat = path.stat()
+                files.append(_ArchivedFile(path, stat.st_size, stat.st_mtime))
+        files.sort(key=lambda archived: archived.mtime)
+        return files
+
+    def _enforce_retention(self) -> list[str]:
+        """Delete up to CLIP_ARCHIVE_CLEANUP_BATCH of the oldest files
+        that are past retention or push the archive over its size, and
+        return their media IDs."""
+        expire_before = self._clock() - self._retention_seconds
+        deleted: list[str] = []
+        for _ in range(CLIP_ARCHIVE_CLEANUP_BATCH):
+            if not self._files:
+                break
+            oldest = self._files[0]
+            if (
+                oldest.mtime >= expire_before
+                and self._total_bytes <= self._max_bytes
+            ):
+                break
+            self._files.popleft()
+            self._total_bytes -= oldest.size
+            self._media_ids.discard(_media_id_of(oldest.path))
+            deleted.append(_media_id_of(oldest.path))
+            try:
+                oldest.path.unlink(missing_ok=True)
+            except OSError:
+                _LOGGER.warning(
+                    "Could not delete archived clip '%s'.", oldest.path
+                )
+        return deleted
+
+
+def _move_into_place(partial: Path, path: Path) -> _ArchivedFile:
+    """Rename a completed download to its final name and describe it."""
+    os.replace(partial, path)
+    stat = path.stat()
+    return _ArchivedFile(path, stat.st_size, stat.st_mtime)
+
+
+def _media_id_of(path: Path) -> str:
+    """Media ID encoded in an archived clip's file name."""
+    return path.stem.rsplit("_", 1)[-1]
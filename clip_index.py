@@ -0,0 +1,297 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from blink_service import BlinkService, ClipHistory, ClipMetadata
+from local_storage import parse_utc
+
+_LOGGER = logging.getLogger(__name__)
+
+APP_DIR = Path(__file__).resolve().parent
+DEFAULT_CLIP_INDEX_FILE = APP_DIR / "clip_index.db"
+
+# How far back the very first sync reads Blink's video history.
+CLIP_INDEX_BACKFILL_DAYS = 7
+# Pages (~25 clips each) read per sync. A backlog bigger than this is
+# read over several syncs, each carrying on from the page after the
+# last one read; clips that shift onto a page twice are just upserted
+# again.
+CLIP_INDEX_SYNC_MAX_PAGES = 20
+# Rows for clips older than this are pruned, unless the clip is still
+# archived locally.
+CLIP_INDEX_RETENTION_DAYS = 90
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS clips (
+    media_id TEXT PRIMARY KEY,
+    camera TEXT NOT NULL,
+    clip_time TEXT NOT NULL,
+    clip_url TEXT NOT NULL,
+    local_path TEXT
+);
+CREATE INDEX IF NOT EXISTS clips_by_camera_time ON clips (camera, clip_time);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+_CURSOR_KEY = "history_cursor"
+# While a backlog is read over several syncs: the next page to read,
+# and the newest `updated_at` seen so far (the cursor once it's done).
+_PAGE_KEY = "history_page"
+_NEWEST_KEY = "history_newest"
+
+
+def media_id(clip_url: str) -> str:
+    """Blink's media ID of a clip: the file name of its URL without the
+    extension (".../media/clip/1234.mp4" -> "1234")."""
+    return Path(urlsplit(clip_url).path).stem
+
+
+def _utc_text(moment: datetime) -> str:
+    """Stored form of a time: UTC ISO 8601, so text order is time order."""
+    return moment.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+@dataclass
+class IndexedClip:
+    """One clip row of the index, as returned by ClipIndex.search()."""
+
+    camera_name: str
+    clip_time: datetime
+    media_id: str
+    clip_url: str
+    # Where ClipArchiver keeps a copy, if it does.
+    local_path: str | None
+
+
+class ClipIndex:
+    """Local SQLite index of clip metadata (camera, time, media ID,
+    archived path), so clip searches are answered without paging
+    Blink's cloud video history.
+
+    sync() reads only the history added or changed since the previous
+    sync, using the newest `updated_at` seen as its cursor; deleted
+    clips are removed. Blink lists the newest changes first, so a
+    backlog longer than `max_pages` is read from the same cursor over
+    several syncs, page by page, and the cursor only moves once the
+    backlog has been read to its end.
+
+    Writes go through one connection, serialized by a lock, and are
+    meant to run in a worker thread: sync() moves them there itself,
+    and record_local_path() / update_local_paths() are called through
+    asyncio.to_thread(). search() reads through a second connection on
+    the calling thread; the database runs in WAL mode, so a search
+    never waits on a write.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_CLIP_INDEX_FILE,
+        backfill_days: float = CLIP_INDEX_BACKFILL_DAYS,
+        max_pages: int = CLIP_INDEX_SYNC_MAX_PAGES,
+        retention_days: float = CLIP_INDEX_RETENTION_DAYS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Configure the database file; nothing is opened until open()."""
+        self._path = str(path)
+        self._backfill_seconds = backfill_days * 24 * 3600
+        self._max_pages = max_pages
+        self._retention_seconds = retention_days * 24 * 3600
+        self._clock = clock
+        self._db: sqlite3.Connection | None = None
+        self._reader: sqlite3.Connection | None = None
+        self._write_lock = threading.Lock()
+
+    def open(self) -> None:
+        """Open (creating if needed) the database."""
+        db = sqlite3.connect(self._path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only syncs at checkpoints: a power cut can
+        # lose the last syncs, which the next sync simply re-reads.
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(_SCHEMA)
+        self._db = db
+        self._reader = sqlite3.connect(self._path)
+
+    def close(self) -> None:
+        """Close the database, if open."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._db is not None:
+            with self._write_lock:
+                self._db.close()
+            self._db = None
+
+    def _require_db(self) -> sqlite3.Connection:
+        """Return the write connection, or raise if open() wasn't
+        called."""
+        if self._db is None:
+            raise RuntimeError("ClipIndex.open() has not been called.")
+        return self._db
+
+    def _require_reader(self) -> sqlite3.Connection:
+        """Return the read connection, or raise if open() wasn't
+        called."""
+        if self._reader is None:
+            raise RuntimeError("ClipIndex.open() has not been called.")
+        return self._reader
+
+    async def sync(self, blink: BlinkService) -> int:
+        """Add the clips Blink listed since the last sync; return how
+        many rows were added, updated or removed."""
+        state = dict(
+            self._require_reader().execute("SELECT key, value FROM sync_state")
+        )
+        since = float(
+            state.get(_CURSOR_KEY, self._clock() - self._backfill_seconds)
+        )
+        first_page = int(state.get(_PAGE_KEY, 1))
+        newest = float(state.get(_NEWEST_KEY, since))
+        history = await blink.clip_history(since, self._max_pages, first_page)
+        return await asyncio.to_thread(self._store, history, first_page, newest)
+
+    def _store(
+        self, history: ClipHistory, first_page: int, newest: float
+    ) -> int:
+        """Write one sync's history and where the next sync starts, and
+        prune old rows, in one transaction; return the number of rows
+        changed."""
+        db = self._require_db()
+        changes = 0
+        with self._write_lock, db:
+            for clip in history.clips:
+                try:
+                    changes += self._apply(db, clip)
+                    newest = max(newest, parse_utc(clip.updated_at).timestamp())
+                except ValueError:
+                    _LOGGER.warning(
+                        "Skipping clip with unreadable time: %s", clip
+                    )
+            if history.complete:
+                db.execute(
+                    "INSERT OR REPLACE INTO sync_state VALUES (?, ?)",
+                    (_CURSOR_KEY, repr(newest)),
+                )
+                db.execute(
+                    "DELETE FROM sync_state WHERE key IN (?, ?)",
+                    (_PAGE_KEY, _NEWEST_KEY),
+                )
+            else:
+                next_page = first_page + self._max_pages
+                db.executemany(
+                    "INSERT OR REPLACE INTO sync_state VALUES (?, ?)",
+                    ((_PAGE_KEY, str(next_page)), (_NEWEST_KEY, repr(newest))),
+                )
+                _LOGGER.warning(
+                    "Clip history backlog exceeds %d pages; continuing "
+                    "from page %d on the next sync.",
+                    self._max_pages,
+                    next_page,
+                )
+            db.execute(
+                "DELETE FROM clips WHERE clip_time < ? AND local_path IS NULL",
+                (
+                    _utc_text(
+                        datetime.fromtimestamp(
+                            self._clock() - self._retention_seconds,
+                            timezone.utc,
+                        )
+                    ),
+                ),
+            )
+        return changes
+
+    @staticmethod
+    def _apply(db: sqlite3.Connection, clip: ClipMetadata) -> int:
+        """Upsert or (if deleted) remove one history entry, keeping any
+        recorded local path."""
+        if clip.deleted:
+            return db.execute(
+                "DELETE FROM clips WHERE media_id = ?",
+                (media_id(clip.clip_url),),
+            ).rowcount
+        return db.execute(
+            "INSERT INTO clips (media_id, camera, clip_time, clip_url) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (media_id) DO UPDATE SET "
+            "camera = excluded.camera, clip_time = excluded.clip_time, "
+            "clip_url = excluded.clip_url",
+            (
+                media_id(clip.clip_url),
+                clip.camera_name,
+                _utc_text(parse_utc(clip.clip_time)),
+                clip.clip_url,
+            ),
+        ).rowcount
+
+    def record_local_path(
+        self, camera_name: str, clip_time: str, clip_url: str, local_path: str
+    ) -> None:
+        """Record where a clip has been archived, adding its row if the
+        history sync hasn't seen it yet."""
+        db = self._require_db()
+        with self._write_lock, db:
+            db.execute(
+                "INSERT INTO clips VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (media_id) DO UPDATE SET "
+                "local_path = excluded.local_path",
+                (
+                    media_id(clip_url),
+                    camera_name,
+                    _utc_text(parse_utc(clip_time)),
+                    clip_url,
+                    local_path,
+                ),
+            )
+
+    def update_local_paths(self, paths: Mapping[str, str | None]) -> None:
+        """Set (or, with None, clear) the local path of the clips with
+        these media IDs that are in the index."""
+        db = self._require_db()
+        with self._write_lock, db:
+            db.executemany(
+                "UPDATE clips SET local_path = ? WHERE media_id = ?",
+                ((path, mid) for mid, path in paths.items()),
+            )
+
+    def search(
+        self,
+        camera_name: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int = 20,
+    ) -> list[IndexedClip]:
+        """Clips of `camera_name` from `start` (inclusive) to `end`
+        (exclusive), newest first, at most `limit` of them."""
+        db = self._require_reader()
+        query = "SELECT * FROM clips WHERE camera = ?"
+        params: list[object] = [camera_name]
+        if start is not None:
+            query += " AND clip_time >= ?"
+            params.append(_utc_text(start))
+        if end is not None:
+            query += " AND clip_time < ?"
+            params.append(_utc_text(end))
+        query += " ORDER BY clip_time DESC LIMIT ?"
+        params.append(limit)
+        return [
+            IndexedClip(
+                camera_name=camera,
+                clip_time=parse_utc(clip_time),
+                media_id=mid,
+                clip_url=clip_url,
+                local_path=local_path,
+            )
+            for mid, camera, clip_time, clip_url, local_path in db.execute(
+                query, params
+            )
+        ]
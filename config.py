@@ -40,6 +40,19 @@ class AppConfig:
     ping_interval_seconds: int = 60
     motion_alerts_enabled: bool = False
 
+    # Optional, from .env — where to archive motion clips (see
+    # clip_archiver.py); None disables archiving.
+    clip_archive_dir: str | None = None
+    # Optional, from .env — directory downloaded clips are spooled to;
+    # None means the system temporary directory.
+    clip_spool_dir: str | None = None
+    # Optional, from .env — confirm each automatic arm/disarm by polling
+    # the command's status, alerting within seconds if it failed.
+    arm_confirmation_enabled: bool = False
+    # Optional, from .env — download and upload motion clips in a
+    # recycled child process (see media_worker.py).
+    media_worker_enabled: bool = False
+
 
 class Config:
     """Loads .env + config.json and provides atomic, validated save."""
@@ -91,6 +104,10 @@ class Config:
             absence_checks=mutable["absence_checks"],
             ping_interval_seconds=mutable["ping_interval_seconds"],
             motion_alerts_enabled=mutable["motion_alerts_enabled"],
+            clip_archive_dir=os.getenv("CLIP_ARCHIVE_DIR") or None,
+            clip_spool_dir=os.getenv("CLIP_SPOOL_DIR") or None,
+            arm_confirmation_enabled=_env_flag("ARM_CONFIRMATION"),
+            media_worker_enabled=_env_flag("MEDIA_WORKER"),
         )
 
     def save(self, cfg: AppConfig) -> None:
@@ -137,21 +154,7 @@ class Config:
         from a partial file but does not survive sudden power loss on
         the router target without fsync.
         """
-        directory = os.path.dirname(self.config_file) or "."
-        fd, tmp_path = tempfile.mkstemp(
-            dir=directory, suffix=".tmp", prefix="config_"
-        )
-        try:
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-                f.flush()
-                os.fsync(f.fileno())
-            os.replace(tmp_path, self.config_file)
-            _fsync_directory(directory)
-            _restrict_permissions(self.config_file)
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        write_json_atomically(self.config_file, data, indent=2)
 
     @staticmethod
     def _defaults() -> dict:
@@ -274,6 +277,11 @@ class Config:
         return result
 
 
+def _env_flag(name: str) -> bool:
+    """True if the optional .env switch `name` is set to 1/true/yes/on."""
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
 def _validate_unique_ip_list(value: object, field_name: str) -> list[str]:
     """Validate `value` is a list of unique valid IP address literals."""
     if not isinstance(value, list) or not all(
@@ -316,6 +324,29 @@ def _validate_unique_name_list(value: object, field_name: str) -> list[str]:
     return list(value)
 
 
+def write_json_atomically(
+    path: str, data: object, indent: int | None = None
+) -> None:
+    """Write `data` as JSON to `path` via a temp file in the same
+    directory, fsynced and renamed over `path`; then fsync the directory
+    and restrict the file to owner-only where supported. Readers see
+    either the old or the new contents, even across a power cut."""
+    directory = os.path.dirname(path) or "."
+    prefix = Path(path).stem + "_"
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp", prefix=prefix)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        _fsync_directory(directory)
+        _restrict_permissions(path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
 def _fsync_directory(directory: str) -> None:
     """Best-effort fsync of a directory so a rename survives power loss.
 
@@ -332,7 +363,7 @@ def _fsync_directory(directory: str) -> None:
             os.close(dir_fd)
     except OSError:
         _LOGGER.warning(
-            "Could not fsync directory '%s' after config write.", directory
+            "Could not fsync directory '%s' after write.", directory
         )
 
 
@@ -0,0 +1,99 @@
+import logging
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class LocalClip:
+    """One clip on a sync module's local (USB) storage."""
+
+    camera_name: str
+    clip_id: int
+    created_at: datetime
+    size: int
+
+
+class LocalManifest:
+    """Cached clip listing of one sync module's local storage.
+
+    Blink only ever returns the whole manifest, so merge() updates the
+    cache in place: clips already known are kept as they are, new ones
+    are added and ones no longer on the storage dropped. `manifest_id`
+    is the ID clip requests must be made against, which changes with
+    every manifest Blink builds.
+    """
+
+    def __init__(self) -> None:
+        """Start empty; nothing is cached until the first merge()."""
+        self.manifest_id: str | None = None
+        # time.monotonic() of the last merge(), None before it.
+        self.fetched_at: float | None = None
+        self._clips: dict[int, LocalClip] = {}
+
+    def is_fresh(self, now: float, max_age_seconds: float) -> bool:
+        """True if merged within `max_age_seconds` of `now`."""
+        return (
+            self.fetched_at is not None
+            and now - self.fetched_at < max_age_seconds
+        )
+
+    def merge(
+        self,
+        manifest_id: str,
+        entries: Iterable[Mapping],
+        camera_names: Mapping[str, str],
+        now: float,
+    ) -> int:
+        """Apply a freshly fetched manifest and return how many clips it
+        added.
+
+        `camera_names` maps the alphanumeric camera names used in the
+        manifest to the real ones; clips of other cameras are skipped.
+        """
+        clips: dict[int, LocalClip] = {}
+        for entry in entries:
+            try:
+                clip_id = int(entry["id"])
+                known = self._clips.get(clip_id)
+                if known is not None:
+                    clips[clip_id] = known
+                    continue
+                camera_name = camera_names.get(entry["camera_name"])
+                if camera_name is None:
+                    continue
+                clips[clip_id] = LocalClip(
+                    camera_name=camera_name,
+                    clip_id=clip_id,
+                    created_at=parse_utc(entry["created_at"]),
+                    size=int(entry.get("size") or 0),
+                )
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.warning("Skipping malformed manifest entry: %s", entry)
+        added = len(clips.keys() - self._clips.keys())
+        self._clips = clips
+        self.manifest_id = manifest_id
+        self.fetched_at = now
+        return added
+
+    def clips(self, camera_name: str) -> list[LocalClip]:
+        """The cached clips of `camera_name`, newest first."""
+        return sorted(
+            (
+                clip
+                for clip in self._clips.values()
+                if clip.camera_name == camera_name
+            ),
+            key=lambda clip: clip.created_at,
+            reverse=True,
+        )
+
+
+def parse_utc(text: str) -> datetime:
+    """Parse a Blink timestamp (ISO 8601, naive meaning UTC) as UTC."""
+    parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
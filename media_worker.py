@@ -0,0 +1,263 @@
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import IO
+
+from aiohttp import ClientSession, ClientTimeout, FormData
+
+from priority_lock import Priority, PriorityLock
+
+_LOGGER = logging.getLogger(__name__)
+
+# A worker process is retired (and a fresh one started for the next
+# job) after running this many jobs. CPython rarely hands freed memory
+# back to the OS, so whatever a clip download and upload grew the heap
+# to stays in RSS until the process exits — recycling keeps that from
+# ratcheting up on the router.
+MEDIA_WORKER_MAX_JOBS = 20
+# A job (download plus upload) not answered within this long is given
+# up on and its worker killed.
+MEDIA_WORKER_JOB_TIMEOUT_SECONDS = 300
+# How long a retired worker gets to exit on its own once its pipe is
+# closed, before it is killed.
+MEDIA_WORKER_EXIT_TIMEOUT_SECONDS = 10
+
+TELEGRAM_API_URL = "https://api.telegram.org"
+
+# Clips are streamed between network and disk in chunks of this size,
+# so the worker's own peak memory doesn't grow with the clip size.
+_CHUNK_BYTES = 64 * 1024
+
+# Environment the worker process is configured through — not its
+# command line, which other users on the router can read.
+_TOKEN_ENV = "MEDIA_WORKER_TELEGRAM_TOKEN"
+_API_URL_ENV = "MEDIA_WORKER_TELEGRAM_API_URL"
+_SPOOL_DIR_ENV = "MEDIA_WORKER_SPOOL_DIR"
+
+
+class MediaWorker:
+    """Runs clip downloads and their Telegram uploads or archive writes
+    in a child process, so the memory they churn through is returned to
+    the OS when the process is recycled instead of staying with the
+    long-running arm/disarm process.
+
+    Jobs go to the child as JSON lines over its stdin and are answered
+    one line each on its stdout, one job at a time: clips someone is
+    waiting for (send_clip) go ahead of queued archive copies
+    (save_clip), though not of one already running. The child is started
+    on the first job, replaced after `max_jobs` jobs, and killed (to be
+    restarted by the next job) if it dies, hangs past `job_timeout` or
+    its caller is cancelled mid-job. A failed job is logged and reported
+    as False; it never raises.
+    """
+
+    def __init__(
+        self,
+        telegram_token: str,
+        chat_id: int,
+        max_jobs: int = MEDIA_WORKER_MAX_JOBS,
+        job_timeout: float = MEDIA_WORKER_JOB_TIMEOUT_SECONDS,
+        telegram_api_url: str = TELEGRAM_API_URL,
+        command: Sequence[str] | None = None,
+        spool_dir: str | Path | None = None,
+    ) -> None:
+        """Configure the worker; no process is started until the first
+        job. `command` overrides how the child is launched (by default
+        this module, run by the current interpreter). Clips on their way
+        to Telegram are buffered in files in `spool_dir` (by default the
+        system temporary directory)."""
+        self._spool_dir = "" if spool_dir is None else str(spool_dir)
+        self._telegram_token = telegram_token
+        self._chat_id = chat_id
+        self._max_jobs = max_jobs
+        self._job_timeout = job_timeout
+        self._telegram_api_url = telegram_api_url
+        self._command = tuple(
+            command or (sys.executable, str(Path(__file__).resolve()))
+        )
+        self._process: asyncio.subprocess.Process | None = None
+        self._jobs_run = 0
+        self._lock = PriorityLock()
+
+    async def send_clip(
+        self, clip_url: str, headers: Mapping[str, str], caption: str
+    ) -> bool:
+        """Download the clip at `clip_url` (with Blink's auth `headers`)
+        and send it to the configured chat as a video."""
+        return await self._run_job(
+            {
+                "op": "send_video",
+                "url": clip_url,
+                "headers": dict(headers),
+                "chat_id": self._chat_id,
+                "caption": caption,
+            },
+            Priority.MEDIA,
+        )
+
+    async def save_clip(
+        self, clip_url: str, headers: Mapping[str, str], path: Path
+    ) -> bool:
+        """Download the clip at `clip_url` (with Blink's auth `headers`)
+        into the file at `path` (created or truncated). On False the
+        file may be partly written and is the caller's to remove."""
+        return await self._run_job(
+            {
+                "op": "save",
+                "url": clip_url,
+                "headers": dict(headers),
+                "path": str(path),
+            },
+            Priority.BACKGROUND,
+        )
+
+    async def close(self) -> None:
+        """Retire the worker process, if one is running."""
+        async with self._lock(Priority.NORMAL):
+            await self._retire()
+
+    async def _run_job(self, job: dict, priority: Priority) -> bool:
+        """Send `job` to the worker once the lock is granted at
+        `priority`, and wait for its answer."""
+        async with self._lock(priority):
+            try:
+                process = await self._ensure_process()
+                async with asyncio.timeout(self._job_timeout):
+                    process.stdin.write(json.dumps(job).encode() + b"\n")
+                    await process.stdin.drain()
+                    line = await process.stdout.readline()
+                if not line:
+                    raise ConnectionError("media worker exited mid-job")
+                reply = json.loads(line)
+            except asyncio.CancelledError:
+                # The answer would be read as the next job's — start over.
+                await self._kill()
+                raise
+            except Exception:
+                _LOGGER.exception("Media worker '%s' job failed.", job["op"])
+                await self._kill()
+                return False
+            self._jobs_run += 1
+            if self._jobs_run >= self._max_jobs:
+                await self._retire()
+            if not reply.get("ok"):
+                _LOGGER.warning(
+                    "Media worker '%s' job failed: %s",
+                    job["op"],
+                    reply.get("error"),
+                )
+                return False
+            return True
+
+    async def _ensure_process(self) -> asyncio.subprocess.Process:
+        """Return the running worker, starting a fresh one if needed."""
+        if self._process is not None and self._process.returncode is not None:
+            await self._kill()
+        if self._process is None:
+            self._process = await asyncio.create_subprocess_exec(
+                *self._command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                env={
+                    **os.environ,
+                    _TOKEN_ENV: self._telegram_token,
+                    _API_URL_ENV: self._telegram_api_url,
+                    _SPOOL_DIR_ENV: self._spool_dir,
+                },
+            )
+            self._jobs_run = 0
+            _LOGGER.debug("Started media worker (pid %d).", self._process.pid)
+        return self._process
+
+    async def _retire(self) -> None:
+        """Let the worker exit by closing its pipe, killing it if it
+        doesn't within MEDIA_WORKER_EXIT_TIMEOUT_SECONDS."""
+        process, self._process = self._process, None
+        if process is None or process.returncode is not None:
+            return
+        process.stdin.close()
+        try:
+            async with asyncio.timeout(MEDIA_WORKER_EXIT_TIMEOUT_SECONDS):
+                await process.wait()
+        except TimeoutError:
+            _LOGGER.warning("Media worker did not exit; killing it.")
+            process.kill()
+            await process.wait()
+
+    async def _kill(self) -> None:
+        """Kill the worker outright (if it is still running) and close
+        its pipe; the next job starts a new one."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        process.stdin.close()
+        if process.returncode is None:
+            process.kill()
+        await process.wait()
+
+
+# --- Worker process ---
+
+
+async def _download(session: ClientSession, job: dict, sink: IO[bytes]) -> None:
+    """Stream the clip of `job` into `sink`."""
+    async with session.get(job["url"], headers=job["headers"]) as response:
+        if response.status != 200:
+            raise RuntimeError(f"clip download answered {response.status}")
+        async for chunk in response.content.iter_chunked(_CHUNK_BYTES):
+            sink.write(chunk)
+
+
+async def _save(session: ClientSession, job: dict) -> None:
+    """Download the clip into the file at job["path"]."""
+    with open(job["path"], "wb") as f:
+        await _download(session, job, f)
+
+
+async def _send_video(session: ClientSession, job: dict) -> None:
+    """Download the clip to a temporary file and upload it to Telegram
+    from there, streamed in both directions."""
+    url = f"{os.environ[_API_URL_ENV]}/bot{os.environ[_TOKEN_ENV]}/sendVideo"
+    spool_dir = os.environ.get(_SPOOL_DIR_ENV) or None
+    with tempfile.TemporaryFile(dir=spool_dir) as clip:
+        await _download(session, job, clip)
+        clip.seek(0)
+        form = FormData()
+        form.add_field("chat_id", str(job["chat_id"]))
+        form.add_field("caption", job["caption"])
+        form.add_field(
+            "video", clip, filename="clip.mp4", content_type="video/mp4"
+        )
+        async with session.post(url, data=form) as response:
+            result = await response.json(content_type=None)
+    if not result.get("ok"):
+        raise RuntimeError(f"Telegram refused the video: {result}")
+
+
+_JOBS = {"save": _save, "send_video": _send_video}
+
+
+async def _serve() -> None:
+    """Answer jobs from stdin until it is closed."""
+    timeout = ClientTimeout(total=MEDIA_WORKER_JOB_TIMEOUT_SECONDS)
+    async with ClientSession(timeout=timeout) as session:
+        while line := await asyncio.to_thread(sys.stdin.buffer.readline):
+            try:
+                job = json.loads(line)
+                await _JOBS[job["op"]](session, job)
+                reply = {"ok": True}
+            except Exception as e:
+                reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            sys.stdout.buffer.write(json.dumps(reply).encode() + b"\n")
+            sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+    # Logs go to stderr (shared with the parent); stdout is the reply pipe.
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), stream=sys.stderr)
+    asyncio.run(_serve())
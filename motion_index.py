@@ -0,0 +1,145 @@
+import json
+import logging
+import os
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from config import write_json_atomically
+
+_LOGGER = logging.getLogger(__name__)
+
+APP_DIR = Path(__file__).resolve().parent
+DEFAULT_MOTION_INDEX_FILE = APP_DIR / "motion_index.json"
+
+# Delivered clips remembered per camera. Only needs to cover the clips
+# blinkpy can still list in camera.recent_clips (about an hour's worth),
+# so older entries are dropped to keep the file small.
+MOTION_INDEX_MAX_CLIPS_PER_CAMERA = 50
+
+# Changes are written out at most this often (and on shutdown) rather
+# than after every alert, to spare the router's flash during a motion
+# burst. A crash can therefore repeat, but never lose, up to this much
+# of the most recent alerts.
+MOTION_INDEX_FLUSH_SECONDS = 300
+
+
+def clip_id(clip_url: str) -> str:
+    """Stable, compact identifier of a clip: the path of its URL, which
+    doesn't depend on the regional API host it was listed under."""
+    return urlsplit(clip_url).path
+
+
+class MotionIndex:
+    """Persisted record of which motion clips have been delivered, per
+    camera, so a restart neither re-sends old clips nor needs a priming
+    poll that would silently swallow new ones.
+
+    A camera is "tracked" once its existing clips have been recorded;
+    only clips appearing after that are alerted on. Each camera keeps its
+    newest MOTION_INDEX_MAX_CLIPS_PER_CAMERA clips as (time, id) pairs,
+    oldest first.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_MOTION_INDEX_FILE,
+        max_clips_per_camera: int = MOTION_INDEX_MAX_CLIPS_PER_CAMERA,
+        flush_interval_seconds: float = MOTION_INDEX_FLUSH_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Configure the index file; nothing is read until load()."""
+        self._path = str(path)
+        self._max_clips_per_camera = max_clips_per_camera
+        self._flush_interval_seconds = flush_interval_seconds
+        self._clock = clock
+        self._cameras: dict[str, list[tuple[str, str]]] = {}
+        self._dirty = False
+        self._last_flush = clock()
+
+    def load(self) -> None:
+        """Read the index file, if any. An unreadable file is logged and
+        replaced on the next flush — at worst, cameras re-prime."""
+        if not os.path.exists(self._path):
+            return
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                raw = json.load(f)
+            self._cameras = {
+                str(camera): [(str(t), str(i)) for t, i in clips]
+                for camera, clips in raw["cameras"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            _LOGGER.warning(
+                "Ignoring unreadable motion index '%s'.",
+                self._path,
+                exc_info=True,
+            )
+            self._cameras = {}
+
+    def is_tracked(self, camera_name: str) -> bool:
+        """True once `camera_name`'s existing clips have been recorded."""
+        return camera_name in self._cameras
+
+    def track(self, camera_names: Iterable[str]) -> None:
+        """Start tracking any of `camera_names` not tracked yet."""
+        for name in camera_names:
+            if name not in self._cameras:
+                self._cameras[name] = []
+                self._dirty = True
+
+    def last_seen(self) -> dict[str, str | None]:
+        """Newest recorded clip time per tracked camera (None if it has
+        none) — the baseline for BlinkService.new_motion_clips()."""
+        return {
+            name: clips[-1][0] if clips else None
+            for name, clips in self._cameras.items()
+        }
+
+    def is_delivered(self, camera_name: str, clip_url: str) -> bool:
+        """True if this clip has already been recorded."""
+        wanted = clip_id(clip_url)
+        return any(
+            recorded == wanted
+            for _, recorded in self._cameras.get(camera_name, ())
+        )
+
+    def mark_delivered(
+        self, camera_name: str, clip_time: str, clip_url: str
+    ) -> None:
+        """Record a clip (tracking its camera if needed), dropping the
+        camera's oldest entries beyond the size limit."""
+        clips = self._cameras.setdefault(camera_name, [])
+        clips.append((clip_time, clip_id(clip_url)))
+        clips.sort()
+        del clips[: -self._max_clips_per_camera]
+        self._dirty = True
+
+    def flush_if_due(self) -> None:
+        """Write pending changes if the flush interval has passed."""
+        if (
+            self._dirty
+            and self._clock() - self._last_flush >= self._flush_interval_seconds
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending changes now, if there are any."""
+        if not self._dirty:
+            return
+        data = {
+            "cameras": {
+                name: [list(clip) for clip in clips]
+                for name, clips in self._cameras.items()
+            }
+        }
+        try:
+            write_json_atomically(self._path, data)
+        except OSError:
+            _LOGGER.exception(
+                "Failed to write motion index '%s'; will retry.", self._path
+            )
+            return
+        self._dirty = False
+        self._last_flush = self._clock()
@@ -0,0 +1,79 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+from collections.abc import AsyncIterator
+from enum import IntEnum
+
+
+class Priority(IntEnum):
+    """Urgency of a Blink operation; lower values are served first."""
+
+    # Arm/disarm — security-critical, must never queue behind media.
+    ARM = 0
+    # Connect, refresh and other account bookkeeping.
+    NORMAL = 1
+    # Snapshots and clips — convenience features that can wait.
+    MEDIA = 2
+    # Housekeeping nobody is waiting on, such as clip archiving.
+    BACKGROUND = 3
+
+
+class PriorityLock:
+    """asyncio mutex that, on release, hands the lock to the most urgent
+    waiter rather than the longest-waiting one (FIFO within a priority).
+
+    A holder is never interrupted, so long operations should take the
+    lock in short steps — each release is a point at which a more
+    urgent waiter gets in first. Not thread-safe.
+
+    Use as `async with lock(Priority.ARM): ...`.
+    """
+
+    def __init__(self) -> None:
+        """Start unlocked, with no waiters."""
+        self._locked = False
+        # Heap of (priority, arrival order, future); futures of waiters
+        # that gave up are left in place and skipped on release.
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._arrivals = itertools.count()
+
+    def locked(self) -> bool:
+        """True if some task holds the lock."""
+        return self._locked
+
+    @contextlib.asynccontextmanager
+    async def __call__(self, priority: Priority) -> AsyncIterator[None]:
+        """Hold the lock for the body of an `async with` block."""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: Priority) -> None:
+        """Wait until the lock is granted to this caller."""
+        if not self._locked:
+            self._locked = True
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._arrivals), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Granted just as we were cancelled: pass it straight on.
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Release the lock, handing it directly to the most urgent
+        waiter still waiting."""
+        if not self._locked:
+            raise RuntimeError("PriorityLock is not acquired.")
+        while self._waiters:
+            future = heapq.heappop(self._waiters)[2]
+            if not future.done():
+                future.set_result(None)
+                return
+        self._locked = False
@@ -0,0 +1,99 @@
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Each clean refresh shrinks a backed-off interval by this factor, so
+# the cadence creeps back towards the minimum over several refreshes
+# instead of jumping straight back to the rate that was just throttled.
+_RECOVERY_FACTOR = 0.75
+
+
+@dataclass
+class RefreshCadence:
+    """Point-in-time view of a RefreshScheduler, for status reporting."""
+
+    interval_seconds: float
+    # Seconds until the next periodic refresh is due; 0 when it is.
+    next_refresh_in_seconds: float
+    # True while the interval is backed off above the minimum.
+    throttled: bool
+
+
+class RefreshScheduler:
+    """Adaptive cadence for periodic Blink refreshes.
+
+    Refreshes are due `min_interval_seconds` apart while Blink is happy.
+    Every throttling signal (a 429, a Retry-After hint, a failed
+    refresh) doubles the interval, up to `max_interval_seconds`, and
+    pushes the next refresh past any Retry-After the server gave; each
+    clean refresh then shrinks it again by a quarter. Not thread-safe —
+    meant for use from a single asyncio loop.
+    """
+
+    def __init__(
+        self,
+        min_interval_seconds: float,
+        max_interval_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Start at the minimum interval, with a refresh due right away."""
+        self._min_interval = min_interval_seconds
+        self._max_interval = max_interval_seconds
+        self._clock = clock
+        self._interval = min_interval_seconds
+        self._next_due = 0.0
+
+    @property
+    def interval_seconds(self) -> float:
+        """Current gap between periodic refreshes."""
+        return self._interval
+
+    def due(self) -> bool:
+        """Return True if a periodic refresh may be made now."""
+        return self._clock() >= self._next_due
+
+    def record_refresh(self) -> None:
+        """Note a successful refresh: relax a backed-off interval and
+        schedule the next refresh one interval from now."""
+        self._interval = max(
+            self._min_interval, self._interval * _RECOVERY_FACTOR
+        )
+        self._next_due = max(self._next_due, self._clock() + self._interval)
+
+    def record_throttle(self, retry_after_seconds: float | None = None) -> None:
+        """Note that Blink pushed back (on a refresh or any other call):
+        double the interval and wait at least that long — or as long as
+        Blink asked, if more — before the next refresh."""
+        self._interval = min(self._max_interval, self._interval * 2)
+        wait = max(self._interval, retry_after_seconds or 0.0)
+        self._next_due = max(self._next_due, self._clock() + wait)
+
+    def status(self) -> RefreshCadence:
+        """Return the current interval and time until the next refresh."""
+        return RefreshCadence(
+            interval_seconds=self._interval,
+            next_refresh_in_seconds=max(0.0, self._next_due - self._clock()),
+            throttled=self._interval > self._min_interval,
+        )
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait according to an HTTP Retry-After header, given
+    either as a number of seconds or as an HTTP date; None if absent or
+    unreadable."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
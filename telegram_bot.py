@@ -3,8 +3,10 @@ import dataclasses
 import ipaddress
 import logging
 import time
+from datetime import date, datetime, timedelta
+from typing import IO
 
-from telegram import Update
+from telegram import InputFile, InputMediaPhoto, Update
 from telegram.error import TelegramError
 from telegram.ext import (
     Application,
@@ -15,6 +17,8 @@ from telegram.ext import (
 )
 
 from blink_service import BlinkService
+from circuit_breaker import CircuitState
+from clip_index import ClipIndex
 from config import AppConfig, Config
 from presence_monitor import PresenceMonitor
 from state import AppState
@@ -25,6 +29,7 @@ _HELP_TEXT = (
     "Commands (all under /cambot):\n"
     "help\n"
     "status\n"
+    "metrics\n"
     "enable | disable\n"
     "arm [name]\n"
     "disarm [name]\n"
@@ -36,14 +41,21 @@ _HELP_TEXT = (
     "ips add <ip>\n"
     "ips remove <ip>\n"
     "2fa <code>\n"
-    "snapshot <name>\n"
+    "snapshot <name> | all\n"
     "clip <name>\n"
+    "clips <name> [from] [to]\n"
     "alerts on | off\n"
     "settings show\n"
     "settings ping_interval <seconds>\n"
     "settings absence_checks <count>"
 )
 
+# Telegram's limit on photos per album (media group).
+_MEDIA_GROUP_MAX_PHOTOS = 10
+
+# Clips listed per `clips` search; narrowing the time range shows more.
+_CLIP_SEARCH_MAX_RESULTS = 20
+
 
 class TelegramBot:
     """Telegram bot with authorization gate and noun-verb command routing."""
@@ -60,6 +72,7 @@ class TelegramBot:
         state: AppState,
         blink: BlinkService,
         monitor: PresenceMonitor,
+        clip_index: ClipIndex | None = None,
     ):
         """Store dependencies for command handling and outbound messages."""
         self.token = token
@@ -70,6 +83,7 @@ class TelegramBot:
         self.state = state
         self.blink = blink
         self.monitor = monitor
+        self.clip_index = clip_index
         self._application: Application | None = None
         # start() must stay alive for the app's lifetime — like
         # run_main_loop(), it should only end via cancellation, not
@@ -185,6 +199,7 @@ class TelegramBot:
         handlers = {
             "help": lambda: self._cmd_help(context),
             "status": lambda: self._cmd_status(context),
+            "metrics": lambda: self._cmd_metrics(context),
             "enable": lambda: self._cmd_enable(context),
             "disable": lambda: self._cmd_disable(context),
             "arm": lambda: self._cmd_arm(context, rest),
@@ -194,6 +209,7 @@ class TelegramBot:
             "2fa": lambda: self._cmd_2fa(context, rest),
             "snapshot": lambda: self._cmd_snapshot(context, rest),
             "clip": lambda: self._cmd_clip(context, rest),
+            "clips": lambda: self._cmd_clips(context, rest),
             "alerts": lambda: self._cmd_alerts(context, rest),
             "settings": lambda: self._cmd_settings(context, rest),
         }
@@ -292,6 +308,14 @@ class TelegramBot:
             lines.append(f"  {ip} — {status}")
 
         lines.append("")
+        lines.extend(self._circuit_status_lines())
+        refresh_stats = self.blink.refresh_stats
+        lines.append(
+            f"Blink refreshes: {refresh_stats.performed} performed, "
+            f"{refresh_stats.saved} saved ({refresh_stats.coalesced} "
+            f"shared, {refresh_stats.reused} reused)"
+        )
+        lines.append(self._refresh_cadence_text())
         lines.append(f"Last arm/disarm: {self._last_arm_change_text()}")
         lines.append(
             "Last main-loop iteration: "
@@ -300,6 +324,61 @@ class TelegramBot:
 
         await self._reply(context, "\n".join(lines))
 
+    def _refresh_cadence_text(self) -> str:
+        """Format BlinkService's periodic-refresh cadence for
+        /cambot status, noting when it is backed off."""
+        cadence = self.blink.refresh_cadence()
+        text = f"Blink refresh cadence: every {cadence.interval_seconds:.0f}s"
+        if cadence.throttled:
+            text += (
+                " (backed off after throttling, next in "
+                f"{cadence.next_refresh_in_seconds:.0f}s)"
+            )
+        return text
+
+    def _circuit_status_lines(self) -> list[str]:
+        """Format BlinkService's per-operation circuit breaker state for
+        /cambot status — one line if everything is healthy."""
+        circuits = self.blink.circuit_status()
+        if not circuits:
+            return ["Blink API circuits: all closed"]
+        lines = ["Blink API circuits:"]
+        for operation, status in sorted(circuits.items()):
+            if status.state is CircuitState.OPEN:
+                detail = f"open, retry in {status.retry_in_seconds:.0f}s"
+            elif status.state is CircuitState.HALF_OPEN:
+                detail = "half-open, probing"
+            else:
+                detail = "closed"
+            lines.append(
+                f"  {operation}: {detail} "
+                f"({status.consecutive_failures} failure(s))"
+            )
+        return lines
+
+    async def _cmd_metrics(self, context: CallbackContext) -> None:
+        """Reply with per-operation Blink API call counts and latency
+        percentiles (estimated from BlinkService's histograms)."""
+        metrics = self.blink.metrics()
+        if not metrics:
+            await self._reply(context, "No Blink API calls recorded yet.")
+            return
+        lines = ["Blink API calls (ok/timeout/error/rejected):"]
+        for operation, op in sorted(metrics.items()):
+            lines.append("")
+            lines.append(
+                f"  {operation}: {op.success}/{op.timeout}/{op.error}/"
+                f"{op.rejected}"
+            )
+            if op.calls:
+                lines.append(
+                    f"    p50 ≤{op.percentile(0.5):.2f}s, "
+                    f"p95 ≤{op.percentile(0.95):.2f}s, "
+                    f"max {op.max_seconds:.2f}s, "
+                    f"mean {op.mean_seconds:.2f}s"
+                )
+        await self._reply(context, "\n".join(lines))
+
     def _last_arm_change_text(self) -> str:
         """Format time since last arm/disarm as 'Xd XXh XXm ago' or 'Never'."""
         return self._elapsed_text(self.state.time_of_last_arm_change)
@@ -466,8 +545,7 @@ class TelegramBot:
             )
             return
 
-        known_names = {cam.name for cam in self.blink.list_all_cameras()}
-        if name not in known_names:
+        if name not in self.blink.camera_table.by_name:
             await self._reply(
                 context, f"Error: camera '{name}' not found in Blink account."
             )
@@ -566,7 +644,7 @@ class TelegramBot:
         if not self.blink.is_connected:
             return []
 
-        current_names = {cam.name for cam in self.blink.list_all_cameras()}
+        current_names = self.blink.camera_table.by_name
         stale = [
             name
             for name in self.app_cfg.controlled_cameras
@@ -695,11 +773,12 @@ class TelegramBot:
     async def _cmd_snapshot(
         self, context: CallbackContext, args: list[str]
     ) -> None:
-        """Take and send a live snapshot from the named camera."""
+        """Take and send a live snapshot from the named camera, or with
+        `all`, from every controlled camera."""
         name = " ".join(args).strip()
         if not name:
             await self._reply(
-                context, f"Usage: snapshot <name>\n\n{_HELP_TEXT}"
+                context, f"Usage: snapshot <name>|all\n\n{_HELP_TEXT}"
             )
             return
 
@@ -707,6 +786,10 @@ class TelegramBot:
             await self._reply(context, "Not connected to Blink API.")
             return
 
+        if name.lower() == "all":
+            await self._snapshot_all(context)
+            return
+
         if not self.blink.has_camera(name):
             await self._reply(context, f"No camera named '{name}' found.")
             return
@@ -719,6 +802,39 @@ class TelegramBot:
             return
         await context.bot.send_photo(chat_id=self.chat_id, photo=image)
 
+    async def _snapshot_all(self, context: CallbackContext) -> None:
+        """Snapshot every controlled camera concurrently and send the
+        images as one album (Telegram media group, split every
+        _MEDIA_GROUP_MAX_PHOTOS)."""
+        names = list(self.app_cfg.controlled_cameras)
+        if not names:
+            await self._reply(context, "No controlled cameras to snapshot.")
+            return
+
+        images = await self.blink.snapshots(names)
+        photos = [(name, image) for name, image in images.items() if image]
+        for start in range(0, len(photos), _MEDIA_GROUP_MAX_PHOTOS):
+            batch = photos[start : start + _MEDIA_GROUP_MAX_PHOTOS]
+            if len(batch) == 1:
+                # An album needs at least two items.
+                [(name, image)] = batch
+                await context.bot.send_photo(
+                    chat_id=self.chat_id, photo=image, caption=name
+                )
+            else:
+                await context.bot.send_media_group(
+                    chat_id=self.chat_id,
+                    media=[
+                        InputMediaPhoto(media=image, caption=name)
+                        for name, image in batch
+                    ],
+                )
+        failed = [name for name, image in images.items() if not image]
+        if failed:
+            await self._reply(
+                context, f"Could not get snapshot for: {', '.join(failed)}."
+            )
+
     async def _cmd_clip(
         self, context: CallbackContext, args: list[str]
     ) -> None:
@@ -742,7 +858,44 @@ class TelegramBot:
                 context, f"No clip available for camera '{name}'."
             )
             return
-        await context.bot.send_video(chat_id=self.chat_id, video=clip)
+        with clip:
+            await context.bot.send_video(
+                chat_id=self.chat_id, video=_clip_input_file(clip)
+            )
+
+    async def _cmd_clips(
+        self, context: CallbackContext, args: list[str]
+    ) -> None:
+        """List the named camera's clips, optionally from/to a date or
+        time (local, ISO 8601), answered from the local clip index."""
+        name, start, end = _split_clip_search(args)
+        if not name:
+            await self._reply(
+                context, f"Usage: clips <name> [from] [to]\n\n{_HELP_TEXT}"
+            )
+            return
+
+        if self.clip_index is None:
+            await self._reply(context, "Clip index not available.")
+            return
+
+        clips = self.clip_index.search(
+            name, start, end, limit=_CLIP_SEARCH_MAX_RESULTS + 1
+        )
+        if not clips:
+            await self._reply(context, f"No clips found for camera '{name}'.")
+            return
+        lines = [f"Clips for '{name}', newest first:"]
+        for clip in clips[:_CLIP_SEARCH_MAX_RESULTS]:
+            when = clip.clip_time.astimezone().strftime("%Y-%m-%d %H:%M:%S")
+            archived = " (archived)" if clip.local_path else ""
+            lines.append(f"{when}{archived}")
+        if len(clips) > _CLIP_SEARCH_MAX_RESULTS:
+            lines.append(
+                f"Showing the newest {_CLIP_SEARCH_MAX_RESULTS}; narrow the "
+                "range to see older clips."
+            )
+        await self._reply(context, "\n".join(lines))
 
     async def _cmd_alerts(
         self, context: CallbackContext, args: list[str]
@@ -872,14 +1025,56 @@ class TelegramBot:
         except Exception:
             _LOGGER.exception("Failed to send Telegram photo.")
 
-    async def send_video(self, text: str, video: bytes) -> None:
-        """Send a proactive video to the configured chat."""
+    async def send_video(self, text: str, video: IO[bytes]) -> None:
+        """Send a proactive video to the configured chat, streaming the
+        upload from the open file handle `video` (left open — the
+        caller owns it)."""
         if self._application is None:
             _LOGGER.error("Cannot send Telegram video: bot is not started.")
             return
         try:
             await self._application.bot.send_video(
-                chat_id=self.chat_id, video=video, caption=text
+                chat_id=self.chat_id,
+                video=_clip_input_file(video),
+                caption=text,
             )
         except Exception:
             _LOGGER.exception("Failed to send Telegram video.")
+
+
+def _search_time(text: str, end: bool) -> datetime:
+    """Parse a `clips` search bound: an ISO 8601 date or date-time, in
+    local time unless it has an offset. A bare date means the start of
+    that day, or with `end`, the start of the next (so it's included).
+    Raises ValueError if `text` is neither."""
+    try:
+        day = date.fromisoformat(text)
+    except ValueError:
+        moment = datetime.fromisoformat(text)
+        return moment if moment.tzinfo else moment.astimezone()
+    start = datetime(day.year, day.month, day.day).astimezone()
+    return start + timedelta(days=1) if end else start
+
+
+def _split_clip_search(
+    args: list[str],
+) -> tuple[str, datetime | None, datetime | None]:
+    """Split `clips` arguments into the camera name (which may contain
+    spaces) and the optional from/to bounds trailing it."""
+    words = list(args)
+    bounds: list[str] = []
+    while words and len(bounds) < 2:
+        try:
+            _search_time(words[-1], end=False)
+        except ValueError:
+            break
+        bounds.insert(0, words.pop())
+    start = _search_time(bounds[0], end=False) if bounds else None
+    end = _search_time(bounds[1], end=True) if len(bounds) == 2 else None
+    return " ".join(words).strip(), start, end
+
+
+def _clip_input_file(clip: IO[bytes]) -> InputFile:
+    """Wrap a clip file handle so PTB streams it to Telegram from the
+    handle instead of first reading the whole clip into memory."""
+    return InputFile(clip, filename="clip.mp4", read_file_handle=False)
@@ -3,3 +3,22 @@
 This file keeps the tests directory as pytest's configuration scope. Add
 cross-test fixtures here only when they are needed.
 """
+
+import pytest
+
+
+class FakeClock:
+    """Settable stand-in for time.monotonic()/time.time(): call it for
+    the current time, assign `now` to move it."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """A FakeClock for components that take a `clock` argument."""
+    return FakeClock()
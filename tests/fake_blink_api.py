@@ -0,0 +1,646 @@
+"""Local stand-in for the Blink cloud API.
+
+Serves the endpoints blinkpy 0.25.x hits for BlinkService's connect(),
+refresh(), arm/disarm, snapshot(), get_latest_clip() and motion-clip
+downloads, so integration and load tests can drive the real blinkpy
+request path without Blink's cloud. Latency, failure injection and the
+camera count are configurable via FakeBlinkConfig.
+
+blinkpy hard-codes its https:// hosts, so instead of configuring URLs
+the fake hands out a ClientSession (client_session()) whose middleware
+rewrites every request to the local server; pass it to
+BlinkService(session=...). write_credentials() seeds a saved refresh
+token so connect() takes blinkpy's token-refresh path rather than the
+interactive OAuth flow.
+
+Run as a load test from the repository root:
+
+    python -m tests.fake_blink_api --cameras 50 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import collections
+import contextlib
+import json
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+from aiohttp import ClientSession, web
+from yarl import URL
+
+from priority_lock import Priority, PriorityLock
+
+ACCOUNT_ID = 1001
+NETWORK_ID = 2002
+SYNC_MODULE_ID = 3003
+REGION_ID = "fake"
+REFRESH_TOKEN = "fake-refresh-token"
+
+# blinkpy pages video history 25 items at a time.
+VIDEOS_PAGE_SIZE = 25
+
+
+@dataclass
+class FakeBlinkConfig:
+    """Knobs for FakeBlinkApi."""
+
+    camera_count: int = 3
+    # Added to every request; jitter is uniform in [0, jitter).
+    latency_seconds: float = 0.0
+    latency_jitter_seconds: float = 0.0
+    # Probability that any request fails with HTTP 500.
+    failure_rate: float = 0.0
+    clip_bytes: int = 256 * 1024
+    # How long a camera takes to upload a requested snapshot: its
+    # thumbnail only changes this long after the snap request.
+    snapshot_upload_seconds: float = 0.0
+    seed: int = 0
+
+
+@dataclass
+class FakeCamera:
+    """Server-side state of one fake camera."""
+
+    camera_id: int
+    name: str
+    armed: bool = False
+    thumbnail_ts: int = field(default_factory=lambda: int(time.time()))
+
+
+@dataclass
+class FakeClip:
+    """One entry in the fake video history."""
+
+    clip_id: int
+    camera: FakeCamera
+    created_at: str
+
+
+class FakeBlinkApi:
+    """In-process aiohttp server impersonating Blink's REST and OAuth
+    hosts. Use as an async context manager."""
+
+    def __init__(self, config: FakeBlinkConfig | None = None):
+        """Create (but don't start) a server with `config.camera_count`
+        cameras named "Camera 1".."Camera N" on a single network."""
+        self.config = config or FakeBlinkConfig()
+        self.cameras = {
+            f"Camera {i}": FakeCamera(camera_id=4000 + i, name=f"Camera {i}")
+            for i in range(1, self.config.camera_count + 1)
+        }
+        self.clips: list[FakeClip] = []
+        # Requests served per route name, and the most served at once.
+        self.request_counts: collections.Counter[str] = collections.Counter()
+        self.max_concurrent_requests = 0
+        self._in_flight = 0
+        self._injected_failures: dict[str, list[tuple[int, dict]]] = {}
+        self._random = random.Random(self.config.seed)
+        self._next_id = 1
+        self._runner: web.AppRunner | None = None
+        self._url: URL | None = None
+
+    async def __aenter__(self) -> "FakeBlinkApi":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Start listening on a free localhost port."""
+        app = web.Application(middlewares=[self._middleware])
+        for method, path, name, handler in self._routes():
+            app.router.add_route(method, path, handler, name=name)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self._url = URL.build(scheme="http", host=host, port=port)
+
+    async def close(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @property
+    def url(self) -> URL:
+        """Base URL of the running server."""
+        if self._url is None:
+            raise RuntimeError("Fake Blink API is not started.")
+        return self._url
+
+    def client_session(self, **kwargs) -> ClientSession:
+        """Return a ClientSession that sends every request to this server,
+        whatever host blinkpy asked for. The caller closes it."""
+        target = self.url
+
+        async def redirect(request, handler):
+            request.url = (
+                request.url.with_scheme(target.scheme)
+                .with_host(target.host)
+                .with_port(target.port)
+            )
+            return await handler(request)
+
+        return ClientSession(middlewares=(redirect,), **kwargs)
+
+    def write_credentials(self, path: str | Path) -> None:
+        """Write a BlinkService credentials file holding a refresh token
+        this server accepts."""
+        credentials = {
+            "refresh_token": REFRESH_TOKEN,
+            "hardware_id": str(uuid.uuid4()).upper(),
+            "host": f"{REGION_ID}.immedia-semi.com",
+            "region_id": REGION_ID,
+            "account_id": ACCOUNT_ID,
+        }
+        Path(path).write_text(json.dumps(credentials))
+
+    def add_clip(self, camera_name: str) -> str:
+        """Record a motion clip for `camera_name` timestamped now, and
+        return its created_at timestamp."""
+        created_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.clips.append(
+            FakeClip(self._new_id(), self.cameras[camera_name], created_at)
+        )
+        return created_at
+
+    def inject_failure(
+        self,
+        route: str,
+        status: int = 500,
+        times: int = 1,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """Fail the next `times` requests to `route` (a name from
+        request_counts) with HTTP `status` and `headers` (e.g. a
+        Retry-After)."""
+        self._injected_failures.setdefault(route, []).extend(
+            [(status, headers or {})] * times
+        )
+
+    # --- Server internals ---
+
+    def _new_id(self) -> int:
+        """Return a fresh command/clip id."""
+        self._next_id += 1
+        return self._next_id
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        """Count the request, apply latency, then inject any failure."""
+        route = request.match_info.route.name or "unknown"
+        self.request_counts[route] += 1
+        self._in_flight += 1
+        self.max_concurrent_requests = max(
+            self.max_concurrent_requests, self._in_flight
+        )
+        try:
+            delay = self.config.latency_seconds
+            if self.config.latency_jitter_seconds:
+                delay += self._random.uniform(
+                    0, self.config.latency_jitter_seconds
+                )
+            if delay:
+                await asyncio.sleep(delay)
+            injected = self._injected_failures.get(route)
+            if injected:
+                status, headers = injected.pop(0)
+                return web.Response(
+                    status=status, headers=headers, text="Injected"
+                )
+            if self._random.random() < self.config.failure_rate:
+                return web.Response(status=500, text="Injected")
+            return await handler(request)
+        finally:
+            self._in_flight -= 1
+
+    def _routes(self):
+        """(method, path, name, handler) for every served endpoint."""
+        account = "/api/v1/accounts/{account}"
+        camera = "/network/{network}/camera/{camera}"
+        return [
+            ("POST", "/oauth/token", "token", self._token),
+            ("GET", "/api/v1/users/tier_info", "tier_info", self._tier_info),
+            (
+                "GET",
+                "/api/v3/accounts/{account}/homescreen",
+                "homescreen",
+                self._homescreen,
+            ),
+            ("GET", "/networks", "networks", self._networks),
+            ("GET", "/api/v1/camera/usage", "camera_usage", self._usage),
+            (
+                "GET",
+                "/network/{network}/syncmodules",
+                "syncmodule",
+                self._syncmodule,
+            ),
+            (
+                "POST",
+                "/network/{network}/update",
+                "network_update",
+                self._network_update,
+            ),
+            (
+                "GET",
+                "/network/{network}/command/{command}",
+                "command_status",
+                self._command_status,
+            ),
+            ("GET", f"{camera}/config", "camera_config", self._camera_config),
+            ("GET", f"{camera}/signals", "camera_signals", self._signals),
+            ("POST", camera + "/{action:enable|disable}", "arm", self._arm),
+            ("POST", f"{camera}/thumbnail", "snap", self._snap),
+            (
+                "GET",
+                "/api/v3/media/accounts/{account}/networks/{network}"
+                "/{type}/{camera}/thumbnail/thumbnail.jpg",
+                "thumbnail",
+                self._thumbnail,
+            ),
+            ("GET", f"{account}/media/changed", "videos", self._videos),
+            (
+                "GET",
+                "/api/v2/accounts/{account}/media/clip/{clip:\\d+}.mp4",
+                "clip",
+                self._clip,
+            ),
+        ]
+
+    def _camera(self, request: web.Request) -> FakeCamera:
+        """Look up the camera named by the {camera} id in the path."""
+        camera_id = int(request.match_info["camera"])
+        for camera in self.cameras.values():
+            if camera.camera_id == camera_id:
+                return camera
+        raise web.HTTPNotFound()
+
+    def _command(self) -> web.Response:
+        """Accept a command; command_status reports it done at once."""
+        return web.json_response(
+            {"id": self._new_id(), "network_id": NETWORK_ID}
+        )
+
+    async def _token(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        if form.get("refresh_token") != REFRESH_TOKEN:
+            return web.Response(status=401, text="Invalid refresh token")
+        return web.json_response(
+            {
+                "access_token": f"fake-access-token-{self._new_id()}",
+                "refresh_token": REFRESH_TOKEN,
+                "expires_in": 3600,
+                "token_type": "Bearer",
+            }
+        )
+
+    async def _tier_info(self, request: web.Request) -> web.Response:
+        return web.json_response({"tier": REGION_ID, "account_id": ACCOUNT_ID})
+
+    async def _homescreen(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "account": {"id": ACCOUNT_ID},
+                "sync_modules": [
+                    {
+                        "id": SYNC_MODULE_ID,
+                        "network_id": NETWORK_ID,
+                        "local_storage_enabled": False,
+                        "local_storage_compatible": False,
+                        "local_storage_status": "unavailable",
+                    }
+                ],
+                "owls": [],
+                "doorbells": [],
+            }
+        )
+
+    async def _networks(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"summary": {str(NETWORK_ID): {"name": "Home", "onboarded": True}}}
+        )
+
+    async def _usage(self, request: web.Request) -> web.Response:
+        cameras = [
+            {"id": camera.camera_id, "name": camera.name}
+            for camera in self.cameras.values()
+        ]
+        return web.json_response(
+            {"networks": [{"network_id": NETWORK_ID, "cameras": cameras}]}
+        )
+
+    async def _syncmodule(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "syncmodule": {
+                    "id": SYNC_MODULE_ID,
+                    "network_id": NETWORK_ID,
+                    "serial": "FAKE0001",
+                    "status": "online",
+                    "fw_version": "4.4.0",
+                }
+            }
+        )
+
+    async def _network_update(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "id": self._new_id(),
+                "network_id": NETWORK_ID,
+                "network": {"armed": True, "sync_module_error": False},
+            }
+        )
+
+    async def _command_status(self, request: web.Request) -> web.Response:
+        return web.json_response({"status_code": 908, "complete": True})
+
+    async def _camera_config(self, request: web.Request) -> web.Response:
+        camera = self._camera(request)
+        return web.json_response(
+            {
+                "camera": [
+                    {
+                        "id": camera.camera_id,
+                        "name": camera.name,
+                        "network_id": NETWORK_ID,
+                        "serial": f"FAKE{camera.camera_id}",
+                        "fw_version": "10.0",
+                        "enabled": camera.armed,
+                        "battery": "ok",
+                        "status": "done",
+                        "type": "catalina",
+                        "thumbnail": camera.thumbnail_ts,
+                    }
+                ]
+            }
+        )
+
+    async def _signals(self, request: web.Request) -> web.Response:
+        return web.json_response({"temp": 68, "battery": 3, "lfr": 5})
+
+    async def _arm(self, request: web.Request) -> web.Response:
+        self._camera(request).armed = request.match_info["action"] == "enable"
+        return self._command()
+
+    async def _snap(self, request: web.Request) -> web.Response:
+        camera = self._camera(request)
+
+        def upload() -> None:
+            # Always a new thumbnail, even within the same second.
+            camera.thumbnail_ts = max(int(time.time()), camera.thumbnail_ts + 1)
+
+        if self.config.snapshot_upload_seconds:
+            asyncio.get_running_loop().call_later(
+                self.config.snapshot_upload_seconds, upload
+            )
+        else:
+            upload()
+        return self._command()
+
+    async def _thumbnail(self, request: web.Request) -> web.Response:
+        camera = self._camera(request)
+        body = f"{camera.name}@{request.query.get('ts')}".encode()
+        return web.Response(
+            body=b"\xff\xd8\xff\xe0" + body + b"\xff\xd9",
+            content_type="image/jpeg",
+        )
+
+    async def _videos(self, request: web.Request) -> web.Response:
+        # blinkpy sends the "+0000" offset unescaped, so it decodes as a
+        # space.
+        since = datetime.fromisoformat(request.query["since"].replace(" ", "+"))
+        page = int(request.query.get("page", 1))
+        matching = [
+            clip
+            for clip in reversed(self.clips)
+            if datetime.fromisoformat(clip.created_at) > since
+        ]
+        start = (page - 1) * VIDEOS_PAGE_SIZE
+        media = [
+            {
+                "id": clip.clip_id,
+                "created_at": clip.created_at,
+                "device_name": clip.camera.name,
+                "network_id": NETWORK_ID,
+                "media": (
+                    f"/api/v2/accounts/{ACCOUNT_ID}/media/clip/"
+                    f"{clip.clip_id}.mp4"
+                ),
+                "deleted": False,
+            }
+            for clip in matching[start : start + VIDEOS_PAGE_SIZE]
+        ]
+        return web.json_response({"media": media})
+
+    async def _clip(self, request: web.Request) -> web.Response:
+        clip_id = int(request.match_info["clip"])
+        if not any(clip.clip_id == clip_id for clip in self.clips):
+            raise web.HTTPNotFound()
+        return web.Response(
+            body=bytes(self.config.clip_bytes), content_type="video/mp4"
+        )
+
+
+@contextlib.contextmanager
+def no_blinkpy_throttle() -> Iterator[None]:
+    """Disable blinkpy's client-side call throttles for the duration.
+
+    blinkpy sleeps up to 5 s between arm/disarm and snapshot requests
+    (one throttle shared by every camera), which would otherwise make a
+    load test measure blinkpy's sleeps rather than BlinkService.
+    """
+
+    async def no_sleep(seconds: float) -> None:
+        pass
+
+    with patch("blinkpy.helpers.util.sleep", no_sleep):
+        yield
+
+
+@contextlib.asynccontextmanager
+async def connected_service(
+    fake: FakeBlinkApi, credentials_dir: str | Path, **service_kwargs
+) -> AsyncIterator:
+    """Yield a BlinkService connected to `fake` through the real
+    blinkpy request path; closes its session afterwards."""
+    from blink_service import BlinkService, ConnectResult
+
+    credentials_file = Path(credentials_dir) / "blink_credentials.json"
+    fake.write_credentials(credentials_file)
+    async with fake.client_session() as session:
+        service = BlinkService(
+            "user@example.com", "pw", session=session, **service_kwargs
+        )
+        service.CREDENTIALS_FILE = str(credentials_file)
+        result = await service.connect()
+        if result is not ConnectResult.OK:
+            raise RuntimeError(f"Connect to fake Blink API failed: {result}")
+        yield service
+
+
+# --- Load test ---
+
+
+class _TimedLock(PriorityLock):
+    """PriorityLock that records how long each acquire() waited and how
+    long the lock was then held."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.waits: list[float] = []
+        self.holds: list[float] = []
+        self._acquired_at = 0.0
+
+    async def acquire(self, priority: Priority) -> None:
+        started = time.perf_counter()
+        await super().acquire(priority)
+        self._acquired_at = time.perf_counter()
+        self.waits.append(self._acquired_at - started)
+
+    def release(self) -> None:
+        self.holds.append(time.perf_counter() - self._acquired_at)
+        super().release()
+
+
+async def run_load_test(
+    config: FakeBlinkConfig, rounds: int, clients: int
+) -> dict:
+    """Drive a BlinkService against a fake API with `config.camera_count`
+    cameras: each round, a main-loop-like task refreshes, arms every
+    camera and drains motion events while `clients` Telegram-like tasks
+    request snapshots and latest clips. Returns throughput and lock
+    contention figures."""
+    latencies: dict[str, list[float]] = collections.defaultdict(list)
+
+    async def timed(name: str, coro) -> None:
+        started = time.perf_counter()
+        try:
+            result = await coro
+        except Exception:
+            latencies[f"{name} (failed)"].append(time.perf_counter() - started)
+            return
+        latencies[name].append(time.perf_counter() - started)
+        if hasattr(result, "close"):
+            result.close()
+
+    async with FakeBlinkApi(config) as fake:
+        names = list(fake.cameras)
+        picker = random.Random(config.seed)
+        with tempfile.TemporaryDirectory() as tmp, no_blinkpy_throttle():
+            async with connected_service(
+                fake, tmp, refresh_max_age_seconds=0, snapshot_ttl_seconds=0
+            ) as service:
+                lock = service._lock = _TimedLock()
+                # blinkpy skips a refresh within refresh_rate (30 s) of
+                # the last one; every refresh here should be a round trip.
+                service._blink.refresh_rate = 0
+                last_seen: dict[str, str | None] = dict.fromkeys(names)
+                motion_events = 0
+
+                async def main_loop_round() -> None:
+                    nonlocal motion_events
+                    await timed("refresh", service.refresh())
+                    await timed("arm_cameras", service.arm_cameras(names))
+                    clips = await service.new_motion_clips(last_seen)
+                    async with contextlib.aclosing(
+                        service.iter_motion_clip_downloads(clips)
+                    ) as events:
+                        async for event in events:
+                            last_seen[event.camera_name] = event.clip_time
+                            motion_events += 1
+                            if event.clip_file is not None:
+                                event.clip_file.close()
+
+                async def client() -> None:
+                    name = picker.choice(names)
+                    await timed("snapshot", service.snapshot(name))
+                    await timed(
+                        "get_latest_clip", service.get_latest_clip(name)
+                    )
+
+                started = time.perf_counter()
+                for _ in range(rounds):
+                    for name in picker.sample(names, k=min(3, len(names))):
+                        fake.add_clip(name)
+                    await asyncio.gather(
+                        main_loop_round(), *(client() for _ in range(clients))
+                    )
+                elapsed = time.perf_counter() - started
+
+        return {
+            "elapsed_seconds": elapsed,
+            "http_requests": sum(fake.request_counts.values()),
+            "max_concurrent_requests": fake.max_concurrent_requests,
+            "motion_events": motion_events,
+            "operations": {
+                name: {
+                    "count": len(values),
+                    "mean_seconds": statistics.fmean(values),
+                    "max_seconds": max(values),
+                }
+                for name, values in sorted(latencies.items())
+            },
+            "lock_acquisitions": len(lock.waits),
+            "lock_wait_total_seconds": sum(lock.waits),
+            "lock_wait_max_seconds": max(lock.waits, default=0.0),
+            "lock_hold_total_seconds": sum(lock.holds),
+        }
+
+
+def _print_report(report: dict) -> None:
+    """Print run_load_test()'s result as a small table."""
+    elapsed = report["elapsed_seconds"]
+    print(
+        f"{report['http_requests']} HTTP requests in {elapsed:.2f}s "
+        f"({report['http_requests'] / elapsed:.0f}/s), "
+        f"at most {report['max_concurrent_requests']} concurrent; "
+        f"{report['motion_events']} motion events delivered"
+    )
+    print(f"{'operation':<26}{'count':>7}{'mean':>10}{'max':>10}")
+    for name, op in report["operations"].items():
+        print(
+            f"{name:<26}{op['count']:>7}{op['mean_seconds']:>9.3f}s"
+            f"{op['max_seconds']:>9.3f}s"
+        )
+    print(
+        f"Service lock: {report['lock_acquisitions']} acquisitions, held "
+        f"{report['lock_hold_total_seconds']:.2f}s "
+        f"({report['lock_hold_total_seconds'] / elapsed:.0%} of the run), "
+        f"waited {report['lock_wait_total_seconds']:.2f}s in total, "
+        f"{report['lock_wait_max_seconds']:.3f}s at worst"
+    )
+
+
+def main() -> None:
+    """Command-line entry point for the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cameras", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--clients", type=int, default=4)
+    args = parser.parse_args()
+    config = FakeBlinkConfig(
+        camera_count=args.cameras,
+        latency_seconds=args.latency,
+        latency_jitter_seconds=args.jitter,
+        failure_rate=args.failure_rate,
+    )
+    _print_report(asyncio.run(run_load_test(config, args.rounds, args.clients)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Tests for api_metrics.py — per-operation latency histograms."""
+
+from api_metrics import (
+    LATENCY_BUCKET_BOUNDS_SECONDS,
+    ApiMetrics,
+    CallOutcome,
+    OperationMetrics,
+)
+
+
+def test_record_counts_outcomes_separately() -> None:
+    op = OperationMetrics()
+    op.record(CallOutcome.SUCCESS, 0.2)
+    op.record(CallOutcome.SUCCESS, 0.3)
+    op.record(CallOutcome.TIMEOUT, 30)
+    op.record(CallOutcome.ERROR, 1)
+
+    assert (op.success, op.timeout, op.error, op.rejected) == (2, 1, 1, 0)
+    assert op.calls == 4
+
+
+def test_record_places_latency_in_upper_bound_bucket() -> None:
+    op = OperationMetrics()
+    op.record(CallOutcome.SUCCESS, 0.1)  # on a bound: that bucket
+    op.record(CallOutcome.SUCCESS, 0.11)
+    op.record(CallOutcome.SUCCESS, 500)  # beyond every bound: overflow
+
+    assert op.bucket_counts[0] == 1
+    assert op.bucket_counts[1] == 1
+    assert op.bucket_counts[-1] == 1
+    assert len(op.bucket_counts) == len(LATENCY_BUCKET_BOUNDS_SECONDS) + 1
+
+
+def test_rejected_calls_are_counted_without_latency() -> None:
+    op = OperationMetrics()
+    op.record(CallOutcome.REJECTED, None)
+
+    assert op.rejected == 1
+    assert op.calls == 0
+    assert sum(op.bucket_counts) == 0
+    assert op.mean_seconds is None
+    assert op.percentile(0.5) is None
+
+
+def test_percentile_reports_bucket_upper_bound() -> None:
+    op = OperationMetrics()
+    for _ in range(9):
+        op.record(CallOutcome.SUCCESS, 0.2)
+    op.record(CallOutcome.SUCCESS, 7)
+
+    assert op.percentile(0.5) == 0.25
+    assert op.percentile(0.9) == 0.25
+    # Capped at the observed maximum rather than the bucket bound (10).
+    assert op.percentile(0.95) == 7
+    assert op.mean_seconds == (9 * 0.2 + 7) / 10
+
+
+def test_percentile_in_overflow_bucket_is_observed_max() -> None:
+    op = OperationMetrics()
+    op.record(CallOutcome.TIMEOUT, 300)
+
+    assert op.percentile(0.5) == 300
+
+
+def test_api_metrics_keys_by_operation() -> None:
+    metrics = ApiMetrics()
+    metrics.record("refresh", CallOutcome.SUCCESS, 0.5)
+    metrics.record("snapshot", CallOutcome.ERROR, 1)
+    metrics.record("refresh", CallOutcome.REJECTED, None)
+
+    snapshot = metrics.snapshot()
+    assert set(snapshot) == {"refresh", "snapshot"}
+    assert snapshot["refresh"].success == 1
+    assert snapshot["refresh"].rejected == 1
+    assert snapshot["snapshot"].error == 1
+
+
+def test_snapshot_is_independent_of_live_metrics() -> None:
+    metrics = ApiMetrics()
+    metrics.record("refresh", CallOutcome.SUCCESS, 0.5)
+    snapshot = metrics.snapshot()
+
+    metrics.record("refresh", CallOutcome.SUCCESS, 0.5)
+    snapshot["refresh"].success = 99
+
+    assert snapshot["refresh"].calls == 99
+    assert metrics.snapshot()["refresh"].success == 2
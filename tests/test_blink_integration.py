@@ -0,0 +1,244 @@
+"""Integration tests: BlinkService through the real blinkpy request path,
+against the local fake Blink API in fake_blink_api.py."""
+
+import asyncio
+import contextlib
+import json
+from unittest.mock import patch
+
+import pytest
+from aiohttp import ContentTypeError
+from fake_blink_api import (
+    FakeBlinkApi,
+    FakeBlinkConfig,
+    connected_service,
+    no_blinkpy_throttle,
+    run_load_test,
+)
+
+from blink_service import BlinkService, BlinkTimeoutError
+
+
+@pytest.fixture(autouse=True)
+def _no_throttle():
+    """blinkpy's throttles are module-global, so without this one test's
+    calls would make the next one sleep."""
+    with no_blinkpy_throttle():
+        yield
+
+
+@pytest.fixture
+async def fake() -> FakeBlinkApi:
+    async with FakeBlinkApi(FakeBlinkConfig(camera_count=3)) as api:
+        yield api
+
+
+@pytest.fixture
+async def service(fake: FakeBlinkApi, tmp_path) -> BlinkService:
+    async with connected_service(
+        fake, tmp_path, refresh_max_age_seconds=0, snapshot_ttl_seconds=0
+    ) as svc:
+        yield svc
+
+
+@pytest.mark.asyncio
+async def test_connect_discovers_fake_cameras(
+    fake: FakeBlinkApi, service: BlinkService
+) -> None:
+    assert service.is_connected
+    cameras = service.list_all_cameras()
+    assert [cam.name for cam in cameras] == list(fake.cameras)
+    assert all(cam.online and not cam.armed for cam in cameras)
+    assert fake.request_counts["token"] == 1
+
+
+@pytest.mark.asyncio
+async def test_arm_and_disarm_reach_the_api(
+    fake: FakeBlinkApi, service: BlinkService
+) -> None:
+    assert await service.arm_cameras(["Camera 1", "Camera 2"]) == {
+        "Camera 1": True,
+        "Camera 2": True,
+    }
+    assert fake.cameras["Camera 1"].armed
+    assert fake.cameras["Camera 2"].armed
+
+    await service.disarm_cameras(["Camera 2"])
+    assert not fake.cameras["Camera 2"].armed
+    assert fake.request_counts["arm"] == 3
+
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_server_side_state(
+    fake: FakeBlinkApi, service: BlinkService
+) -> None:
+    fake.cameras["Camera 3"].armed = True
+
+    await service.refresh()
+
+    armed = {cam.name: cam.armed for cam in service.list_all_cameras()}
+    assert armed == {"Camera 1": False, "Camera 2": False, "Camera 3": True}
+
+
+@pytest.mark.asyncio
+async def test_partial_refresh_only_updates_named_cameras(
+    fake: FakeBlinkApi, service: BlinkService
+) -> None:
+    fake.cameras["Camera 1"].armed = True
+    fake.cameras["Camera 3"].armed = True
+    fake.request_counts.clear()
+
+    await service.refresh(["Camera 1"])
+
+    armed = {cam.name: cam.armed for cam in service.list_all_cameras()}
+    assert armed == {"Camera 1": True, "Camera 2": False, "Camera 3": False}
+    assert fake.request_counts["camera_config"] == 1
+    assert fake.request_counts["camera_signals"] == 1
+    assert fake.request_counts["homescreen"] == 1
+
+
+@pytest.mark.asyncio
+async def test_snapshot_returns_new_thumbnail_bytes(
+    fake: FakeBlinkApi, service: BlinkService
+) -> None:
+    image = await service.snapshot("Camera 1")
+
+    assert image is not None
+    assert image.startswith(b"\xff\xd8")
+    new_ts = fake.cameras["Camera 1"].thumbnail_ts
+    assert f"Camera 1@{new_ts}".encode() in image
+    assert fake.request_counts["snap"] == 1
+
+
+@pytest.mark.asyncio
+async def test_snapshot_before_refresh_waits_for_its_own_upload(
+    fake: FakeBlinkApi, service: BlinkService
+) -> None:
+    """A second snapshot taken before any refresh must not take the first
+    snapshot's thumbnail for its own while the camera is uploading."""
+    fake.config.snapshot_upload_seconds = 0.3
+    with patch("blink_service.SNAPSHOT_POLL_INITIAL_SECONDS", 0.05):
+        first = await service.snapshot("Camera 1")
+        first_ts = fake.cameras["Camera 1"].thumbnail_ts
+        second = await service.snapshot("Camera 1")
+
+    second_ts = fake.cameras["Camera 1"].thumbnail_ts
+    assert second_ts != first_ts
+    assert f"Camera 1@{first_ts}".encode() in first
+    assert f"Camera 1@{second_ts}".encode() in second
+
+
+@pytest.mark.asyncio
+async def test_get_latest_clip_downloads_newest_clip(
+    fake: FakeBlinkApi, service: BlinkService
+) -> None:
+    fake.add_clip("Camera 2")
+
+    clip = await service.get_latest_clip("Camera 2")
+
+    assert clip is not None
+    with clip:
+        assert len(clip.read()) == fake.config.clip_bytes
+
+
+@pytest.mark.asyncio
+async def test_failed_clip_download_returns_none(
+    fake: FakeBlinkApi, service: BlinkService
+) -> None:
+    fake.add_clip("Camera 2")
+    fake.inject_failure("clip", status=503)
+
+    assert await service.get_latest_clip("Camera 2") is None
+
+
+@pytest.mark.asyncio
+async def test_throttled_response_defers_periodic_refresh(
+    fake: FakeBlinkApi, service: BlinkService
+) -> None:
+    fake.inject_failure(
+        "homescreen", status=429, headers={"Retry-After": "600"}
+    )
+
+    # blinkpy fails the refresh on the non-JSON 429 body.
+    with pytest.raises(ContentTypeError):
+        await service.refresh()
+
+    assert not service.refresh_due()
+    cadence = service.refresh_cadence()
+    assert cadence.throttled
+    assert 590 < cadence.next_refresh_in_seconds <= 600
+
+
+@pytest.mark.asyncio
+async def test_throttled_arm_command_backs_off_refresh_cadence(
+    fake: FakeBlinkApi, service: BlinkService
+) -> None:
+    fake.inject_failure("arm", status=429)
+
+    await service.arm_cameras(["Camera 1"])
+
+    assert service.refresh_cadence().interval_seconds == 60
+    assert not service.refresh_due()
+
+
+@pytest.mark.asyncio
+async def test_motion_clip_is_delivered_after_refresh(
+    fake: FakeBlinkApi, service: BlinkService
+) -> None:
+    clip_time = fake.add_clip("Camera 1")
+    await service.refresh()
+
+    clips = await service.new_motion_clips(dict.fromkeys(fake.cameras))
+    async with contextlib.aclosing(
+        service.iter_motion_clip_downloads(clips)
+    ) as events:
+        delivered = [event async for event in events]
+
+    assert [(e.camera_name, e.clip_time) for e in delivered] == [
+        ("Camera 1", clip_time)
+    ]
+    with delivered[0].clip_file as clip_file:
+        assert len(clip_file.read()) == fake.config.clip_bytes
+
+
+@pytest.mark.asyncio
+async def test_slow_api_trips_operation_timeout(tmp_path) -> None:
+    config = FakeBlinkConfig(camera_count=1, latency_seconds=0.05)
+    async with (
+        FakeBlinkApi(config) as fake,
+        connected_service(
+            fake, tmp_path, operation_timeouts={"snapshot": 0.01}
+        ) as service,
+    ):
+        with pytest.raises(BlinkTimeoutError):
+            await service.snapshot("Camera 1")
+
+        assert service.metrics()["snapshot"].timeout == 1
+
+
+@pytest.mark.asyncio
+async def test_load_test_reports_throughput_and_lock_contention() -> None:
+    report = await run_load_test(
+        FakeBlinkConfig(camera_count=3), rounds=1, clients=2
+    )
+
+    assert report["http_requests"] > 0
+    assert report["motion_events"] == 3
+    assert report["operations"]["snapshot"]["count"] == 2
+    assert report["operations"]["arm_cameras"]["count"] == 1
+    assert report["lock_acquisitions"] >= 6
+
+
+@pytest.mark.asyncio
+async def test_token_is_refreshed_through_the_api_before_expiry(
+    fake: FakeBlinkApi, tmp_path
+) -> None:
+    # The fake issues one-hour tokens; refresh 0.1s after each is issued.
+    with patch("blink_service.TOKEN_REFRESH_MARGIN_SECONDS", 3599.9):
+        async with connected_service(fake, tmp_path) as service:
+            await asyncio.sleep(0.15)
+            await service.close()
+
+    assert fake.request_counts["token"] >= 2
+    saved = json.loads((tmp_path / "blink_credentials.json").read_text())
+    assert saved["token"].startswith("fake-access-token-")
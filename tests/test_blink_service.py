@@ -1,17 +1,28 @@
 """Tests for blink_service.py — BlinkService wrapper around blinkpy."""
 
 import asyncio
+import contextlib
+import json
+import tempfile
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+import blink_service
 from blink_service import (
+    CLIP_DOWNLOAD_CHUNK_BYTES,
+    BlinkDeadlineExceededError,
     BlinkService,
     BlinkTimeoutError,
+    BlinkUnavailableError,
     CameraInfo,
+    ClipMetadata,
     ConnectResult,
+    MotionClip,
     MotionEvent,
 )
+from priority_lock import Priority
 
 
 class _FakeAuth:
@@ -19,6 +30,7 @@ class _FakeAuth:
         self.login_data = login_data or {}
         self.no_prompt = no_prompt
         self.login_attributes = {**self.login_data, "refresh_token": "rt"}
+        self.expiration_date = None
 
 
 def _make_blink_mock(start_result=True, cameras=None):
@@ -26,10 +38,10 @@ def _make_blink_mock(start_result=True, cameras=None):
     blink.start = AsyncMock(return_value=start_result)
     blink.refresh = AsyncMock(return_value=True)
     blink.send_2fa_code = AsyncMock(return_value=True)
-    blink.save = AsyncMock()
     blink.cameras = cameras if cameras is not None else {}
     blink.auth = MagicMock()
     blink.auth.login_attributes = {"token": "abc", "refresh_token": "rt"}
+    blink.auth.expiration_date = None
     return blink
 
 
@@ -37,6 +49,22 @@ def _make_blink_mock(start_result=True, cameras=None):
 def _no_real_files(tmp_path, monkeypatch):
     """Redirect the credentials file into a tmp dir for every test."""
     monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(
+        BlinkService,
+        "CREDENTIALS_FILE",
+        str(tmp_path / "blink_credentials.json"),
+    )
+
+
+@pytest.fixture(autouse=True)
+def http_session_cls():
+    """Stand in for the aiohttp session connect() creates."""
+    with (
+        patch("blink_service.ClientSession") as session_cls,
+        patch("blink_service.TCPConnector"),
+    ):
+        session_cls.return_value.close = AsyncMock()
+        yield session_cls
 
 
 @pytest.mark.asyncio
@@ -51,7 +79,7 @@ async def test_connect_with_valid_saved_credentials_returns_ok() -> None:
         ),
         patch("blink_service.os.path.exists", return_value=True),
         patch("blink_service.Blink", return_value=blink),
-        patch("blink_service.Auth", _FakeAuth),
+        patch("blink_service._ThrottleAwareAuth", _FakeAuth),
     ):
         result = await service.connect()
 
@@ -75,7 +103,7 @@ async def test_connect_with_no_credentials_file_merges_username_password() -> (
     with (
         patch("blink_service.os.path.exists", return_value=False),
         patch("blink_service.Blink", return_value=blink),
-        patch("blink_service.Auth", side_effect=fake_auth_init),
+        patch("blink_service._ThrottleAwareAuth", side_effect=fake_auth_init),
     ):
         result = await service.connect()
 
@@ -102,7 +130,7 @@ async def test_connect_merges_saved_credentials_with_username_password() -> (
         patch("blink_service.json_load", new=AsyncMock(return_value=saved)),
         patch("blink_service.os.path.exists", return_value=True),
         patch("blink_service.Blink", return_value=blink),
-        patch("blink_service.Auth", side_effect=fake_auth_init),
+        patch("blink_service._ThrottleAwareAuth", side_effect=fake_auth_init),
     ):
         await service.connect()
 
@@ -120,7 +148,7 @@ async def test_connect_calls_start_exactly_once_with_missing_file() -> None:
     with (
         patch("blink_service.os.path.exists", return_value=False),
         patch("blink_service.Blink", return_value=blink),
-        patch("blink_service.Auth", _FakeAuth),
+        patch("blink_service._ThrottleAwareAuth", _FakeAuth),
     ):
         await service.connect()
 
@@ -136,7 +164,7 @@ async def test_connect_calls_start_exactly_once_with_stale_file() -> None:
         patch("blink_service.json_load", new=AsyncMock(return_value=None)),
         patch("blink_service.os.path.exists", return_value=True),
         patch("blink_service.Blink", return_value=blink),
-        patch("blink_service.Auth", _FakeAuth),
+        patch("blink_service._ThrottleAwareAuth", _FakeAuth),
     ):
         await service.connect()
 
@@ -156,7 +184,7 @@ async def test_connect_raises_two_fa_returns_needs_2fa_and_retains_blink() -> (
     with (
         patch("blink_service.os.path.exists", return_value=False),
         patch("blink_service.Blink", return_value=blink),
-        patch("blink_service.Auth", _FakeAuth),
+        patch("blink_service._ThrottleAwareAuth", _FakeAuth),
     ):
         result = await service.connect()
 
@@ -172,7 +200,7 @@ async def test_connect_start_returns_false_gives_failed() -> None:
     with (
         patch("blink_service.os.path.exists", return_value=False),
         patch("blink_service.Blink", return_value=blink),
-        patch("blink_service.Auth", _FakeAuth),
+        patch("blink_service._ThrottleAwareAuth", _FakeAuth),
     ):
         result = await service.connect()
 
@@ -215,14 +243,57 @@ async def test_submit_2fa_code_without_connection_raises_runtime_error() -> (
 
 
 @pytest.mark.asyncio
-async def test_save_credentials_calls_blink_save() -> None:
+async def test_save_credentials_writes_login_attributes() -> None:
     service = BlinkService("user@example.com", "pw")
     blink = _make_blink_mock()
     service._blink = blink
 
     await service.save_credentials()
 
-    blink.save.assert_awaited_once_with(BlinkService.CREDENTIALS_FILE)
+    assert _saved_credentials(service) == blink.auth.login_attributes
+
+
+@pytest.mark.asyncio
+async def test_save_credentials_skips_unchanged_attributes() -> None:
+    service = BlinkService("user@example.com", "pw")
+    blink = _make_blink_mock()
+    service._blink = blink
+
+    with patch("blink_service.write_json_atomically") as write:
+        await service.save_credentials()
+        await service.save_credentials()
+        assert write.call_count == 1
+
+        blink.auth.login_attributes = {"token": "new", "refresh_token": "rt"}
+        await service.save_credentials()
+        assert write.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_reconnect_rotates_token_and_rewrites_file() -> None:
+    """blinkpy's Auth.startup() swaps the refresh token for a fresh access
+    token on every start(), so a reconnect always has something to save."""
+    service = BlinkService("user@example.com", "pw")
+    saved = {"token": "old", "refresh_token": "rt", "expiration_date": 1.0}
+    with open(service.CREDENTIALS_FILE, "w", encoding="utf-8") as f:
+        json.dump(saved, f)
+    blink = _make_blink_mock()
+
+    async def start() -> bool:
+        blink.auth.login_attributes.update(token="new", expiration_date=2.0)
+        return True
+
+    blink.start = AsyncMock(side_effect=start)
+
+    with (
+        patch("blink_service.Blink", return_value=blink),
+        patch("blink_service._ThrottleAwareAuth", _FakeAuth),
+    ):
+        assert await service.connect() == ConnectResult.OK
+        await service.save_credentials()
+
+    assert _saved_credentials(service)["token"] == "new"
+    assert _saved_credentials(service)["expiration_date"] == 2.0
 
 
 @pytest.mark.asyncio
@@ -235,6 +306,11 @@ async def test_save_credentials_without_connection_raises_runtime_error() -> (
         await service.save_credentials()
 
 
+def _saved_credentials(service: BlinkService) -> dict:
+    with open(service.CREDENTIALS_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
 def _make_camera(name, arm=True, online=True, battery="ok"):
     cam = MagicMock()
     cam.name = name
@@ -244,6 +320,7 @@ def _make_camera(name, arm=True, online=True, battery="ok"):
     cam.online = online
     cam.arm = arm
     cam.battery = battery
+    cam.sync.local_storage = False
     return cam
 
 
@@ -256,7 +333,7 @@ def test_list_all_cameras_returns_camera_info() -> None:
 
     cameras = service.list_all_cameras()
 
-    assert cameras == [
+    assert cameras == (
         CameraInfo(
             name="Backyard",
             camera_id="1",
@@ -265,8 +342,54 @@ def test_list_all_cameras_returns_camera_info() -> None:
             online=True,
             armed=True,
             battery="ok",
-        )
-    ]
+        ),
+    )
+
+
+def test_list_all_cameras_reuses_table_until_next_refresh() -> None:
+    service = BlinkService("user@example.com", "pw")
+    service._blink = _make_blink_mock(
+        cameras={"Backyard": _make_camera("Backyard")}
+    )
+
+    first = service.list_all_cameras()
+    second = service.list_all_cameras()
+
+    assert first is second
+    assert service.camera_table.version == 1
+
+
+@pytest.mark.asyncio
+async def test_camera_table_rebuilt_with_new_version_after_refresh() -> None:
+    service = BlinkService("user@example.com", "pw", refresh_max_age_seconds=0)
+    cam = _make_camera("Backyard", arm=False)
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+    before = service.camera_table
+
+    cam.arm = True
+    assert service.camera_table is before  # not rebuilt without refresh
+    await service.refresh()
+    after = service.camera_table
+
+    assert after.version == before.version + 1
+    assert after.by_name["Backyard"].armed is True
+
+
+def test_camera_table_indexes_by_name_and_id_read_only() -> None:
+    service = BlinkService("user@example.com", "pw")
+    cam_a = _make_camera("Backyard")
+    cam_b = _make_camera("Garage")
+    cam_b.camera_id = "2"
+    service._blink = _make_blink_mock(
+        cameras={"Backyard": cam_a, "Garage": cam_b}
+    )
+
+    table = service.camera_table
+
+    assert table.by_name["Garage"].camera_id == "2"
+    assert table.by_id["1"].name == "Backyard"
+    with pytest.raises(TypeError):
+        table.by_name["Ghost"] = table.by_name["Garage"]
 
 
 def test_list_all_cameras_without_connection_raises_runtime_error() -> None:
@@ -286,6 +409,7 @@ def test_list_all_cameras_coerces_unknown_arm_string_to_false() -> None:
     cameras = service.list_all_cameras()
 
     assert cameras[0].armed is False
+    assert cameras[0].arm_state_known is False
 
 
 @pytest.mark.asyncio
@@ -327,23 +451,208 @@ async def test_arm_cameras_unknown_name_returns_false_no_raise() -> None:
     assert result == {"Ghost": False}
 
 
-@pytest.mark.asyncio
-async def test_snapshot_returns_bytes_from_cache() -> None:
+# --- Arm command confirmation ---
+
+
+def _command_status(*statuses: dict) -> AsyncMock:
+    """Stand in for api.request_command_status, returning `statuses` in
+    turn."""
+    return AsyncMock(side_effect=list(statuses))
+
+
+async def _armed_service(response) -> BlinkService:
+    """A service that has just armed "Backyard", Blink answering the
+    command with `response`."""
     service = BlinkService("user@example.com", "pw")
     cam = _make_camera("Backyard")
-    cam.snap_picture = AsyncMock()
-    cam.image_from_cache = b"jpegbytes"
+    cam.async_arm = AsyncMock(return_value=response)
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+    await service.arm_cameras(["Backyard"])
+    return service
+
+
+@pytest.mark.asyncio
+async def test_confirm_arm_command_polls_until_complete() -> None:
+    service = await _armed_service({"id": 7, "network_id": 3})
+    status = _command_status(
+        {"status_code": 908, "complete": False},
+        {"status_code": 908, "complete": True},
+    )
+
+    with (
+        patch("blink_service.api.request_command_status", status),
+        patch("blink_service.asyncio.sleep", AsyncMock()) as sleep,
+    ):
+        assert await service.confirm_arm_command("Backyard") is True
+
+    assert status.await_args.args[1:] == (3, 7)
+    sleep.assert_awaited_once_with(0.5)
+
+
+@pytest.mark.asyncio
+async def test_confirm_arm_command_reports_failed_command() -> None:
+    service = await _armed_service({"id": 7, "network_id": 3})
+    status = _command_status({"status_code": 400, "complete": True})
+
+    with patch("blink_service.api.request_command_status", status):
+        assert await service.confirm_arm_command("Backyard") is False
+
+
+@pytest.mark.asyncio
+async def test_confirm_arm_command_backs_off_then_times_out() -> None:
+    service = await _armed_service({"id": 7, "network_id": 3})
+    pending = {"status_code": 908, "complete": False}
+    status = AsyncMock(return_value=pending)
+    now = [0.0]
+    delays: list[float] = []
+
+    async def sleep(delay):
+        delays.append(delay)
+        now[0] += delay
+
+    with (
+        patch("blink_service.api.request_command_status", status),
+        patch("blink_service.asyncio.sleep", sleep),
+        patch("blink_service.time.monotonic", lambda: now[0]),
+    ):
+        assert await service.confirm_arm_command("Backyard") is False
+
+    # Doubling, capped at 2 s, until the poll after 15 s.
+    assert delays == [0.5, 1, 2, 2, 2, 2, 2, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_confirm_arm_command_without_command_returns_none() -> None:
+    service = await _armed_service(None)
+
+    with patch("blink_service.api.request_command_status") as status:
+        assert await service.confirm_arm_command("Backyard") is None
+        # Each command is only confirmed once.
+        assert await service.confirm_arm_command("Backyard") is None
+
+    status.assert_not_called()
+
+
+@pytest.fixture
+def snap_command():
+    """Stand in for blinkpy's (throttled) new-image request, and poll for
+    the new thumbnail without waiting."""
+    with (
+        patch("blink_service.api.request_new_image", AsyncMock()) as command,
+        patch("blink_service.SNAPSHOT_POLL_INITIAL_SECONDS", 0),
+    ):
+        yield command
+
+
+def _make_snapshot_camera(name="Backyard", image=b"jpeg", polls_until_new=1):
+    """A camera whose info reports a new thumbnail from the
+    `polls_until_new`-th poll on, served as `image`."""
+    cam = _make_camera(name)
+    cam.thumbnail = "https://rest.example.com/old.jpg"
+    cam.sync.urls.base_url = "https://rest.example.com"
+    cam.sync.get_unique_info = MagicMock(return_value=None)
+    infos = [{"thumbnail": "/old"}] * (polls_until_new - 1)
+    cam.sync.get_camera_info = AsyncMock(
+        side_effect=lambda *a, **kw: (
+            infos.pop(0) if infos else {"thumbnail": "/new"}
+        )
+    )
+    response = MagicMock(status=200)
+    response.read = AsyncMock(return_value=image)
+    cam.get_thumbnail = AsyncMock(return_value=response)
+    return cam
+
+
+@pytest.mark.asyncio
+async def test_snapshot_returns_new_thumbnail_bytes(snap_command) -> None:
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_snapshot_camera(image=b"jpegbytes")
     blink = _make_blink_mock(cameras={"Backyard": cam})
     service._blink = blink
 
     result = await service.snapshot("Backyard")
 
-    cam.snap_picture.assert_awaited_once()
+    snap_command.assert_awaited_once_with(
+        blink,
+        cam.network_id,
+        cam.camera_id,
+        camera_type=cam.camera_type,
+        force=True,
+    )
+    cam.get_thumbnail.assert_awaited_once_with(
+        "https://rest.example.com/new.jpg"
+    )
     assert result == b"jpegbytes"
 
 
 @pytest.mark.asyncio
-async def test_snapshot_unknown_camera_returns_none() -> None:
+async def test_snapshot_polls_with_backoff_until_thumbnail_changes(
+    snap_command,
+) -> None:
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_snapshot_camera(polls_until_new=4)
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+    delays: list[float] = []
+    real_sleep = asyncio.sleep
+
+    async def record_sleep(delay):
+        delays.append(delay)
+        await real_sleep(0)
+
+    with (
+        patch("blink_service.SNAPSHOT_POLL_INITIAL_SECONDS", 0.5),
+        patch("blink_service.SNAPSHOT_POLL_MAX_INTERVAL_SECONDS", 2),
+        patch("blink_service.asyncio.sleep", record_sleep),
+    ):
+        result = await service.snapshot("Backyard")
+
+    assert result == b"jpeg"
+    assert delays == [0.5, 1, 2, 2]
+    assert cam.sync.get_camera_info.await_count == 4
+    cam.get_thumbnail.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_gives_up_when_thumbnail_never_changes(
+    snap_command,
+) -> None:
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_snapshot_camera(polls_until_new=1000)
+
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+
+    with (
+        patch("blink_service.SNAPSHOT_POLL_INITIAL_SECONDS", 0.01),
+        patch("blink_service.SNAPSHOT_POLL_MAX_INTERVAL_SECONDS", 0.01),
+        patch("blink_service.SNAPSHOT_POLL_TIMEOUT_SECONDS", 0.05),
+    ):
+        result = await service.snapshot("Backyard")
+
+    assert result is None
+    assert 1 <= cam.sync.get_camera_info.await_count <= 5
+    cam.get_thumbnail.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_of_mini_rereads_homescreen(snap_command) -> None:
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_snapshot_camera()
+    owl = {"name": "Backyard", "thumbnail": "/new"}
+    cam.sync.get_unique_info = MagicMock(return_value=owl)
+    blink = _make_blink_mock(cameras={"Backyard": cam})
+    blink.get_homescreen = AsyncMock()
+    service._blink = blink
+
+    assert await service.snapshot("Backyard") == b"jpeg"
+
+    blink.get_homescreen.assert_awaited_once()
+    cam.sync.get_camera_info.assert_awaited_once_with(
+        cam.camera_id, unique_info=owl
+    )
+
+
+@pytest.mark.asyncio
+async def test_snapshot_unknown_camera_returns_none(snap_command) -> None:
     service = BlinkService("user@example.com", "pw")
     blink = _make_blink_mock(cameras={})
     service._blink = blink
@@ -351,14 +660,14 @@ async def test_snapshot_unknown_camera_returns_none() -> None:
     result = await service.snapshot("Ghost")
 
     assert result is None
+    snap_command.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_snapshot_no_cached_image_returns_none() -> None:
+async def test_snapshot_failed_download_returns_none(snap_command) -> None:
     service = BlinkService("user@example.com", "pw")
-    cam = _make_camera("Backyard")
-    cam.snap_picture = AsyncMock()
-    cam.image_from_cache = None
+    cam = _make_snapshot_camera()
+    cam.get_thumbnail.return_value.status = 404
     blink = _make_blink_mock(cameras={"Backyard": cam})
     service._blink = blink
 
@@ -367,6 +676,176 @@ async def test_snapshot_no_cached_image_returns_none() -> None:
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_snapshot_within_ttl_is_served_from_cache(snap_command) -> None:
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_snapshot_camera()
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+
+    first = await service.snapshot("Backyard")
+    second = await service.snapshot("Backyard")
+
+    assert first == second == b"jpeg"
+    snap_command.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_after_ttl_takes_new_picture(snap_command) -> None:
+    service = BlinkService("user@example.com", "pw", snapshot_ttl_seconds=0)
+    cam = _make_snapshot_camera()
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+
+    assert await service.snapshot("Backyard") == b"jpeg"
+    cam.sync.get_camera_info.side_effect = lambda *a, **kw: {
+        "thumbnail": "/newer"
+    }
+    assert await service.snapshot("Backyard") == b"jpeg"
+
+    assert snap_command.await_count == 2
+    cam.get_thumbnail.assert_awaited_with("https://rest.example.com/newer.jpg")
+
+
+@pytest.mark.asyncio
+async def test_snapshot_ignores_previous_snapshot_thumbnail(
+    snap_command,
+) -> None:
+    """Before a refresh updates camera.thumbnail, the last snapshot's
+    thumbnail must not be taken for a new one."""
+    service = BlinkService("user@example.com", "pw", snapshot_ttl_seconds=0)
+    cam = _make_snapshot_camera()
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+    await service.snapshot("Backyard")
+
+    with (
+        patch("blink_service.SNAPSHOT_POLL_MAX_INTERVAL_SECONDS", 0.01),
+        patch("blink_service.SNAPSHOT_POLL_TIMEOUT_SECONDS", 0.05),
+    ):
+        assert await service.snapshot("Backyard") is None
+
+    cam.get_thumbnail.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_snapshots_of_same_camera_share_one_call(
+    snap_command,
+) -> None:
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_snapshot_camera()
+
+    async def slow_snap(*args, **kwargs):
+        await asyncio.sleep(0.05)
+
+    snap_command.side_effect = slow_snap
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+
+    results = await asyncio.gather(
+        service.snapshot("Backyard"), service.snapshot("Backyard")
+    )
+
+    assert results == [b"jpeg", b"jpeg"]
+    snap_command.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_empty_result_is_not_cached(snap_command) -> None:
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_snapshot_camera()
+    cam.get_thumbnail.return_value = None
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+
+    await service.snapshot("Backyard")
+    await service.snapshot("Backyard")
+
+    assert snap_command.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_snapshots_overlap_across_cameras(snap_command) -> None:
+    """Each camera's wait for its upload overlaps the others', so the
+    batch takes about as long as one camera, not the sum."""
+    service = BlinkService("user@example.com", "pw")
+    names = ["Backyard", "Garage", "Porch"]
+    cameras = {
+        name: _make_snapshot_camera(name, image=name.encode()) for name in names
+    }
+    service._blink = _make_blink_mock(cameras=cameras)
+
+    with patch("blink_service.SNAPSHOT_POLL_INITIAL_SECONDS", 0.2):
+        started = time.monotonic()
+        images = await service.snapshots(names)
+        elapsed = time.monotonic() - started
+
+    assert images == {name: name.encode() for name in names}
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_snapshots_bounded_by_concurrency(snap_command) -> None:
+    service = BlinkService("user@example.com", "pw")
+    names = [f"Cam{i}" for i in range(5)]
+    service._blink = _make_blink_mock(
+        cameras={name: _make_snapshot_camera(name) for name in names}
+    )
+    running = 0
+    peak = 0
+    snapshot = service.snapshot
+
+    async def tracked(name):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            return await snapshot(name)
+        finally:
+            running -= 1
+
+    service.snapshot = tracked
+    with patch("blink_service.SNAPSHOT_CONCURRENCY", 2):
+        await service.snapshots(names)
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_snapshots_failure_yields_none_for_that_camera(
+    snap_command,
+) -> None:
+    service = BlinkService("user@example.com", "pw")
+    broken = _make_snapshot_camera("Garage")
+    broken.get_thumbnail.side_effect = RuntimeError("boom")
+    service._blink = _make_blink_mock(
+        cameras={"Backyard": _make_snapshot_camera(), "Garage": broken}
+    )
+
+    images = await service.snapshots(["Backyard", "Garage", "Gone"])
+
+    assert images == {"Backyard": b"jpeg", "Garage": None, "Gone": None}
+
+
+def _make_clip_response(data: bytes, status: int = 200) -> MagicMock:
+    """Fake aiohttp response whose body streams via iter_chunked()."""
+    response = MagicMock()
+    response.status = status
+
+    async def iter_chunked(size):
+        for start in range(0, len(data), size):
+            yield data[start : start + size]
+
+    response.content.iter_chunked = iter_chunked
+    return response
+
+
+async def _collect_motion_events(
+    service: BlinkService, last_seen: dict, **kwargs
+) -> list[MotionEvent]:
+    """List the new clips, then download them, as the main loop does."""
+    clips = await service.new_motion_clips(last_seen, **kwargs)
+    async with contextlib.aclosing(
+        service.iter_motion_clip_downloads(clips)
+    ) as events:
+        return [event async for event in events]
+
+
 def _make_video_item(device_name, created_at, media, deleted=False) -> dict:
     return {
         "device_name": device_name,
@@ -376,63 +855,72 @@ def _make_video_item(device_name, created_at, media, deleted=False) -> dict:
     }
 
 
+def _patch_video_pages(*pages: list[dict]):
+    """Patch blinkpy's video-history request to serve `pages` in turn,
+    followed by an empty page."""
+    responses = [{"media": page} for page in pages] + [{"media": []}]
+    return patch(
+        "blink_service.api.request_videos",
+        AsyncMock(side_effect=responses),
+    )
+
+
 @pytest.mark.asyncio
 async def test_get_latest_clip_returns_bytes_of_most_recent() -> None:
     """get_latest_clip() must query Blink's cloud video-list metadata —
     not the local, short-lived camera.recent_clips cache — so it can't
-    go stale between blinkpy's own refresh/expiry cycles."""
+    go stale between blinkpy's own refresh/expiry cycles. Every page is
+    read until an empty one."""
     service = BlinkService("user@example.com", "pw")
     cam = _make_camera("Backyard")
     cam.recent_clips = []  # deliberately empty/stale to prove it's unused
-    response = MagicMock()
-    response.status = 200
-    response.read = AsyncMock(return_value=b"videobytes")
+    response = _make_clip_response(b"videobytes")
     cam.get_video_clip = AsyncMock(return_value=response)
     blink = _make_blink_mock(cameras={"Backyard": cam})
     blink.urls = MagicMock(base_url="https://rest.example.com")
-    blink.get_videos_metadata = AsyncMock(
-        return_value=[
+    service._blink = blink
+
+    with _patch_video_pages(
+        [
             _make_video_item("Backyard", "2024-01-01T00:00:00+00:00", "/m1"),
-            _make_video_item("Backyard", "2024-01-02T00:00:00+00:00", "/m2"),
             _make_video_item("Garage", "2024-01-03T00:00:00+00:00", "/m3"),
-        ]
-    )
-    service._blink = blink
+        ],
+        [_make_video_item("Backyard", "2024-01-02T00:00:00+00:00", "/m2")],
+    ) as request_videos:
+        result = await service.get_latest_clip("Backyard")
 
-    result = await service.get_latest_clip("Backyard")
+    assert request_videos.await_count == 3
 
     cam.get_video_clip.assert_awaited_once_with(
         url="https://rest.example.com/m2"
     )
-    assert result == b"videobytes"
+    assert result.read() == b"videobytes"
 
 
 @pytest.mark.asyncio
 async def test_get_latest_clip_ignores_deleted_videos() -> None:
     service = BlinkService("user@example.com", "pw")
     cam = _make_camera("Backyard")
-    response = MagicMock()
-    response.status = 200
-    response.read = AsyncMock(return_value=b"videobytes")
+    response = _make_clip_response(b"videobytes")
     cam.get_video_clip = AsyncMock(return_value=response)
     blink = _make_blink_mock(cameras={"Backyard": cam})
     blink.urls = MagicMock(base_url="https://rest.example.com")
-    blink.get_videos_metadata = AsyncMock(
-        return_value=[
+    service._blink = blink
+
+    with _patch_video_pages(
+        [
             _make_video_item(
                 "Backyard", "2024-01-02T00:00:00+00:00", "/newer", deleted=True
             ),
             _make_video_item("Backyard", "2024-01-01T00:00:00+00:00", "/older"),
         ]
-    )
-    service._blink = blink
-
-    result = await service.get_latest_clip("Backyard")
+    ):
+        result = await service.get_latest_clip("Backyard")
 
     cam.get_video_clip.assert_awaited_once_with(
         url="https://rest.example.com/older"
     )
-    assert result == b"videobytes"
+    assert result.read() == b"videobytes"
 
 
 @pytest.mark.asyncio
@@ -441,12 +929,12 @@ async def test_get_latest_clip_no_videos_for_camera_returns_none() -> None:
     cam = _make_camera("Backyard")
     blink = _make_blink_mock(cameras={"Backyard": cam})
     blink.urls = MagicMock(base_url="https://rest.example.com")
-    blink.get_videos_metadata = AsyncMock(
-        return_value=[_make_video_item("Garage", "2024-01-01T00:00:00", "/m1")]
-    )
     service._blink = blink
 
-    result = await service.get_latest_clip("Backyard")
+    with _patch_video_pages(
+        [_make_video_item("Garage", "2024-01-01T00:00:00", "/m1")]
+    ):
+        result = await service.get_latest_clip("Backyard")
 
     assert result is None
 
@@ -457,156 +945,1107 @@ async def test_get_latest_clip_unknown_camera_returns_none_without_query() -> (
 ):
     service = BlinkService("user@example.com", "pw")
     blink = _make_blink_mock(cameras={})
-    blink.get_videos_metadata = AsyncMock()
     service._blink = blink
 
-    result = await service.get_latest_clip("Ghost")
+    with _patch_video_pages() as request_videos:
+        result = await service.get_latest_clip("Ghost")
 
     assert result is None
-    blink.get_videos_metadata.assert_not_awaited()
+    request_videos.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_get_new_motion_events_returns_new_clips() -> None:
+async def test_clip_history_lists_all_cameras_including_deletions() -> None:
     service = BlinkService("user@example.com", "pw")
-    cam = _make_camera("Backyard")
-    cam.recent_clips = [
-        {"time": "2024-01-01T00:00:00", "clip": "url1"},
-        {"time": "2024-01-02T00:00:00", "clip": "url2"},
-    ]
-    response = MagicMock()
-    response.status = 200
-    response.read = AsyncMock(return_value=b"videobytes")
-    cam.get_video_clip = AsyncMock(return_value=response)
-    blink = _make_blink_mock(cameras={"Backyard": cam})
+    blink = _make_blink_mock(cameras={})
+    blink.urls = MagicMock(base_url="https://rest.example.com")
     service._blink = blink
+    updated = _make_video_item("Garage", "2024-01-02T00:00:00+00:00", "/m2")
+    updated["updated_at"] = "2024-01-05T00:00:00+00:00"
 
-    events = await service.get_new_motion_events(
-        {"Backyard": "2024-01-01T00:00:00"}
-    )
+    with _patch_video_pages(
+        [_make_video_item("Backyard", "2024-01-01T00:00:00+00:00", "/m1")],
+        [
+            updated,
+            _make_video_item(
+                "Backyard", "2024-01-03T00:00:00+00:00", "/m3", deleted=True
+            ),
+        ],
+    ) as request_videos:
+        history = await service.clip_history(since=123.0, max_pages=5)
 
-    assert events == [
-        MotionEvent(
+    assert history.complete is True
+    assert history.clips == [
+        ClipMetadata(
             camera_name="Backyard",
-            clip_time="2024-01-02T00:00:00",
-            clip_bytes=b"videobytes",
-        )
+            clip_time="2024-01-01T00:00:00+00:00",
+            clip_url="https://rest.example.com/m1",
+            updated_at="2024-01-01T00:00:00+00:00",
+            deleted=False,
+        ),
+        ClipMetadata(
+            camera_name="Garage",
+            clip_time="2024-01-02T00:00:00+00:00",
+            clip_url="https://rest.example.com/m2",
+            updated_at="2024-01-05T00:00:00+00:00",
+            deleted=False,
+        ),
+        ClipMetadata(
+            camera_name="Backyard",
+            clip_time="2024-01-03T00:00:00+00:00",
+            clip_url="https://rest.example.com/m3",
+            updated_at="2024-01-03T00:00:00+00:00",
+            deleted=True,
+        ),
     ]
+    assert request_videos.call_args.kwargs == {"time": 123.0, "page": 3}
 
 
 @pytest.mark.asyncio
-async def test_get_new_motion_events_no_new_clips_returns_empty() -> None:
+async def test_clip_history_stops_at_page_limit() -> None:
     service = BlinkService("user@example.com", "pw")
-    cam = _make_camera("Backyard")
-    cam.recent_clips = [{"time": "2024-01-01T00:00:00", "clip": "url1"}]
-    blink = _make_blink_mock(cameras={"Backyard": cam})
+    blink = _make_blink_mock(cameras={})
+    blink.urls = MagicMock(base_url="https://rest.example.com")
     service._blink = blink
+    item = _make_video_item("Backyard", "2024-01-01T00:00:00+00:00", "/m1")
 
-    events = await service.get_new_motion_events(
-        {"Backyard": "2024-01-01T00:00:00"}
-    )
+    with _patch_video_pages([item], [item]) as request_videos:
+        history = await service.clip_history(since=0.0, max_pages=1)
 
-    assert events == []
+    assert history.complete is False
+    assert len(history.clips) == 1
+    assert request_videos.await_count == 1
 
 
 @pytest.mark.asyncio
-async def test_refresh_calls_blink_refresh_once() -> None:
+async def test_clip_history_starts_at_given_page() -> None:
     service = BlinkService("user@example.com", "pw")
-    blink = _make_blink_mock()
+    blink = _make_blink_mock(cameras={})
+    blink.urls = MagicMock(base_url="https://rest.example.com")
     service._blink = blink
+    item = _make_video_item("Backyard", "2024-01-01T00:00:00+00:00", "/m1")
 
-    await service.refresh()
-
-    blink.refresh.assert_awaited_once()
-
+    with _patch_video_pages([item]) as request_videos:
+        await service.clip_history(since=0.0, max_pages=1, first_page=21)
 
-def test_is_connected_true_when_cameras_populated() -> None:
-    service = BlinkService("user@example.com", "pw")
-    blink = _make_blink_mock(cameras={"Backyard": _make_camera("Backyard")})
-    service._blink = blink
+    assert request_videos.call_args.kwargs == {"time": 0.0, "page": 21}
 
-    assert service.is_connected is True
 
+# --- Sync-module local storage ---
 
-def test_is_connected_false_when_no_blink_instance() -> None:
-    service = BlinkService("user@example.com", "pw")
-    assert service.is_connected is False
+_MANIFEST_CLIPS = [
+    {"id": 1, "camera_name": "FrontDoor", "created_at": "2024-01-01T00:00:00"},
+    {"id": 2, "camera_name": "FrontDoor", "created_at": "2024-01-02T00:00:00"},
+    {"id": 3, "camera_name": "Garage", "created_at": "2024-01-03T00:00:00"},
+]
 
 
-def test_is_connected_false_when_cameras_empty() -> None:
+def _make_local_service(*manifests: list[dict]):
+    """A service whose "Front Door" camera records only to its sync
+    module's local storage, which serves `manifests` in turn."""
     service = BlinkService("user@example.com", "pw")
-    blink = _make_blink_mock(cameras={})
+    cam = _make_camera("Front Door")
+    cam.sync.local_storage = True
+    cam.sync.name = "Home"
+    cam.sync.network_id = 10
+    cam.sync.sync_id = 20
+    cam.sync.cameras = {"Front Door": cam}
+    blink = _make_blink_mock(cameras={"Front Door": cam})
+    blink.urls = MagicMock(base_url="https://rest.example.com")
+    blink.account_id = 5
     service._blink = blink
-
-    assert service.is_connected is False
+    responses = [
+        {"manifest_id": f"m{number}", "clips": clips}
+        for number, clips in enumerate(manifests, 1)
+    ]
+    return service, cam, responses
 
 
-def test_has_camera_true_for_known_camera() -> None:
-    service = BlinkService("user@example.com", "pw")
+@contextlib.contextmanager
+def _patch_local_storage(manifests: list[dict], command_status=None):
+    """Patch the sync-module requests: every command is accepted and
+    completes at once (unless `command_status` says otherwise), and
+    manifest reads serve `manifests` in turn."""
+    with (
+        patch(
+            "blink_service.api.http_post",
+            AsyncMock(return_value={"id": 99, "network_id": 10}),
+        ) as post,
+        patch(
+            "blink_service.api.request_command_status",
+            AsyncMock(
+                return_value=command_status
+                or {"status_code": 908, "complete": True}
+            ),
+        ),
+        patch(
+            "blink_service.api.get_local_storage_manifest",
+            AsyncMock(side_effect=manifests),
+        ) as get_manifest,
+        patch("blink_service.COMMAND_POLL_SECONDS", 0),
+    ):
+        yield post, get_manifest
+
+
+@pytest.mark.asyncio
+async def test_local_clips_reuses_cached_manifest() -> None:
+    service, _, manifests = _make_local_service(_MANIFEST_CLIPS)
+
+    with _patch_local_storage(manifests) as (post, get_manifest):
+        first = await service.local_clips("Front Door")
+        second = await service.local_clips("Front Door")
+
+    assert [clip.clip_id for clip in first] == [2, 1]
+    assert second == first
+    post.assert_awaited_once()
+    assert post.call_args.args[1] == (
+        "https://rest.example.com/api/v1/accounts/5/networks/10"
+        "/sync_modules/20/local_storage/manifest/request"
+    )
+    get_manifest.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_local_clips_concurrent_callers_share_one_fetch() -> None:
+    service, _, manifests = _make_local_service(_MANIFEST_CLIPS)
+
+    with _patch_local_storage(manifests) as (post, _):
+        results = await asyncio.gather(
+            service.local_clips("Front Door"),
+            service.local_clips("Front Door"),
+        )
+
+    assert results[0] == results[1]
+    post.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_local_clips_stale_manifest_is_merged_incrementally() -> None:
+    service, _, manifests = _make_local_service(
+        _MANIFEST_CLIPS[:1], _MANIFEST_CLIPS[:2]
+    )
+
+    with (
+        _patch_local_storage(manifests) as (_, get_manifest),
+        patch("blink_service.LOCAL_MANIFEST_MAX_AGE_SECONDS", 0),
+    ):
+        first = await service.local_clips("Front Door")
+        second = await service.local_clips("Front Door")
+
+    assert get_manifest.await_count == 2
+    assert [clip.clip_id for clip in second] == [2, 1]
+    # The clip already known is the very same cached object.
+    assert second[1] is first[0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error", [TimeoutError(), BlinkUnavailableError("circuit open")]
+)
+async def test_local_clips_serves_cached_manifest_when_fetch_fails(
+    error: Exception,
+) -> None:
+    service, _, manifests = _make_local_service(_MANIFEST_CLIPS)
+
+    with (
+        _patch_local_storage(manifests) as (post, _),
+        patch("blink_service.LOCAL_MANIFEST_MAX_AGE_SECONDS", 0),
+    ):
+        first = await service.local_clips("Front Door")
+        post.side_effect = error
+        second = await service.local_clips("Front Door")
+
+    assert second == first
+    assert post.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_partial_refresh_builds_no_local_storage_manifest() -> None:
+    cam = _make_camera("Front Door")
+    sync = MagicMock()
+    sync.cameras = {"Front Door": cam}
+    sync.get_network_info = AsyncMock(return_value=True)
+    sync.update_local_storage_manifest = AsyncMock()
+    sync.check_new_videos = AsyncMock()
+    sync.get_camera_info = AsyncMock(return_value={})
+    cam.update = AsyncMock()
+    blink = _make_blink_mock(cameras={"Front Door": cam})
+    blink.sync = {"Home": sync}
+    blink.get_homescreen = AsyncMock()
+
+    assert await blink_service._refresh_cameras(
+        blink, frozenset({"Front Door"})
+    )
+
+    sync.update_local_storage_manifest.assert_not_awaited()
+    sync.check_new_videos.assert_awaited_once()
+    cam.update.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_local_clips_without_local_storage_makes_no_request() -> None:
+    service = BlinkService("user@example.com", "pw")
+    service._blink = _make_blink_mock(
+        cameras={"Backyard": _make_camera("Backyard")}
+    )
+
+    with _patch_local_storage([]) as (post, _):
+        assert await service.local_clips("Backyard") == []
+
+    post.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_local_clips_failed_manifest_build_returns_empty() -> None:
+    service, _, manifests = _make_local_service(_MANIFEST_CLIPS)
+
+    with _patch_local_storage(
+        manifests, command_status={"status_code": 1, "complete": True}
+    ) as (_, get_manifest):
+        assert await service.local_clips("Front Door") == []
+
+    get_manifest.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_latest_clip_falls_back_to_local_storage() -> None:
+    service, cam, manifests = _make_local_service(_MANIFEST_CLIPS)
+    cam.get_video_clip = AsyncMock(return_value=_make_clip_response(b"local"))
+
+    with (
+        _patch_video_pages(),
+        _patch_local_storage(manifests) as (post, _),
+    ):
+        clip = await service.get_latest_clip("Front Door")
+
+    url = (
+        "https://rest.example.com/api/v1/accounts/5/networks/10"
+        "/sync_modules/20/local_storage/manifest/m1/clip/request/2"
+    )
+    assert post.call_args.args[1] == url
+    cam.get_video_clip.assert_awaited_once_with(url=url)
+    with clip:
+        assert clip.read() == b"local"
+
+
+@pytest.mark.asyncio
+async def test_get_local_clip_failed_upload_refetches_manifest() -> None:
+    service, cam, manifests = _make_local_service(
+        _MANIFEST_CLIPS, _MANIFEST_CLIPS
+    )
+    cam.get_video_clip = AsyncMock()
+
+    with _patch_local_storage(manifests) as (_, get_manifest):
+        [latest, _] = await service.local_clips("Front Door")
+        with patch(
+            "blink_service.api.request_command_status",
+            AsyncMock(return_value={"status_code": 1}),
+        ):
+            assert await service.get_local_clip("Front Door", latest) is None
+        await service.local_clips("Front Door")
+
+    cam.get_video_clip.assert_not_awaited()
+    assert get_manifest.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_wait_for_command_polls_until_complete() -> None:
+    service = BlinkService("user@example.com", "pw")
+    service._blink = _make_blink_mock()
+    statuses = [
+        {"status_code": 908, "complete": False},
+        {"status_code": 908, "complete": False},
+        {"status_code": 908, "complete": True},
+    ]
+
+    with (
+        patch(
+            "blink_service.api.request_command_status",
+            AsyncMock(side_effect=statuses),
+        ) as status,
+        patch("blink_service.COMMAND_POLL_SECONDS", 0),
+    ):
+        done = await service._wait_for_command(
+            {"id": 1, "network_id": 2}, Priority.MEDIA
+        )
+
+    assert done is True
+    assert status.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_new_motion_clips_lists_without_downloading() -> None:
+    """Only the newest clip per camera carries the thumbnail; nothing is
+    downloaded until iter_motion_clip_downloads()."""
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_camera("Backyard")
+    cam.recent_clips = [
+        {"time": "2024-01-03T00:00:00", "clip": "url3"},
+        {"time": "2024-01-01T00:00:00", "clip": "url1"},
+        {"time": "2024-01-02T00:00:00", "clip": "url2"},
+    ]
+    cam.image_from_cache = b"jpeg"
+    cam.get_video_clip = AsyncMock()
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+
+    clips = await service.new_motion_clips({"Backyard": "2024-01-01T00:00:00"})
+
+    assert clips == [
+        MotionClip("Backyard", "2024-01-02T00:00:00", "url2", None),
+        MotionClip("Backyard", "2024-01-03T00:00:00", "url3", b"jpeg"),
+    ]
+    cam.get_video_clip.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_motion_clip_download_for_vanished_camera_yields_no_clip() -> (
+    None
+):
+    service = BlinkService("user@example.com", "pw")
+    service._blink = _make_blink_mock(cameras={})
+    clip = MotionClip("Ghost", "2024-01-01T00:00:00", "url1", None)
+
+    async with contextlib.aclosing(
+        service.iter_motion_clip_downloads([clip])
+    ) as events:
+        delivered = [event async for event in events]
+
+    assert delivered == [MotionEvent("Ghost", "2024-01-01T00:00:00", None)]
+
+
+@pytest.mark.asyncio
+async def test_refresh_calls_blink_refresh_once() -> None:
+    service = BlinkService("user@example.com", "pw")
+    blink = _make_blink_mock()
+    service._blink = blink
+
+    await service.refresh()
+
+    blink.refresh.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_share_one_round_trip() -> None:
+    service = BlinkService("user@example.com", "pw")
+    blink = _make_blink_mock()
+    calls = 0
+
+    async def slow_refresh():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+
+    blink.refresh = slow_refresh
+    service._blink = blink
+
+    await asyncio.gather(*(service.refresh() for _ in range(3)))
+
+    assert calls == 1
+    stats = service.refresh_stats
+    assert (stats.performed, stats.coalesced, stats.saved) == (1, 2, 2)
+
+
+@pytest.mark.asyncio
+async def test_refresh_reuses_result_younger_than_max_age() -> None:
+    service = BlinkService("user@example.com", "pw")
+    blink = _make_blink_mock()
+    service._blink = blink
+
+    await service.refresh()
+    await service.refresh()
+
+    blink.refresh.assert_awaited_once()
+    assert service.refresh_stats.reused == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_with_zero_max_age_always_round_trips() -> None:
+    service = BlinkService("user@example.com", "pw", refresh_max_age_seconds=0)
+    blink = _make_blink_mock()
+    service._blink = blink
+
+    await service.refresh()
+    await service.refresh()
+
+    assert blink.refresh.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_schedules_next_periodic_refresh() -> None:
+    service = BlinkService("user@example.com", "pw")
+    service._blink = _make_blink_mock()
+    assert service.refresh_due()
+
+    await service.refresh()
+
+    assert not service.refresh_due()
+    cadence = service.refresh_cadence()
+    assert (
+        cadence.interval_seconds == blink_service.REFRESH_MIN_INTERVAL_SECONDS
+    )
+    assert not cadence.throttled
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_backs_off_refresh_cadence() -> None:
+    service = BlinkService("user@example.com", "pw")
+    blink = _make_blink_mock()
+    blink.refresh = AsyncMock(side_effect=RuntimeError("blink down"))
+    service._blink = blink
+
+    with pytest.raises(RuntimeError):
+        await service.refresh()
+
+    assert not service.refresh_due()
+    assert service.refresh_cadence().throttled
+
+
+@pytest.fixture
+def partial_refreshes():
+    """Stand in for the partial-refresh round trip; yields the camera
+    scopes it was called with."""
+    scopes: list[frozenset[str]] = []
+
+    async def refresh_cameras(blink, camera_names):
+        scopes.append(camera_names)
+        await asyncio.sleep(0.01)
+        return True
+
+    with patch("blink_service._refresh_cameras", refresh_cameras):
+        yield scopes
+
+
+def _connected_service() -> BlinkService:
+    service = BlinkService("user@example.com", "pw")
+    service._blink = _make_blink_mock()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_partial_refresh_is_reused_only_for_covered_cameras(
+    partial_refreshes,
+) -> None:
+    service = _connected_service()
+
+    await service.refresh(["Backyard", "Garage"])
+    await service.refresh(["Backyard"])
+    await service.refresh(["Porch"])
+    await service.refresh()
+
+    assert partial_refreshes == [{"Backyard", "Garage"}, {"Porch"}]
+    service._blink.refresh.assert_awaited_once()
+    assert service.refresh_stats.reused == 1
+
+
+@pytest.mark.asyncio
+async def test_partial_refresh_joins_covering_refresh_in_flight(
+    partial_refreshes,
+) -> None:
+    service = _connected_service()
+
+    await asyncio.gather(
+        service.refresh(["Backyard", "Garage"]),
+        service.refresh(["Garage"]),
+    )
+
+    assert partial_refreshes == [{"Backyard", "Garage"}]
+    assert service.refresh_stats.coalesced == 1
+
+
+@pytest.mark.asyncio
+async def test_partial_refresh_includes_cameras_asked_about(
+    partial_refreshes,
+) -> None:
+    service = _connected_service()
+    service._snapshot_cache["Porch"] = (time.monotonic(), b"jpeg")
+
+    await service.snapshot("Porch")
+    await service.refresh(["Backyard"])
+    # Forgotten once ON_DEMAND_REFRESH_SECONDS have passed.
+    service._on_demand_cameras["Porch"] -= 16 * 60
+    service._last_refresh_time = None
+    await service.refresh(["Backyard"])
+
+    assert partial_refreshes == [{"Backyard", "Porch"}, {"Backyard"}]
+
+
+@pytest.mark.asyncio
+async def test_coalesced_refresh_failure_propagates_and_is_not_cached() -> None:
+    service = BlinkService("user@example.com", "pw")
+    blink = _make_blink_mock()
+
+    async def failing_refresh():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("blink down")
+
+    blink.refresh = failing_refresh
+    service._blink = blink
+
+    results = await asyncio.gather(
+        service.refresh(), service.refresh(), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    blink.refresh = AsyncMock(return_value=True)
+    await service.refresh()
+    blink.refresh.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_refresh_caller_does_not_abort_shared_refresh() -> None:
+    service = BlinkService("user@example.com", "pw")
+    blink = _make_blink_mock()
+    finished = asyncio.Event()
+
+    async def slow_refresh():
+        await asyncio.sleep(0.05)
+        finished.set()
+
+    blink.refresh = slow_refresh
+    service._blink = blink
+
+    first = asyncio.create_task(service.refresh())
+    await asyncio.sleep(0)
+    second = asyncio.create_task(service.refresh())
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    await second
+    assert finished.is_set()
+
+
+def test_is_connected_true_when_cameras_populated() -> None:
+    service = BlinkService("user@example.com", "pw")
+    blink = _make_blink_mock(cameras={"Backyard": _make_camera("Backyard")})
+    service._blink = blink
+
+    assert service.is_connected is True
+
+
+def test_is_connected_false_when_no_blink_instance() -> None:
+    service = BlinkService("user@example.com", "pw")
+    assert service.is_connected is False
+
+
+def test_is_connected_false_when_cameras_empty() -> None:
+    service = BlinkService("user@example.com", "pw")
+    blink = _make_blink_mock(cameras={})
+    service._blink = blink
+
+    assert service.is_connected is False
+
+
+def test_has_camera_true_for_known_camera() -> None:
+    service = BlinkService("user@example.com", "pw")
     blink = _make_blink_mock(cameras={"Backyard": _make_camera("Backyard")})
     service._blink = blink
 
-    assert service.has_camera("Backyard") is True
+    assert service.has_camera("Backyard") is True
+
+
+def test_has_camera_false_for_unknown_camera() -> None:
+    service = BlinkService("user@example.com", "pw")
+    blink = _make_blink_mock(cameras={"Backyard": _make_camera("Backyard")})
+    service._blink = blink
+
+    assert service.has_camera("Nonexistent") is False
+
+
+def test_has_camera_reads_the_cached_camera_table() -> None:
+    service = BlinkService("user@example.com", "pw")
+    service._blink = _make_blink_mock(
+        cameras={"Backyard": _make_camera("Backyard")}
+    )
+    table = service.camera_table
+
+    assert service.has_camera("Backyard") is True
+    assert service.has_camera("Nonexistent") is False
+    assert service.camera_table is table
+
+
+def test_has_camera_without_connection_raises_runtime_error() -> None:
+    service = BlinkService("user@example.com", "pw")
+    with pytest.raises(RuntimeError):
+        service.has_camera("Backyard")
+
+
+# --- Locking ---
+
+
+@pytest.mark.asyncio
+async def test_refresh_and_snapshot_do_not_run_concurrently(
+    snap_command,
+) -> None:
+    """Concurrent calls into BlinkService must be serialized by the
+    internal lock — a snapshot must not interleave with a refresh."""
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_snapshot_camera()
+    blink = _make_blink_mock(cameras={"Backyard": cam})
+    service._blink = blink
+
+    events: list[str] = []
+
+    async def slow_refresh():
+        events.append("refresh:start")
+        await asyncio.sleep(0.05)
+        events.append("refresh:end")
+
+    blink.refresh = slow_refresh
+
+    async def tracked_snap_command(*args, **kwargs):
+        events.append("snapshot:start")
+        events.append("snapshot:end")
+
+    snap_command.side_effect = tracked_snap_command
+
+    await asyncio.gather(service.refresh(), service.snapshot("Backyard"))
+
+    # The two operations must not interleave — one completes fully
+    # before the other starts.
+    assert events in (
+        ["refresh:start", "refresh:end", "snapshot:start", "snapshot:end"],
+        ["snapshot:start", "snapshot:end", "refresh:start", "refresh:end"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_queued_arm_goes_before_queued_snapshot(snap_command) -> None:
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_snapshot_camera()
+    blink = _make_blink_mock(cameras={"Backyard": cam})
+    service._blink = blink
+    events: list[str] = []
+    release_refresh = asyncio.Event()
+
+    async def blocked_refresh():
+        await release_refresh.wait()
+        events.append("refresh")
+
+    async def tracked_snap_command(*args, **kwargs):
+        events.append("snapshot")
+
+    async def tracked_arm(armed):
+        events.append("arm")
+
+    blink.refresh = blocked_refresh
+    snap_command.side_effect = tracked_snap_command
+    cam.async_arm = tracked_arm
+
+    refresh = asyncio.create_task(service.refresh())
+    await asyncio.sleep(0)
+    snapshot = asyncio.create_task(service.snapshot("Backyard"))
+    await asyncio.sleep(0)
+    arm = asyncio.create_task(service.arm_cameras(["Backyard"]))
+    await asyncio.sleep(0)
+    release_refresh.set()
+    await asyncio.gather(refresh, snapshot, arm)
+
+    assert events == ["refresh", "arm", "snapshot"]
+
+
+@pytest.mark.asyncio
+async def test_arm_runs_between_clip_history_pages() -> None:
+    """get_latest_clip() gives up the lock after each history page, so an
+    arm issued mid-lookup doesn't wait for the rest of the history."""
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_camera("Backyard")
+    cam.get_video_clip = AsyncMock(return_value=_make_clip_response(b"v"))
+    blink = _make_blink_mock(cameras={"Backyard": cam})
+    blink.urls = MagicMock(base_url="https://rest.example.com")
+    service._blink = blink
+    events: list[str] = []
+    arm_task: asyncio.Task | None = None
+
+    async def request_videos(blink, time, page):
+        nonlocal arm_task
+        events.append(f"page {page}")
+        if page == 1:
+            arm_task = asyncio.create_task(service.arm_cameras(["Backyard"]))
+            await asyncio.sleep(0)
+            item = _make_video_item("Backyard", "2024-01-01T00:00:00", "/m1")
+            return {"media": [item]}
+        return {"media": []}
+
+    async def tracked_arm(armed):
+        events.append("arm")
+
+    cam.async_arm = tracked_arm
+
+    with patch("blink_service.api.request_videos", request_videos):
+        clip = await service.get_latest_clip("Backyard")
+    await arm_task
+
+    assert events == ["page 1", "arm", "page 2"]
+    assert clip.read() == b"v"
+
+
+# --- Timeouts ---
+
+
+@pytest.mark.asyncio
+async def test_refresh_times_out_raises_blink_timeout_error() -> None:
+    service = BlinkService("user@example.com", "pw")
+    blink = _make_blink_mock()
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    blink.refresh = hang
+    service._blink = blink
+
+    with (
+        patch("blink_service.BLINK_CALL_TIMEOUT_SECONDS", 0.01),
+        pytest.raises(BlinkTimeoutError),
+    ):
+        await service.refresh()
+
+
+@pytest.mark.asyncio
+async def test_connect_times_out_raises_blink_timeout_error() -> None:
+    service = BlinkService("user@example.com", "pw")
+    blink = _make_blink_mock()
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    blink.start = hang
+
+    with (
+        patch("blink_service.os.path.exists", return_value=False),
+        patch("blink_service.Blink", return_value=blink),
+        patch("blink_service._ThrottleAwareAuth", _FakeAuth),
+        patch("blink_service.BLINK_CALL_TIMEOUT_SECONDS", 0.01),
+        pytest.raises(BlinkTimeoutError),
+    ):
+        await service.connect()
+
+
+# --- Circuit breaker ---
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_without_calling_blink() -> None:
+    blink = _make_blink_mock()
+    blink.refresh = AsyncMock(side_effect=RuntimeError("blink down"))
+
+    with patch("blink_service.BREAKER_FAILURE_THRESHOLD", 2):
+        service = BlinkService(
+            "user@example.com", "pw", refresh_max_age_seconds=0
+        )
+    service._blink = blink
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await service.refresh()
+
+    with pytest.raises(BlinkUnavailableError):
+        await service.refresh()
+
+    assert blink.refresh.await_count == 2
+    assert "refresh" in service.circuit_status()
+
+
+@pytest.mark.asyncio
+async def test_timeouts_count_toward_opening_circuit() -> None:
+    service = BlinkService(
+        "user@example.com", "pw", operation_timeouts={"arm_camera": 0.01}
+    )
+    cam = _make_camera("Backyard")
+
+    async def hang(value):
+        await asyncio.sleep(10)
+
+    cam.async_arm = hang
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+
+    for _ in range(3):
+        with pytest.raises(BlinkTimeoutError):
+            await service.arm_cameras(["Backyard"])
+    with pytest.raises(BlinkUnavailableError):
+        await service.arm_cameras(["Backyard"])
+
+    # Arming is tracked per camera, not per operation or account-wide.
+    assert set(service.circuit_status()) == {"arm_camera:Backyard"}
+
+
+@pytest.mark.asyncio
+async def test_failing_camera_does_not_block_arming_another() -> None:
+    service = BlinkService(
+        "user@example.com", "pw", operation_timeouts={"arm_camera": 0.01}
+    )
+    broken = _make_camera("Backyard")
+
+    async def hang(value):
+        await asyncio.sleep(10)
+
+    broken.async_arm = hang
+    working = _make_camera("Garage")
+    working.async_arm = AsyncMock(return_value={})
+    service._blink = _make_blink_mock(
+        cameras={"Backyard": broken, "Garage": working}
+    )
+    for _ in range(3):
+        with pytest.raises(BlinkTimeoutError):
+            await service.arm_cameras(["Backyard"])
+
+    assert await service.arm_cameras(["Garage"]) == {"Garage": True}
+    working.async_arm.assert_awaited_once_with(True)
+    with pytest.raises(BlinkUnavailableError):
+        await service.arm_cameras(["Backyard"])
+
+
+@pytest.mark.asyncio
+async def test_two_fa_challenge_does_not_count_as_failure() -> None:
+    from blink_service import BlinkTwoFARequiredError
+
+    service = BlinkService("user@example.com", "pw")
+    blink = _make_blink_mock()
+    blink.start = AsyncMock(side_effect=BlinkTwoFARequiredError())
+
+    with (
+        patch("blink_service.os.path.exists", return_value=False),
+        patch("blink_service.Blink", return_value=blink),
+        patch("blink_service._ThrottleAwareAuth", _FakeAuth),
+    ):
+        for _ in range(5):
+            assert await service.connect() == ConnectResult.NEEDS_2FA
+
+    assert service.circuit_status() == {}
 
 
-def test_has_camera_false_for_unknown_camera() -> None:
+# --- Shared HTTP session ---
+
+
+@pytest.mark.asyncio
+async def test_connect_shares_one_tuned_session_across_reconnects(
+    http_session_cls: MagicMock,
+) -> None:
     service = BlinkService("user@example.com", "pw")
-    blink = _make_blink_mock(cameras={"Backyard": _make_camera("Backyard")})
-    service._blink = blink
+    sessions = []
 
-    assert service.has_camera("Nonexistent") is False
+    def fake_auth_init(login_data=None, no_prompt=False, session=None):
+        sessions.append(session)
+        return _FakeAuth(login_data, no_prompt, session)
+
+    with (
+        patch("blink_service.os.path.exists", return_value=False),
+        patch("blink_service.Blink", return_value=_make_blink_mock()) as cls,
+        patch("blink_service._ThrottleAwareAuth", side_effect=fake_auth_init),
+    ):
+        await service.connect()
+        await service.connect()
+
+    http_session_cls.assert_called_once()
+    assert sessions == [http_session_cls.return_value] * 2
+    cls.assert_called_with(session=http_session_cls.return_value)
+    connector = http_session_cls.call_args.kwargs["connector"]
+    assert connector is blink_service.TCPConnector.return_value
+    blink_service.TCPConnector.assert_called_once_with(
+        limit=blink_service.HTTP_POOL_SIZE,
+        limit_per_host=blink_service.HTTP_POOL_SIZE_PER_HOST,
+        keepalive_timeout=blink_service.HTTP_KEEPALIVE_SECONDS,
+        ttl_dns_cache=blink_service.HTTP_DNS_CACHE_TTL_SECONDS,
+    )
 
+    await service.close()
+    http_session_cls.return_value.close.assert_awaited_once()
 
-def test_has_camera_without_connection_raises_runtime_error() -> None:
+
+@pytest.mark.asyncio
+async def test_injected_session_is_used_but_not_closed(
+    http_session_cls: MagicMock,
+) -> None:
+    session = MagicMock()
+    session.close = AsyncMock()
+    service = BlinkService("user@example.com", "pw", session=session)
+
+    with (
+        patch("blink_service.os.path.exists", return_value=False),
+        patch("blink_service.Blink", return_value=_make_blink_mock()) as cls,
+        patch("blink_service._ThrottleAwareAuth", _FakeAuth),
+    ):
+        await service.connect()
+    await service.close()
+
+    cls.assert_called_once_with(session=session)
+    http_session_cls.assert_not_called()
+    session.close.assert_not_awaited()
+
+
+# --- Background token refresh ---
+
+
+def _make_expiring_auth(expires_in: float, extend_by: float = 7200):
+    """A fake Auth whose token expires in `expires_in` seconds and whose
+    refresh_tokens() pushes expiry out by `extend_by`."""
+    auth = _FakeAuth()
+    auth.expiration_date = time.time() + expires_in
+
+    async def refresh_tokens(refresh=False):
+        auth.expiration_date = time.time() + extend_by
+        auth.login_attributes = {**auth.login_attributes, "token": "refreshed"}
+        return True
+
+    auth.refresh_tokens = AsyncMock(side_effect=refresh_tokens)
+    return auth
+
+
+async def _connect_with_auth(service: BlinkService, auth, blink=None):
+    blink = blink or _make_blink_mock()
+    with (
+        patch("blink_service.os.path.exists", return_value=False),
+        patch("blink_service.Blink", return_value=blink),
+        patch("blink_service._ThrottleAwareAuth", return_value=auth),
+    ):
+        assert await service.connect() == ConnectResult.OK
+    return blink
+
+
+@pytest.mark.asyncio
+async def test_token_is_refreshed_ahead_of_expiry_and_saved() -> None:
     service = BlinkService("user@example.com", "pw")
-    with pytest.raises(RuntimeError):
-        service.has_camera("Backyard")
+    auth = _make_expiring_auth(expires_in=60)
 
+    with patch("blink_service.TOKEN_REFRESH_MARGIN_SECONDS", 59.95):
+        await _connect_with_auth(service, auth)
+        auth.refresh_tokens.assert_not_awaited()
+        await asyncio.sleep(0.1)
 
-# --- Locking ---
+    auth.refresh_tokens.assert_awaited_once_with(refresh=True)
+    assert _saved_credentials(service)["token"] == "refreshed"
+    await service.close()
 
 
 @pytest.mark.asyncio
-async def test_refresh_and_snapshot_do_not_run_concurrently() -> None:
-    """Concurrent calls into BlinkService must be serialized by the
-    internal lock — a snapshot must not interleave with a refresh."""
+async def test_failed_token_refresh_is_retried() -> None:
+    service = BlinkService("user@example.com", "pw")
+    auth = _make_expiring_auth(expires_in=0)
+    extend_expiry = auth.refresh_tokens.side_effect
+
+    async def fail_once(refresh=False):
+        if auth.refresh_tokens.await_count == 1:
+            raise RuntimeError("blink down")
+        return await extend_expiry(refresh=refresh)
+
+    auth.refresh_tokens.side_effect = fail_once
+
+    with patch("blink_service.TOKEN_REFRESH_RETRY_SECONDS", 0.01):
+        await _connect_with_auth(service, auth)
+        await asyncio.sleep(0.1)
+
+    assert auth.refresh_tokens.await_count == 2
+    assert service.metrics()["refresh_token"].error == 1
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_arm_does_not_wait_for_background_token_refresh() -> None:
     service = BlinkService("user@example.com", "pw")
+    auth = _make_expiring_auth(expires_in=0)
+    refresh_started = asyncio.Event()
+
+    async def slow_refresh(refresh=False):
+        refresh_started.set()
+        await asyncio.sleep(10)
+
+    auth.refresh_tokens.side_effect = slow_refresh
     cam = _make_camera("Backyard")
-    cam.snap_picture = AsyncMock()
-    cam.image_from_cache = b"jpeg"
+    cam.async_arm = AsyncMock()
+    await _connect_with_auth(
+        service, auth, _make_blink_mock(cameras={"Backyard": cam})
+    )
+    await refresh_started.wait()
+
+    async with asyncio.timeout(1):
+        assert await service.arm_cameras(["Backyard"]) == {"Backyard": True}
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replaces_token_refresher() -> None:
+    service = BlinkService("user@example.com", "pw")
+    first_auth = _make_expiring_auth(expires_in=7200)
+    await _connect_with_auth(service, first_auth)
+    first_task = service._token_refresh_task
+
+    await _connect_with_auth(service, _make_expiring_auth(expires_in=7200))
+    await asyncio.sleep(0)
+
+    assert first_task.cancelled()
+    assert service._token_refresh_task is not first_task
+    await service.close()
+    await asyncio.sleep(0)
+    assert service._token_refresh_task is None
+
+
+# --- API metrics ---
+
+
+@pytest.mark.asyncio
+async def test_api_calls_are_recorded_per_operation() -> None:
+    service = BlinkService(
+        "user@example.com",
+        "pw",
+        refresh_max_age_seconds=0,
+        operation_timeouts={"arm_camera": 0.01},
+    )
+    cam = _make_camera("Backyard")
+
+    async def hang(value):
+        await asyncio.sleep(10)
+
+    cam.async_arm = hang
     blink = _make_blink_mock(cameras={"Backyard": cam})
     service._blink = blink
 
-    events: list[str] = []
+    await service.refresh()
+    blink.refresh = AsyncMock(side_effect=RuntimeError("blink down"))
+    with pytest.raises(RuntimeError):
+        await service.refresh()
+    with pytest.raises(BlinkTimeoutError):
+        await service.arm_cameras(["Backyard"])
 
-    async def slow_refresh():
-        events.append("refresh:start")
-        await asyncio.sleep(0.05)
-        events.append("refresh:end")
+    metrics = service.metrics()
+    assert (metrics["refresh"].success, metrics["refresh"].error) == (1, 1)
+    assert metrics["arm_camera"].timeout == 1
+    assert metrics["arm_camera"].max_seconds >= 0.01
 
-    blink.refresh = slow_refresh
 
-    async def tracked_snap_picture():
-        events.append("snapshot:start")
-        events.append("snapshot:end")
+@pytest.mark.asyncio
+async def test_skipped_api_calls_are_recorded_as_rejected() -> None:
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_camera("Backyard")
+    cam.async_arm = AsyncMock()
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
 
-    cam.snap_picture = tracked_snap_picture
+    with service.deadline(0), pytest.raises(BlinkDeadlineExceededError):
+        await service.arm_cameras(["Backyard"])
 
-    await asyncio.gather(service.refresh(), service.snapshot("Backyard"))
+    metrics = service.metrics()["arm_camera"]
+    assert (metrics.rejected, metrics.calls) == (1, 0)
 
-    # The two operations must not interleave — one completes fully
-    # before the other starts.
-    assert events in (
-        ["refresh:start", "refresh:end", "snapshot:start", "snapshot:end"],
-        ["snapshot:start", "snapshot:end", "refresh:start", "refresh:end"],
+
+# --- Per-operation timeouts and deadline budgets ---
+
+
+@pytest.mark.asyncio
+async def test_operation_timeout_profile_overrides_default() -> None:
+    service = BlinkService(
+        "user@example.com", "pw", operation_timeouts={"refresh": 0.01}
     )
+    blink = _make_blink_mock()
+
+    async def hang():
+        await asyncio.sleep(10)
 
+    blink.refresh = hang
+    service._blink = blink
 
-# --- Timeouts ---
+    with pytest.raises(BlinkTimeoutError, match="0.01s"):
+        await service.refresh()
 
 
 @pytest.mark.asyncio
-async def test_refresh_times_out_raises_blink_timeout_error() -> None:
+async def test_deadline_cuts_call_short_without_tripping_breaker() -> None:
     service = BlinkService("user@example.com", "pw")
     blink = _make_blink_mock()
 
@@ -617,30 +2056,58 @@ async def test_refresh_times_out_raises_blink_timeout_error() -> None:
     service._blink = blink
 
     with (
-        patch("blink_service.BLINK_CALL_TIMEOUT_SECONDS", 0.01),
-        pytest.raises(BlinkTimeoutError),
+        service.deadline(0.02),
+        pytest.raises(BlinkDeadlineExceededError),
     ):
         await service.refresh()
 
+    assert service.circuit_status() == {}
+
 
 @pytest.mark.asyncio
-async def test_connect_times_out_raises_blink_timeout_error() -> None:
+async def test_exhausted_deadline_skips_call_entirely() -> None:
     service = BlinkService("user@example.com", "pw")
-    blink = _make_blink_mock()
+    cam = _make_camera("Backyard")
+    cam.async_arm = AsyncMock()
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
 
-    async def hang():
-        await asyncio.sleep(10)
+    with service.deadline(0), pytest.raises(BlinkDeadlineExceededError):
+        await service.arm_cameras(["Backyard"])
 
-    blink.start = hang
+    cam.async_arm.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_nested_deadline_cannot_extend_enclosing_budget() -> None:
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_camera("Backyard")
+    cam.async_arm = AsyncMock()
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
 
     with (
-        patch("blink_service.os.path.exists", return_value=False),
-        patch("blink_service.Blink", return_value=blink),
-        patch("blink_service.Auth", _FakeAuth),
-        patch("blink_service.BLINK_CALL_TIMEOUT_SECONDS", 0.01),
-        pytest.raises(BlinkTimeoutError),
+        service.deadline(0),
+        service.deadline(60),
+        pytest.raises(BlinkDeadlineExceededError),
     ):
-        await service.connect()
+        await service.arm_cameras(["Backyard"])
+
+
+@pytest.mark.asyncio
+async def test_deadline_applies_to_spawned_download_tasks() -> None:
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_camera("Backyard")
+    cam.recent_clips = [{"time": "2024-01-01T00:00:00", "clip": "url1"}]
+
+    async def slow_clip(url):
+        await asyncio.sleep(10)
+
+    cam.get_video_clip = slow_clip
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+
+    with service.deadline(0.02):
+        events = await asyncio.wait_for(_collect_motion_events(service, {}), 1)
+
+    assert [e.clip_file for e in events] == [None]
 
 
 # --- Credential file permissions ---
@@ -663,13 +2130,11 @@ async def test_save_credentials_restricts_file_permissions() -> None:
 
 
 @pytest.mark.asyncio
-async def test_get_new_motion_events_filters_to_camera_names() -> None:
+async def test_new_motion_clips_filters_to_camera_names() -> None:
     service = BlinkService("user@example.com", "pw")
     controlled = _make_camera("Backyard")
     controlled.recent_clips = [{"time": "2024-01-02T00:00:00", "clip": "c1"}]
-    response = MagicMock()
-    response.status = 200
-    response.read = AsyncMock(return_value=b"video")
+    response = _make_clip_response(b"video")
     controlled.get_video_clip = AsyncMock(return_value=response)
 
     uncontrolled = _make_camera("Garage")
@@ -681,22 +2146,20 @@ async def test_get_new_motion_events_filters_to_camera_names() -> None:
     )
     service._blink = blink
 
-    events = await service.get_new_motion_events({}, camera_names=["Backyard"])
+    events = await _collect_motion_events(
+        service, {}, camera_names=["Backyard"]
+    )
 
     assert [e.camera_name for e in events] == ["Backyard"]
     uncontrolled.get_video_clip.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_get_new_motion_events_without_filter_checks_all_cameras() -> (
-    None
-):
+async def test_new_motion_clips_without_filter_checks_all_cameras() -> None:
     service = BlinkService("user@example.com", "pw")
     cam_a = _make_camera("Backyard")
     cam_a.recent_clips = [{"time": "2024-01-02T00:00:00", "clip": "c1"}]
-    response = MagicMock()
-    response.status = 200
-    response.read = AsyncMock(return_value=b"video")
+    response = _make_clip_response(b"video")
     cam_a.get_video_clip = AsyncMock(return_value=response)
 
     cam_b = _make_camera("Garage")
@@ -706,6 +2169,256 @@ async def test_get_new_motion_events_without_filter_checks_all_cameras() -> (
     blink = _make_blink_mock(cameras={"Backyard": cam_a, "Garage": cam_b})
     service._blink = blink
 
-    events = await service.get_new_motion_events({})
+    events = await _collect_motion_events(service, {})
 
     assert {e.camera_name for e in events} == {"Backyard", "Garage"}
+
+
+# --- Streaming clip downloads ---
+
+
+@pytest.mark.asyncio
+async def test_download_clip_streams_in_chunks_to_spooled_file() -> None:
+    """A clip larger than one chunk must be written chunk by chunk and
+    roll over to disk rather than being buffered whole in memory."""
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_camera("Backyard")
+    data = b"x" * (CLIP_DOWNLOAD_CHUNK_BYTES * 3 + 7)
+    response = _make_clip_response(data)
+    cam.get_video_clip = AsyncMock(return_value=response)
+
+    clip_file = await service._download_clip(cam, "url")
+
+    with clip_file:
+        assert clip_file._rolled is True
+        assert clip_file.read() == data
+    response.release.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_download_clip_spools_to_configured_directory(tmp_path) -> None:
+    service = BlinkService("user@example.com", "pw", clip_spool_dir=tmp_path)
+    cam = _make_camera("Backyard")
+    data = b"x" * (CLIP_DOWNLOAD_CHUNK_BYTES + 1)
+    cam.get_video_clip = AsyncMock(return_value=_make_clip_response(data))
+
+    with patch(
+        "blink_service.tempfile.SpooledTemporaryFile",
+        wraps=tempfile.SpooledTemporaryFile,
+    ) as spooled:
+        clip_file = await service._download_clip(cam, "url")
+
+    with clip_file:
+        assert clip_file.read() == data
+    assert spooled.call_args.kwargs["dir"] == tmp_path
+
+
+@pytest.mark.asyncio
+async def test_download_clip_non_200_returns_none() -> None:
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_camera("Backyard")
+    cam.get_video_clip = AsyncMock(
+        return_value=_make_clip_response(b"", status=404)
+    )
+
+    assert await service._download_clip(cam, "url") is None
+
+
+@pytest.mark.asyncio
+async def test_download_clip_to_writes_path(tmp_path) -> None:
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_camera("Backyard")
+    data = b"x" * (CLIP_DOWNLOAD_CHUNK_BYTES + 3)
+    response = _make_clip_response(data)
+    cam.get_video_clip = AsyncMock(return_value=response)
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+    path = tmp_path / "clip.mp4"
+
+    assert await service.download_clip_to("Backyard", "url", path) is True
+
+    assert path.read_bytes() == data
+    response.release.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_download_clip_to_unknown_camera_returns_false(tmp_path) -> None:
+    service = BlinkService("user@example.com", "pw")
+    service._blink = _make_blink_mock(cameras={})
+
+    ok = await service.download_clip_to("Gone", "url", tmp_path / "c.mp4")
+
+    assert ok is False
+    assert not (tmp_path / "c.mp4").exists()
+
+
+def test_media_headers_returns_auth_header_for_known_camera() -> None:
+    service = BlinkService("user@example.com", "pw")
+    service._blink = _make_blink_mock(
+        cameras={"Backyard": _make_camera("Backyard")}
+    )
+    service._blink.auth.header = {"Authorization": "Bearer t"}
+
+    assert service.media_headers("Backyard") == {"Authorization": "Bearer t"}
+    assert service.media_headers("Gone") is None
+
+
+@pytest.mark.asyncio
+async def test_motion_clip_downloads_failed_download_yields_no_clip() -> None:
+    service = BlinkService("user@example.com", "pw")
+    cam = _make_camera("Backyard")
+    cam.recent_clips = [{"time": "2024-01-01T00:00:00", "clip": "url1"}]
+    cam.get_video_clip = AsyncMock(side_effect=RuntimeError("boom"))
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+
+    events = await _collect_motion_events(service, {})
+
+    assert [(e.clip_time, e.clip_file) for e in events] == [
+        ("2024-01-01T00:00:00", None)
+    ]
+
+
+# --- Parallel motion clip downloads ---
+
+
+def _make_delayed_clip_getter(delays: dict[str, float], log: list[str]):
+    """get_video_clip replacement whose per-URL latency is `delays`."""
+
+    async def get_video_clip(url):
+        log.append(f"start:{url}")
+        await asyncio.sleep(delays[url])
+        log.append(f"end:{url}")
+        return _make_clip_response(url.encode())
+
+    return get_video_clip
+
+
+@pytest.mark.asyncio
+async def test_motion_clip_downloads_downloads_concurrently() -> None:
+    service = BlinkService("user@example.com", "pw")
+    log: list[str] = []
+    cameras = {}
+    for name in ("Backyard", "Garage", "Porch"):
+        cam = _make_camera(name)
+        cam.recent_clips = [{"time": "2024-01-01T00:00:00", "clip": name}]
+        cam.get_video_clip = _make_delayed_clip_getter({name: 0.05}, log)
+        cameras[name] = cam
+    service._blink = _make_blink_mock(cameras=cameras)
+
+    events = await _collect_motion_events(service, {})
+
+    assert len(events) == 3
+    # All three downloads started before any of them finished.
+    assert log[:3] == ["start:Backyard", "start:Garage", "start:Porch"]
+
+
+@pytest.mark.asyncio
+async def test_motion_clip_downloads_respects_concurrency_cap() -> None:
+    service = BlinkService("user@example.com", "pw")
+    in_flight = 0
+    peak = 0
+
+    async def get_video_clip(url):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _make_clip_response(b"v")
+
+    cam = _make_camera("Backyard")
+    cam.recent_clips = [
+        {"time": f"2024-01-0{day}T00:00:00", "clip": f"url{day}"}
+        for day in range(1, 7)
+    ]
+    cam.get_video_clip = get_video_clip
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+
+    with patch("blink_service.MOTION_CLIP_DOWNLOAD_CONCURRENCY", 2):
+        events = await _collect_motion_events(service, {})
+
+    assert len(events) == 6
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_motion_clip_downloads_keeps_per_camera_order() -> None:
+    """A camera's newer clip finishing first must be held back until its
+    older clip has been yielded; other cameras are not held back."""
+    service = BlinkService("user@example.com", "pw")
+    log: list[str] = []
+    backyard = _make_camera("Backyard")
+    backyard.recent_clips = [
+        {"time": "2024-01-01T00:00:00", "clip": "old"},
+        {"time": "2024-01-02T00:00:00", "clip": "new"},
+    ]
+    backyard.get_video_clip = _make_delayed_clip_getter(
+        {"old": 0.06, "new": 0.01}, log
+    )
+    garage = _make_camera("Garage")
+    garage.recent_clips = [{"time": "2024-01-01T00:00:00", "clip": "fast"}]
+    garage.get_video_clip = _make_delayed_clip_getter({"fast": 0.02}, log)
+    service._blink = _make_blink_mock(
+        cameras={"Backyard": backyard, "Garage": garage}
+    )
+
+    events = await _collect_motion_events(service, {})
+
+    assert [(e.camera_name, e.clip_time) for e in events] == [
+        ("Garage", "2024-01-01T00:00:00"),
+        ("Backyard", "2024-01-01T00:00:00"),
+        ("Backyard", "2024-01-02T00:00:00"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_motion_clip_downloads_downloads_outside_lock() -> None:
+    """Arm/disarm must not wait behind an in-progress clip download."""
+    service = BlinkService("user@example.com", "pw")
+    download_started = asyncio.Event()
+    release_download = asyncio.Event()
+
+    async def get_video_clip(url):
+        download_started.set()
+        await release_download.wait()
+        return _make_clip_response(b"v")
+
+    cam = _make_camera("Backyard")
+    cam.recent_clips = [{"time": "2024-01-01T00:00:00", "clip": "url1"}]
+    cam.get_video_clip = get_video_clip
+    cam.async_arm = AsyncMock()
+    service._blink = _make_blink_mock(cameras={"Backyard": cam})
+
+    poll = asyncio.create_task(_collect_motion_events(service, {}))
+    await download_started.wait()
+    result = await asyncio.wait_for(service.arm_cameras(["Backyard"]), 1)
+    release_download.set()
+    await poll
+
+    assert result == {"Backyard": True}
+
+
+@pytest.mark.asyncio
+async def test_motion_clip_downloads_early_close_cleans_up() -> None:
+    """Stopping after the first event cancels the remaining downloads and
+    closes any clip file the consumer never received."""
+    service = BlinkService("user@example.com", "pw")
+    log: list[str] = []
+    cam_a = _make_camera("Backyard")
+    cam_a.recent_clips = [{"time": "2024-01-01T00:00:00", "clip": "a"}]
+    cam_a.get_video_clip = _make_delayed_clip_getter({"a": 0.01}, log)
+    cam_b = _make_camera("Garage")
+    cam_b.recent_clips = [{"time": "2024-01-01T00:00:00", "clip": "b"}]
+    cam_b.get_video_clip = _make_delayed_clip_getter({"b": 10}, log)
+    service._blink = _make_blink_mock(
+        cameras={"Backyard": cam_a, "Garage": cam_b}
+    )
+
+    clips = await service.new_motion_clips({})
+    async with contextlib.aclosing(
+        service.iter_motion_clip_downloads(clips)
+    ) as events:
+        async for event in events:
+            event.clip_file.close()
+            break
+
+    assert "end:b" not in log
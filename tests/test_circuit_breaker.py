@@ -0,0 +1,96 @@
+"""Tests for circuit_breaker.py — per-key CircuitBreaker."""
+
+from circuit_breaker import CircuitBreaker, CircuitState
+
+
+def _make_breaker(clock, threshold: int = 3, reset: float = 60):
+    return CircuitBreaker(threshold, reset, clock=clock)
+
+
+def test_closed_circuit_allows_calls(clock) -> None:
+    breaker = _make_breaker(clock)
+    assert breaker.allow("refresh") is True
+    assert breaker.status() == {}
+
+
+def test_opens_after_threshold_consecutive_failures(clock) -> None:
+    breaker = _make_breaker(clock, threshold=3)
+
+    for _ in range(2):
+        breaker.record_failure("refresh")
+    assert breaker.allow("refresh") is True
+
+    breaker.record_failure("refresh")
+
+    assert breaker.allow("refresh") is False
+    status = breaker.status()["refresh"]
+    assert status.state is CircuitState.OPEN
+    assert status.consecutive_failures == 3
+    assert status.retry_in_seconds == 60
+
+
+def test_success_resets_failure_count(clock) -> None:
+    breaker = _make_breaker(clock, threshold=2)
+
+    breaker.record_failure("refresh")
+    breaker.record_success("refresh")
+    breaker.record_failure("refresh")
+
+    assert breaker.allow("refresh") is True
+
+
+def test_keys_are_tracked_independently(clock) -> None:
+    breaker = _make_breaker(clock, threshold=1)
+
+    breaker.record_failure("download_clip")
+
+    assert breaker.allow("download_clip") is False
+    assert breaker.allow("arm_camera") is True
+
+
+def test_half_open_admits_single_probe_after_reset_timeout(clock) -> None:
+    breaker = _make_breaker(clock, threshold=1, reset=60)
+    breaker.record_failure("refresh")
+
+    clock.now += 59
+    assert breaker.allow("refresh") is False
+    clock.now += 1
+    assert breaker.allow("refresh") is True
+    assert breaker.status()["refresh"].state is CircuitState.HALF_OPEN
+    assert breaker.allow("refresh") is False  # probe already in flight
+
+
+def test_successful_probe_closes_circuit(clock) -> None:
+    breaker = _make_breaker(clock, threshold=1)
+    breaker.record_failure("refresh")
+    clock.now += 60
+    breaker.allow("refresh")
+
+    breaker.record_success("refresh")
+
+    assert breaker.allow("refresh") is True
+    assert breaker.status() == {}
+
+
+def test_failed_probe_reopens_for_full_timeout(clock) -> None:
+    breaker = _make_breaker(clock, threshold=3, reset=60)
+    for _ in range(3):
+        breaker.record_failure("refresh")
+    clock.now += 60
+    breaker.allow("refresh")
+
+    breaker.record_failure("refresh")
+
+    assert breaker.allow("refresh") is False
+    assert breaker.status()["refresh"].retry_in_seconds == 60
+
+
+def test_released_probe_lets_next_caller_probe(clock) -> None:
+    breaker = _make_breaker(clock, threshold=1)
+    breaker.record_failure("refresh")
+    clock.now += 60
+    assert breaker.allow("refresh") is True
+
+    breaker.release("refresh")
+
+    assert breaker.allow("refresh") is True
@@ -0,0 +1,265 @@
+"""Tests for clip_archiver.py — background motion-clip archiver."""
+
+import asyncio
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from blink_service import MotionClip
+from clip_archiver import ClipArchiver, media_id
+
+URL = "https://rest.example.com/api/v2/accounts/1/media/clip/{}.mp4"
+DAY = 24 * 3600
+
+
+def _clip(media: int, camera: str = "Backyard") -> MotionClip:
+    return MotionClip(
+        camera_name=camera,
+        clip_time=f"2024-01-01T00:00:{media:02d}+00:00",
+        clip_url=URL.format(media),
+        thumbnail=None,
+    )
+
+
+def _make_blink(body: bytes = b"clip", ok: bool = True) -> MagicMock:
+    """A BlinkService stand-in whose download_clip_to() writes `body`."""
+    blink = MagicMock()
+    downloads: list[str] = []
+
+    async def download_clip_to(camera_name, clip_url, path):
+        downloads.append(media_id(clip_url))
+        Path(path).write_bytes(body)
+        return ok
+
+    blink.download_clip_to = download_clip_to
+    blink.downloads = downloads
+    return blink
+
+
+async def _drain(archiver: ClipArchiver) -> None:
+    """Let the worker finish everything queued so far."""
+    for _ in range(100):
+        await asyncio.sleep(0)
+        if archiver._queue.empty():
+            break
+    for _ in range(10):
+        await asyncio.sleep(0.01)
+
+
+def _archived(root: Path) -> list[str]:
+    return sorted(p.name for p in root.rglob("*") if p.is_file())
+
+
+@pytest.mark.asyncio
+async def test_archives_clip_under_camera_directory(tmp_path: Path) -> None:
+    blink = _make_blink(b"video")
+    archiver = ClipArchiver(blink, tmp_path)
+    await archiver.start()
+
+    archiver.submit([_clip(7)])
+    await _drain(archiver)
+    await archiver.close()
+
+    [path] = (tmp_path / "Backyard").iterdir()
+    assert path.name == "2024-01-01T00_00_07_00_00_7.mp4"
+    assert path.read_bytes() == b"video"
+
+
+@pytest.mark.asyncio
+async def test_skips_media_id_already_archived(tmp_path: Path) -> None:
+    blink = _make_blink()
+    archiver = ClipArchiver(blink, tmp_path)
+    await archiver.start()
+    archiver.submit([_clip(1)])
+    await _drain(archiver)
+    await archiver.close()
+
+    # A restarted archiver finds the clip on disk.
+    restarted = ClipArchiver(blink, tmp_path)
+    await restarted.start()
+    restarted.submit([_clip(1), _clip(2)])
+    await _drain(restarted)
+    await restarted.close()
+
+    assert blink.downloads == ["1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_failed_download_leaves_no_file(tmp_path: Path) -> None:
+    archiver = ClipArchiver(_make_blink(ok=False), tmp_path)
+    await archiver.start()
+
+    archiver.submit([_clip(1)])
+    await _drain(archiver)
+    await archiver.close()
+
+    assert _archived(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_start_removes_partial_downloads(tmp_path: Path) -> None:
+    partial = tmp_path / "Backyard" / "x_1.mp4.part"
+    partial.parent.mkdir()
+    partial.write_bytes(b"trunc")
+    archiver = ClipArchiver(_make_blink(), tmp_path)
+
+    await archiver.start()
+    await archiver.close()
+
+    assert not partial.exists()
+
+
+@pytest.mark.asyncio
+async def test_deletes_clips_past_retention(tmp_path: Path) -> None:
+    old = tmp_path / "Backyard" / "old_1.mp4"
+    old.parent.mkdir()
+    old.write_bytes(b"old")
+    now = 100 * DAY
+    os.utime(old, (now - 31 * DAY, now - 31 * DAY))
+    archiver = ClipArchiver(
+        _make_blink(), tmp_path, retention_days=30, clock=lambda: now
+    )
+    await archiver.start()
+
+    archiver.submit([_clip(2)])
+    await _drain(archiver)
+    await archiver.close()
+
+    assert not old.exists()
+    assert len(_archived(tmp_path)) == 1
+
+
+@pytest.mark.asyncio
+async def test_start_deletes_clips_past_retention(tmp_path: Path) -> None:
+    old = tmp_path / "Backyard" / "old_1.mp4"
+    old.parent.mkdir()
+    old.write_bytes(b"old")
+    now = 100 * DAY
+    os.utime(old, (now - 31 * DAY, now - 31 * DAY))
+    archiver = ClipArchiver(
+        _make_blink(), tmp_path, retention_days=30, clock=lambda: now
+    )
+
+    await archiver.start()
+    await _drain(archiver)
+    await archiver.close()
+
+    assert not old.exists()
+
+
+@pytest.mark.asyncio
+async def test_clips_expire_without_new_motion(tmp_path: Path) -> None:
+    clip = tmp_path / "Backyard" / "clip_1.mp4"
+    clip.parent.mkdir()
+    clip.write_bytes(b"clip")
+    now = [clip.stat().st_mtime]
+    archiver = ClipArchiver(
+        _make_blink(), tmp_path, retention_days=30, clock=lambda: now[0]
+    )
+
+    with patch("clip_archiver.CLIP_ARCHIVE_CLEANUP_INTERVAL_SECONDS", 0.01):
+        await archiver.start()
+        await _drain(archiver)
+        assert clip.exists()
+
+        now[0] += 31 * DAY
+        await _drain(archiver)
+        await archiver.close()
+
+    assert not clip.exists()
+
+
+@pytest.mark.asyncio
+async def test_cleanup_catches_up_past_one_batch(tmp_path: Path) -> None:
+    directory = tmp_path / "Backyard"
+    directory.mkdir()
+    for media in range(25):
+        (directory / f"old_{media}.mp4").write_bytes(b"x")
+    archiver = ClipArchiver(_make_blink(), tmp_path, max_bytes=0)
+
+    await archiver.start()
+    await _drain(archiver)
+    await archiver.close()
+
+    assert _archived(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_deletes_oldest_clips_over_size_limit(tmp_path: Path) -> None:
+    blink = _make_blink(b"x" * 10)
+    archiver = ClipArchiver(blink, tmp_path, max_bytes=25)
+    await archiver.start()
+
+    for media in (1, 2, 3, 4):
+        archiver.submit([_clip(media)])
+        await _drain(archiver)
+    await archiver.close()
+
+    assert [name[-6:] for name in _archived(tmp_path)] == [
+        "_3.mp4",
+        "_4.mp4",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_clips(tmp_path: Path) -> None:
+    archiver = ClipArchiver(_make_blink(), tmp_path, queue_size=1)
+
+    # Not started: nothing consumes the queue.
+    archiver.submit([_clip(1), _clip(2)])
+
+    assert archiver._queue.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_records_archived_and_deleted_paths_in_clip_index(
+    tmp_path: Path,
+) -> None:
+    clip_index = MagicMock()
+    archiver = ClipArchiver(
+        _make_blink(b"x" * 10),
+        tmp_path / "archive",
+        max_bytes=15,
+        clip_index=clip_index,
+    )
+    await archiver.start()
+
+    archiver.submit([_clip(1)])
+    await _drain(archiver)
+    archiver.submit([_clip(2)])
+    await _drain(archiver)
+    await archiver.close()
+
+    assert clip_index.record_local_path.call_count == 2
+    camera, clip_time, url, path = clip_index.record_local_path.call_args.args
+    assert (camera, url) == ("Backyard", URL.format(2))
+    assert path.endswith("_2.mp4")
+    # Clip 1 was deleted to make room for clip 2.
+    clip_index.update_local_paths.assert_called_with({"1": None})
+
+
+@pytest.mark.asyncio
+async def test_downloads_through_media_worker(tmp_path: Path) -> None:
+    blink = _make_blink()
+    blink.media_headers = MagicMock(return_value={"Authorization": "t"})
+    worker = MagicMock()
+
+    async def save_clip(clip_url, headers, path):
+        Path(path).write_bytes(b"from worker")
+        return True
+
+    worker.save_clip = AsyncMock(side_effect=save_clip)
+    archiver = ClipArchiver(blink, tmp_path, media_worker=worker)
+    await archiver.start()
+
+    archiver.submit([_clip(3)])
+    await _drain(archiver)
+    await archiver.close()
+
+    assert blink.downloads == []
+    url, headers, _ = worker.save_clip.await_args.args
+    assert (url, headers) == (URL.format(3), {"Authorization": "t"})
+    [path] = (tmp_path / "Backyard").iterdir()
+    assert path.read_bytes() == b"from worker"
@@ -0,0 +1,257 @@
+"""Tests for clip_index.py — SQLite index of clip metadata."""
+
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from blink_service import ClipHistory, ClipMetadata
+from clip_index import ClipIndex, media_id
+
+URL = "https://rest.example.com/api/v2/accounts/1/media/clip/{}.mp4"
+DAY = 24 * 3600
+NOW = datetime(2024, 6, 10, tzinfo=timezone.utc).timestamp()
+
+
+def _meta(
+    media: int,
+    clip_time: str,
+    camera: str = "Backyard",
+    deleted: bool = False,
+    updated_at: str | None = None,
+) -> ClipMetadata:
+    return ClipMetadata(
+        camera_name=camera,
+        clip_time=clip_time,
+        clip_url=URL.format(media),
+        updated_at=updated_at or clip_time,
+        deleted=deleted,
+    )
+
+
+def _make_blink(*pages: list[ClipMetadata], complete: bool = True):
+    """A BlinkService stand-in whose clip_history() returns each of
+    `pages` in turn, one per sync."""
+    blink = MagicMock()
+    blink.clip_history = AsyncMock(
+        side_effect=[
+            ClipHistory(clips=list(page), complete=complete) for page in pages
+        ]
+    )
+    return blink
+
+
+@pytest.fixture
+def index(tmp_path: Path):
+    index = ClipIndex(tmp_path / "clip_index.db", clock=lambda: NOW)
+    index.open()
+    yield index
+    index.close()
+
+
+def _times(clips) -> list[str]:
+    return [clip.clip_time.isoformat() for clip in clips]
+
+
+def test_media_id_is_url_file_stem() -> None:
+    assert media_id(URL.format(1234)) == "1234"
+
+
+@pytest.mark.asyncio
+async def test_sync_indexes_history_and_searches_newest_first(
+    index: ClipIndex,
+) -> None:
+    blink = _make_blink(
+        [
+            _meta(1, "2024-06-01T10:00:00+00:00"),
+            _meta(2, "2024-06-02T10:00:00+00:00"),
+            _meta(3, "2024-06-02T11:00:00+00:00", camera="Garage"),
+        ]
+    )
+
+    assert await index.sync(blink) == 3
+
+    # First sync backfills from the configured number of days ago.
+    since, _, _ = blink.clip_history.call_args.args
+    assert since == NOW - 7 * DAY
+    assert _times(index.search("Backyard")) == [
+        "2024-06-02T10:00:00+00:00",
+        "2024-06-01T10:00:00+00:00",
+    ]
+    [clip] = index.search("Garage")
+    assert clip.media_id == "3"
+    assert clip.local_path is None
+
+
+@pytest.mark.asyncio
+async def test_search_range_is_start_inclusive_end_exclusive(
+    index: ClipIndex,
+) -> None:
+    await index.sync(
+        _make_blink(
+            [_meta(day, f"2024-06-0{day}T00:00:00+00:00") for day in (1, 2, 3)]
+        )
+    )
+
+    clips = index.search(
+        "Backyard",
+        start=datetime(2024, 6, 2, tzinfo=timezone.utc),
+        end=datetime(2024, 6, 3, tzinfo=timezone.utc),
+    )
+
+    assert _times(clips) == ["2024-06-02T00:00:00+00:00"]
+
+
+@pytest.mark.asyncio
+async def test_search_normalizes_offsets_to_utc(index: ClipIndex) -> None:
+    await index.sync(_make_blink([_meta(1, "2024-06-01T12:00:00+02:00")]))
+
+    clips = index.search(
+        "Backyard", start=datetime(2024, 6, 1, 10, tzinfo=timezone.utc)
+    )
+
+    assert _times(clips) == ["2024-06-01T10:00:00+00:00"]
+
+
+@pytest.mark.asyncio
+async def test_next_sync_starts_from_newest_update(index: ClipIndex) -> None:
+    blink = _make_blink(
+        [
+            _meta(
+                1,
+                "2024-06-01T00:00:00+00:00",
+                updated_at="2024-06-05T00:00:00+00:00",
+            )
+        ],
+        [],
+    )
+    await index.sync(blink)
+
+    await index.sync(blink)
+
+    since, _, _ = blink.clip_history.call_args.args
+    assert since == datetime(2024, 6, 5, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.mark.asyncio
+async def test_backlog_over_page_limit_is_indexed_over_several_syncs(
+    tmp_path: Path,
+) -> None:
+    """Blink lists changes newest first, two per page here; with one page
+    per sync, five clips take three syncs."""
+    index = ClipIndex(
+        tmp_path / "clip_index.db", max_pages=1, clock=lambda: NOW
+    )
+    index.open()
+    backlog = [
+        _meta(media, f"2024-06-0{media}T00:00:00+00:00")
+        for media in (5, 4, 3, 2, 1)
+    ]
+
+    async def clip_history(since, max_pages, first_page):
+        start = (first_page - 1) * 2
+        pages = [
+            backlog[i : i + 2] for i in range(start, start + 2 * max_pages, 2)
+        ]
+        read = [clip for page in pages for clip in page]
+        return ClipHistory(clips=read, complete=len(read) < 2 * max_pages)
+
+    blink = MagicMock()
+    blink.clip_history = AsyncMock(side_effect=clip_history)
+
+    for _ in range(3):
+        await index.sync(blink)
+    assert len(index.search("Backyard")) == 5
+
+    await index.sync(blink)
+    index.close()
+
+    pages = [call.args[2] for call in blink.clip_history.call_args_list]
+    assert pages == [1, 2, 3, 1]
+    # The cursor stays put until the backlog is read, then jumps to the
+    # newest clip.
+    cursors = {call.args[0] for call in blink.clip_history.call_args_list[:3]}
+    assert cursors == {NOW - 7 * DAY}
+    since, _, _ = blink.clip_history.call_args.args
+    assert since == datetime(2024, 6, 5, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.mark.asyncio
+async def test_deleted_clips_are_removed(index: ClipIndex) -> None:
+    blink = _make_blink(
+        [_meta(1, "2024-06-05T00:00:00+00:00")],
+        [_meta(1, "2024-06-05T00:00:00+00:00", deleted=True)],
+    )
+    await index.sync(blink)
+
+    await index.sync(blink)
+
+    assert index.search("Backyard") == []
+
+
+@pytest.mark.asyncio
+async def test_sync_keeps_local_path_and_prunes_old_rows(
+    index: ClipIndex,
+) -> None:
+    index.record_local_path(
+        "Backyard", "2024-01-01T00:00:00+00:00", URL.format(1), "/a/1.mp4"
+    )
+    blink = _make_blink(
+        [
+            _meta(1, "2024-01-01T00:00:00+00:00"),
+            _meta(2, "2024-01-02T00:00:00+00:00"),
+            _meta(3, "2024-06-01T00:00:00+00:00"),
+        ]
+    )
+
+    await index.sync(blink)
+
+    # Clip 2 is past retention; clip 1 survives because it's archived.
+    assert [(c.media_id, c.local_path) for c in index.search("Backyard")] == [
+        ("3", None),
+        ("1", "/a/1.mp4"),
+    ]
+
+
+def test_update_local_paths_clears_path(index: ClipIndex) -> None:
+    index.record_local_path(
+        "Backyard", "2024-06-01T00:00:00+00:00", URL.format(1), "/a/1.mp4"
+    )
+
+    index.update_local_paths({"1": None})
+
+    [clip] = index.search("Backyard")
+    assert clip.local_path is None
+
+
+@pytest.mark.asyncio
+async def test_writes_run_in_worker_threads(index: ClipIndex) -> None:
+    await asyncio.to_thread(
+        index.record_local_path,
+        "Backyard",
+        "2024-06-01T00:00:00+00:00",
+        URL.format(1),
+        "/a/1.mp4",
+    )
+    await asyncio.to_thread(index.update_local_paths, {"1": "/b/1.mp4"})
+
+    [clip] = index.search("Backyard")
+    assert clip.local_path == "/b/1.mp4"
+
+
+def test_data_survives_reopen(tmp_path: Path) -> None:
+    path = tmp_path / "clip_index.db"
+    index = ClipIndex(path)
+    index.open()
+    index.record_local_path(
+        "Backyard", "2024-06-01T00:00:00+00:00", URL.format(1), "/a/1.mp4"
+    )
+    index.close()
+
+    reopened = ClipIndex(path)
+    reopened.open()
+
+    assert len(reopened.search("Backyard")) == 1
+    reopened.close()
@@ -188,6 +188,45 @@ def test_load_non_object_json_raises_value_error(
         config.load()
 
 
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(None, False), ("true", True), (" ON ", True), ("0", False)],
+)
+@pytest.mark.parametrize(
+    ("env_name", "field_name"),
+    [
+        ("ARM_CONFIRMATION", "arm_confirmation_enabled"),
+        ("MEDIA_WORKER", "media_worker_enabled"),
+    ],
+)
+def test_load_reads_optional_flags_from_env(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    env_name: str,
+    field_name: str,
+    value: str | None,
+    expected: bool,
+) -> None:
+    _set_required_env(monkeypatch)
+    if value is None:
+        monkeypatch.delenv(env_name, raising=False)
+    else:
+        monkeypatch.setenv(env_name, value)
+    config = Config(config_file=str(tmp_path / "config.json"))
+
+    assert getattr(config.load(), field_name) is expected
+
+
+def test_load_reads_clip_spool_dir_from_env(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    _set_required_env(monkeypatch)
+    monkeypatch.setenv("CLIP_SPOOL_DIR", "/opt/tmp")
+    config = Config(config_file=str(tmp_path / "config.json"))
+
+    assert config.load().clip_spool_dir == "/opt/tmp"
+
+
 def test_load_unknown_field_raises_value_error(
     monkeypatch: pytest.MonkeyPatch, tmp_path: Path
 ) -> None:
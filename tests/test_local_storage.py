@@ -0,0 +1,67 @@
+"""Tests for local_storage.py — cached sync-module storage manifest."""
+
+from datetime import datetime, timezone
+
+from local_storage import LocalManifest
+
+NAMES = {"FrontDoor": "Front Door"}
+
+
+def _entry(clip_id: int, camera: str = "FrontDoor", day: int = 1) -> dict:
+    return {
+        "id": clip_id,
+        "camera_name": camera,
+        "created_at": f"2024-01-0{day}T00:00:00",
+        "size": "100",
+    }
+
+
+def test_merge_maps_camera_names_and_skips_others() -> None:
+    manifest = LocalManifest()
+
+    added = manifest.merge(
+        "m1", [_entry(1), _entry(2, camera="Other")], NAMES, now=0.0
+    )
+
+    assert added == 1
+    [clip] = manifest.clips("Front Door")
+    assert clip.clip_id == 1
+    assert clip.created_at == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert clip.size == 100
+    assert manifest.manifest_id == "m1"
+
+
+def test_merge_adds_new_and_drops_vanished_clips() -> None:
+    manifest = LocalManifest()
+    manifest.merge("m1", [_entry(1, day=1), _entry(2, day=2)], NAMES, 0.0)
+
+    added = manifest.merge(
+        "m2", [_entry(2, day=2), _entry(3, day=3)], NAMES, 1.0
+    )
+
+    assert added == 1
+    assert [clip.clip_id for clip in manifest.clips("Front Door")] == [3, 2]
+    assert manifest.manifest_id == "m2"
+
+
+def test_merge_skips_malformed_entries() -> None:
+    manifest = LocalManifest()
+
+    manifest.merge(
+        "m1",
+        [{"id": 1}, _entry(2) | {"created_at": "soon"}, _entry(3)],
+        NAMES,
+        0,
+    )
+
+    assert [clip.clip_id for clip in manifest.clips("Front Door")] == [3]
+
+
+def test_is_fresh_only_after_merge_and_within_max_age() -> None:
+    manifest = LocalManifest()
+    assert not manifest.is_fresh(now=0.0, max_age_seconds=300)
+
+    manifest.merge("m1", [], NAMES, now=100.0)
+
+    assert manifest.is_fresh(now=399.0, max_age_seconds=300)
+    assert not manifest.is_fresh(now=400.0, max_age_seconds=300)
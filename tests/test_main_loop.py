@@ -1,5 +1,7 @@
 """Tests for blink_camera_auto_arm.py main loop logic."""
 
+import asyncio
+import io
 import logging
 import time
 from unittest.mock import AsyncMock, MagicMock
@@ -7,12 +9,49 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from blink_camera_auto_arm import LoopContext, _configure_logging, run_iteration
-from blink_service import ConnectResult, MotionEvent
+from blink_service import CameraInfo, ConnectResult, MotionClip, MotionEvent
 from config import AppConfig
+from motion_index import MotionIndex
 from presence_monitor import Presence
 from state import AppState
 
 
+def _motion_events(*events: MotionEvent):
+    """side_effect for iter_motion_clip_downloads yielding `events`."""
+
+    async def iterate(*args, **kwargs):
+        for event in events:
+            yield event
+
+    return iterate
+
+
+def _clip(
+    name: str = "Backyard",
+    clip_time: str = "2024-01-01T00:00:00",
+    thumbnail: bytes | None = b"jpeg",
+) -> MotionClip:
+    return MotionClip(
+        camera_name=name,
+        clip_time=clip_time,
+        clip_url=f"/clips/{name}/{clip_time}",
+        thumbnail=thumbnail,
+    )
+
+
+def _camera(name: str, armed: bool, arm_state_known: bool = True) -> CameraInfo:
+    return CameraInfo(
+        name=name,
+        camera_id="1",
+        network_id="2",
+        product_type="catalina",
+        online=True,
+        armed=armed,
+        battery="ok",
+        arm_state_known=arm_state_known,
+    )
+
+
 @pytest.fixture
 def app_config() -> AppConfig:
     return AppConfig(
@@ -42,10 +81,12 @@ def mock_blink() -> MagicMock:
     svc.submit_2fa_code = AsyncMock(return_value=True)
     svc.save_credentials = AsyncMock()
     svc.refresh = AsyncMock()
+    svc.refresh_due = MagicMock(return_value=True)
     svc.list_all_cameras = MagicMock(return_value=[])
     svc.arm_cameras = AsyncMock(return_value={"Backyard": True})
     svc.disarm_cameras = AsyncMock(return_value={"Backyard": True})
-    svc.get_new_motion_events = AsyncMock(return_value=[])
+    svc.new_motion_clips = AsyncMock(return_value=[])
+    svc.iter_motion_clip_downloads = MagicMock(side_effect=_motion_events())
     return svc
 
 
@@ -68,8 +109,8 @@ def mock_bot() -> MagicMock:
 
 
 @pytest.fixture
-def ctx() -> LoopContext:
-    return LoopContext()
+def ctx(tmp_path) -> LoopContext:
+    return LoopContext(motion_index=MotionIndex(tmp_path / "motion_index.json"))
 
 
 async def _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx):
@@ -132,6 +173,93 @@ async def test_someone_home_already_disarmed_no_redundant_call(
     mock_blink.disarm_cameras.assert_not_awaited()
 
 
+@pytest.mark.asyncio
+async def test_refresh_skipped_until_due_but_arming_continues(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    mock_blink.refresh_due.return_value = False
+    mock_monitor.check_all.return_value = Presence.AWAY
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    mock_blink.refresh.assert_not_awaited()
+    mock_blink.arm_cameras.assert_awaited_once_with(["Backyard"])
+
+
+@pytest.mark.asyncio
+async def test_failed_arm_confirmation_alerts(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    app_config.arm_confirmation_enabled = True
+    mock_monitor.check_all.return_value = Presence.AWAY
+    mock_blink.confirm_arm_command = AsyncMock(return_value=False)
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    mock_blink.confirm_arm_command.assert_awaited_once_with("Backyard")
+    mock_bot.send_message.assert_awaited_with("Camera failed to arm: Backyard.")
+
+
+@pytest.mark.asyncio
+async def test_confirmed_disarm_sends_no_alert(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    app_config.arm_confirmation_enabled = True
+    app_state.commanded_camera_states["Backyard"] = True
+    mock_blink.confirm_arm_command = AsyncMock(return_value=True)
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    mock_blink.confirm_arm_command.assert_awaited_once_with("Backyard")
+    mock_bot.send_message.assert_awaited_once_with(
+        "Someone home. Disarming: Backyard."
+    )
+
+
+@pytest.mark.asyncio
+async def test_arm_confirmations_do_not_hold_up_other_cameras(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    """Every camera gets its command before any is confirmed, and the
+    confirmations are polled concurrently."""
+    app_config.arm_confirmation_enabled = True
+    app_config.controlled_cameras = ["Backyard", "Garage"]
+    mock_monitor.check_all.return_value = Presence.AWAY
+    mock_blink.arm_cameras.side_effect = lambda names: dict.fromkeys(
+        names, True
+    )
+    arms_at_confirm: list[int] = []
+    both_confirming = asyncio.Event()
+
+    async def confirm(camera_name):
+        arms_at_confirm.append(mock_blink.arm_cameras.await_count)
+        if len(arms_at_confirm) == 2:
+            both_confirming.set()
+        await both_confirming.wait()
+        return True
+
+    mock_blink.confirm_arm_command = AsyncMock(side_effect=confirm)
+
+    await asyncio.wait_for(
+        _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx),
+        timeout=1,
+    )
+
+    assert arms_at_confirm == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_arm_confirmation_off_by_default(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    mock_monitor.check_all.return_value = Presence.AWAY
+    mock_blink.confirm_arm_command = AsyncMock()
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    mock_blink.confirm_arm_command.assert_not_awaited()
+
+
 @pytest.mark.asyncio
 async def test_unknown_presence_skips_arm_disarm(
     app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
@@ -176,6 +304,15 @@ async def test_periodic_refresh_runs_stale_camera_reconciliation(
     mock_bot.reconcile_stale_cameras.assert_called_once_with()
 
 
+@pytest.mark.asyncio
+async def test_periodic_refresh_is_limited_to_controlled_cameras(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    mock_blink.refresh.assert_awaited_once_with(["Backyard"])
+
+
 @pytest.mark.asyncio
 async def test_stale_camera_removal_sends_proactive_notification(
     app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
@@ -269,6 +406,93 @@ async def test_manual_arm_while_disabled_then_reenable_home_disarms(
     assert app_state.commanded_camera_states["Backyard"] is False
 
 
+@pytest.mark.asyncio
+async def test_first_refresh_seeds_commanded_state_no_redundant_arm(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    mock_monitor.check_all.return_value = Presence.AWAY
+    mock_blink.list_all_cameras.return_value = [_camera("Backyard", True)]
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    assert app_state.commanded_camera_states == {"Backyard": True}
+    mock_blink.arm_cameras.assert_not_awaited()
+    mock_bot.send_message.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_seeded_state_differing_from_presence_still_commands(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    mock_monitor.check_all.return_value = Presence.AWAY
+    mock_blink.list_all_cameras.return_value = [_camera("Backyard", False)]
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    mock_blink.arm_cameras.assert_awaited_once_with(["Backyard"])
+    assert app_state.commanded_camera_states["Backyard"] is True
+
+
+@pytest.mark.asyncio
+async def test_unknown_arm_state_is_not_seeded_and_still_disarmed(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    """A camera Blink reports as "unknown" must not be taken as already
+    disarmed, or presence=home would never send it a disarm."""
+    mock_monitor.check_all.return_value = Presence.HOME
+    mock_blink.list_all_cameras.return_value = [
+        _camera("Backyard", False, arm_state_known=False)
+    ]
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    mock_blink.disarm_cameras.assert_awaited_once_with(["Backyard"])
+    assert app_state.commanded_camera_states == {"Backyard": False}
+
+
+@pytest.mark.asyncio
+async def test_seeding_keeps_state_commanded_before_first_refresh(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    mock_monitor.check_all.return_value = Presence.HOME
+    app_state.commanded_camera_states["Backyard"] = True
+    mock_blink.list_all_cameras.return_value = [_camera("Backyard", False)]
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    # Telegram's earlier arm command wins over the reported state, so
+    # presence=home still disarms.
+    mock_blink.disarm_cameras.assert_awaited_once_with(["Backyard"])
+
+
+@pytest.mark.asyncio
+async def test_commanded_state_is_seeded_only_once(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    mock_monitor.check_all.return_value = Presence.UNKNOWN
+    mock_blink.list_all_cameras.return_value = [_camera("Backyard", True)]
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    mock_blink.list_all_cameras.return_value = [_camera("Backyard", False)]
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    assert app_state.commanded_camera_states == {"Backyard": True}
+    assert app_state.camera_armed_status == {"Backyard": False}
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_does_not_seed_commanded_state(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    mock_blink.refresh.side_effect = RuntimeError("blink down")
+    mock_blink.list_all_cameras.return_value = [_camera("Backyard", True)]
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    assert app_state.commanded_camera_states == {}
+    assert not ctx.commanded_states_seeded
+
+
 @pytest.mark.asyncio
 async def test_not_connected_calls_connect(
     app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
@@ -401,7 +625,78 @@ async def test_motion_alerts_disabled_does_not_poll(
 
     await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
 
-    mock_blink.get_new_motion_events.assert_not_awaited()
+    mock_blink.new_motion_clips.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_clip_archiver_gets_new_clips_with_alerts_disabled(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    app_config.motion_alerts_enabled = False
+    ctx.clip_archiver = MagicMock()
+    clip = _clip()
+    mock_blink.new_motion_clips.return_value = [clip]
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    # Submitted once: the second poll finds it already recorded.
+    ctx.clip_archiver.submit.assert_called_once_with([clip])
+    mock_bot.send_photo.assert_not_awaited()
+    mock_blink.iter_motion_clip_downloads.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_clip_index_synced_at_most_every_interval(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    ctx.clip_index = MagicMock()
+    ctx.clip_index.sync = AsyncMock(return_value=0)
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+    await ctx.clip_index_sync_task
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    ctx.clip_index.sync.assert_awaited_once_with(mock_blink)
+
+
+@pytest.mark.asyncio
+async def test_clip_index_sync_runs_beside_the_iteration(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    """A slow sync neither holds up the iteration that starts it nor is
+    started twice while it runs."""
+    ctx.clip_index = MagicMock()
+    release = asyncio.Event()
+
+    async def slow_sync(blink):
+        await release.wait()
+        return 0
+
+    ctx.clip_index.sync = AsyncMock(side_effect=slow_sync)
+    ctx.next_clip_index_sync = 0.0
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+    ctx.next_clip_index_sync = 0.0
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    assert not ctx.clip_index_sync_task.done()
+    release.set()
+    await ctx.clip_index_sync_task
+    ctx.clip_index.sync.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_clip_index_sync_failure_does_not_break_iteration(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    ctx.clip_index = MagicMock()
+    ctx.clip_index.sync = AsyncMock(side_effect=RuntimeError("boom"))
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+    await ctx.clip_index_sync_task
+
+    ctx.clip_index.sync.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -415,33 +710,206 @@ async def test_motion_alerts_scoped_to_controlled_cameras(
 
     await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
 
-    mock_blink.get_new_motion_events.assert_awaited_once()
-    _, kwargs = mock_blink.get_new_motion_events.call_args
+    mock_blink.new_motion_clips.assert_awaited_once()
+    _, kwargs = mock_blink.new_motion_clips.call_args
     assert kwargs["camera_names"] == ["Backyard"]
 
 
 @pytest.mark.asyncio
-async def test_motion_alert_fires_send_video_after_priming(
+async def test_motion_alert_sends_thumbnail_then_clip_after_priming(
     app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
 ) -> None:
+    """The thumbnail alert goes out before the clip is even downloaded;
+    the clip follows once it has been."""
     app_config.motion_alerts_enabled = True
-    event = MotionEvent(
-        camera_name="Backyard", clip_time="2024-01-01T00:00:00", clip_bytes=b"v"
+    clip_file = io.BytesIO(b"v")
+    calls: list[str] = []
+    mock_bot.send_photo.side_effect = lambda *a: calls.append("photo")
+    mock_bot.send_video.side_effect = lambda *a: calls.append("video")
+
+    def downloads(clips):
+        calls.append("download")
+        return _motion_events(
+            MotionEvent(
+                camera_name="Backyard",
+                clip_time="2024-01-01T00:00:00",
+                clip_file=clip_file,
+            )
+        )()
+
+    # First iteration: camera enters the index — nothing to send.
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+    mock_bot.send_photo.assert_not_awaited()
+
+    # Second iteration: new motion clip appears -> alert, then clip.
+    clip = _clip()
+    mock_blink.new_motion_clips.return_value = [clip]
+    mock_blink.iter_motion_clip_downloads.side_effect = downloads
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    assert calls == ["photo", "download", "video"]
+    args, _ = mock_bot.send_photo.call_args
+    assert "Backyard" in args[0]
+    assert args[1] == b"jpeg"
+    args, _ = mock_bot.send_video.call_args
+    assert args[1] is clip_file
+    assert clip_file.closed
+    mock_blink.iter_motion_clip_downloads.assert_called_once_with([clip])
+    assert ctx.motion_index.last_seen() == {"Backyard": "2024-01-01T00:00:00"}
+
+
+@pytest.mark.asyncio
+async def test_motion_alert_without_thumbnail_sends_text(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    app_config.motion_alerts_enabled = True
+    ctx.motion_index.track(["Backyard"])
+    mock_blink.new_motion_clips.return_value = [_clip(thumbnail=None)]
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    mock_bot.send_photo.assert_not_awaited()
+    assert any(
+        "Motion detected: Backyard" in call.args[0]
+        for call in mock_bot.send_message.await_args_list
+    )
+
+
+@pytest.mark.asyncio
+async def test_motion_alert_failed_download_sends_no_follow_up(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    app_config.motion_alerts_enabled = True
+    ctx.motion_index.track(["Backyard"])
+    mock_blink.new_motion_clips.return_value = [_clip()]
+    mock_blink.iter_motion_clip_downloads.side_effect = _motion_events(
+        MotionEvent(
+            camera_name="Backyard",
+            clip_time="2024-01-01T00:00:00",
+            clip_file=None,
+        )
     )
 
-    # First iteration: priming call — no clips yet, nothing to send.
-    mock_blink.get_new_motion_events.return_value = []
     await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    mock_bot.send_photo.assert_awaited_once()
     mock_bot.send_video.assert_not_awaited()
+    assert ctx.motion_index.last_seen() == {"Backyard": "2024-01-01T00:00:00"}
+
+
+@pytest.mark.asyncio
+async def test_motion_alert_sends_clip_through_media_worker(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    """With a media worker the clip is handed to it by URL; this process
+    neither downloads nor uploads it."""
+    app_config.motion_alerts_enabled = True
+    ctx.motion_index.track(["Backyard"])
+    ctx.media_worker = MagicMock()
+    ctx.media_worker.send_clip = AsyncMock(return_value=True)
+    mock_blink.media_headers = MagicMock(return_value={"Authorization": "t"})
+    clip = _clip()
+    mock_blink.new_motion_clips.return_value = [clip]
 
-    # Second iteration: new motion clip appears -> alert sent.
-    mock_blink.get_new_motion_events.return_value = [event]
     await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+    await asyncio.gather(*ctx.media_tasks)
 
-    mock_bot.send_video.assert_awaited_once()
-    args, kwargs = mock_bot.send_video.call_args
-    assert "Backyard" in args[0]
-    assert args[1] == b"v"
+    mock_bot.send_photo.assert_awaited_once()
+    ctx.media_worker.send_clip.assert_awaited_once_with(
+        clip.clip_url,
+        {"Authorization": "t"},
+        "Motion clip: Backyard at 2024-01-01T00:00:00.",
+    )
+    mock_blink.iter_motion_clip_downloads.assert_not_called()
+    mock_bot.send_video.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_media_worker_follow_up_does_not_hold_up_iteration(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    app_config.motion_alerts_enabled = True
+    ctx.motion_index.track(["Backyard"])
+    ctx.media_worker = MagicMock()
+    release = asyncio.Event()
+
+    async def slow_send(*args):
+        await release.wait()
+        return True
+
+    ctx.media_worker.send_clip = AsyncMock(side_effect=slow_send)
+    mock_blink.media_headers = MagicMock(return_value={})
+    mock_blink.new_motion_clips.return_value = [_clip()]
+
+    await asyncio.wait_for(
+        _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx),
+        timeout=1,
+    )
+
+    [task] = ctx.media_tasks
+    assert not task.done()
+    release.set()
+    await task
+    assert not ctx.media_tasks
+
+
+@pytest.mark.asyncio
+async def test_motion_alert_new_camera_records_clips_without_downloading(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    """Clips of a camera not yet in the motion index are recorded but
+    neither sent nor downloaded."""
+    app_config.motion_alerts_enabled = True
+    mock_blink.new_motion_clips.return_value = [_clip()]
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    mock_bot.send_photo.assert_not_awaited()
+    mock_blink.iter_motion_clip_downloads.assert_not_called()
+    assert ctx.motion_index.last_seen() == {"Backyard": "2024-01-01T00:00:00"}
+
+
+@pytest.mark.asyncio
+async def test_motion_alert_skips_clip_already_delivered(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx
+) -> None:
+    app_config.motion_alerts_enabled = True
+    clip = _clip()
+    ctx.motion_index.mark_delivered("Backyard", clip.clip_time, clip.clip_url)
+    mock_blink.new_motion_clips.return_value = [clip]
+
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, ctx)
+
+    mock_bot.send_photo.assert_not_awaited()
+    mock_blink.iter_motion_clip_downloads.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_motion_alert_after_restart_needs_no_priming(
+    app_config, app_state, mock_blink, mock_monitor, mock_bot, tmp_path
+) -> None:
+    """A clip recorded before a restart is not re-sent; one that appears
+    during the restart is alerted on the very first poll."""
+    app_config.motion_alerts_enabled = True
+    path = tmp_path / "motion_index.json"
+    before = LoopContext(motion_index=MotionIndex(path))
+    mock_blink.new_motion_clips.return_value = [_clip()]
+    await _run(
+        app_config, app_state, mock_blink, mock_monitor, mock_bot, before
+    )
+    before.motion_index.flush()
+
+    after = LoopContext(motion_index=MotionIndex(path))
+    after.motion_index.load()
+    new_clip = _clip(clip_time="2024-01-02T00:00:00")
+    mock_blink.new_motion_clips.return_value = [new_clip]
+    await _run(app_config, app_state, mock_blink, mock_monitor, mock_bot, after)
+
+    assert mock_blink.new_motion_clips.call_args.args[0] == {
+        "Backyard": "2024-01-01T00:00:00"
+    }
+    mock_bot.send_photo.assert_awaited_once()
+    mock_blink.iter_motion_clip_downloads.assert_called_once_with([new_clip])
 
 
 # --- Health / state-transition logging ---
@@ -0,0 +1,197 @@
+"""Tests for media_worker.py — clip downloads and uploads in a child
+process, run against a local stand-in for Blink's media host and the
+Telegram Bot API."""
+
+import asyncio
+import sys
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+
+from media_worker import MediaWorker
+
+TOKEN = "123:abc"
+CHAT_ID = 42
+CLIP = b"\x00mp4" * 50_000
+
+
+@dataclass
+class FakeServer:
+    """Records what the worker sent to the fake endpoints."""
+
+    url: str = ""
+    # Set to let downloads of /slow.mp4 finish.
+    release: asyncio.Event = field(default_factory=asyncio.Event)
+    # Query string of each clip download, in the order they arrived.
+    downloads: list[str] = field(default_factory=list)
+    download_headers: list[dict] = field(default_factory=list)
+    uploads: list[dict] = field(default_factory=list)
+
+
+@pytest.fixture
+async def server() -> AsyncIterator[FakeServer]:
+    fake = FakeServer()
+
+    async def clip(request: web.Request) -> web.Response:
+        fake.downloads.append(request.query_string)
+        fake.download_headers.append(dict(request.headers))
+        return web.Response(body=CLIP, content_type="video/mp4")
+
+    async def slow_clip(request: web.Request) -> web.Response:
+        await fake.release.wait()
+        return await clip(request)
+
+    async def send_video(request: web.Request) -> web.Response:
+        form = await request.post()
+        fake.uploads.append(
+            {
+                "chat_id": form["chat_id"],
+                "caption": form["caption"],
+                "video": form["video"].file.read(),
+            }
+        )
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/clip.mp4", clip)
+    app.router.add_get("/slow.mp4", slow_clip)
+    app.router.add_post(f"/bot{TOKEN}/sendVideo", send_video)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    fake.url = f"http://{host}:{port}"
+    try:
+        yield fake
+    finally:
+        await runner.cleanup()
+
+
+@pytest.fixture
+async def worker(server: FakeServer) -> AsyncIterator[MediaWorker]:
+    media_worker = MediaWorker(
+        TOKEN, CHAT_ID, max_jobs=2, telegram_api_url=server.url
+    )
+    try:
+        yield media_worker
+    finally:
+        await media_worker.close()
+
+
+@pytest.mark.asyncio
+async def test_save_clip_writes_file(
+    server: FakeServer, worker: MediaWorker, tmp_path: Path
+) -> None:
+    path = tmp_path / "clip.mp4"
+
+    ok = await worker.save_clip(
+        f"{server.url}/clip.mp4", {"Authorization": "Bearer t"}, path
+    )
+
+    assert ok is True
+    assert path.read_bytes() == CLIP
+    assert server.download_headers[0]["Authorization"] == "Bearer t"
+
+
+@pytest.mark.asyncio
+async def test_send_clip_uploads_video_with_caption(
+    server: FakeServer, worker: MediaWorker
+) -> None:
+    ok = await worker.send_clip(f"{server.url}/clip.mp4", {}, "Motion clip.")
+
+    assert ok is True
+    assert server.uploads == [
+        {"chat_id": str(CHAT_ID), "caption": "Motion clip.", "video": CLIP}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_send_clip_spools_in_configured_directory(
+    server: FakeServer, tmp_path: Path
+) -> None:
+    """The clip is buffered in `spool_dir` — shown by a missing one
+    failing the job."""
+    media_worker = MediaWorker(
+        TOKEN,
+        CHAT_ID,
+        telegram_api_url=server.url,
+        spool_dir=tmp_path / "missing",
+    )
+    try:
+        clip_url = f"{server.url}/clip.mp4"
+        assert not await media_worker.send_clip(clip_url, {}, "Motion clip.")
+        (tmp_path / "missing").mkdir()
+        assert await media_worker.send_clip(clip_url, {}, "Motion clip.")
+    finally:
+        await media_worker.close()
+
+
+@pytest.mark.asyncio
+async def test_sent_clip_goes_ahead_of_queued_archive_copy(
+    server: FakeServer, worker: MediaWorker, tmp_path: Path
+) -> None:
+    running = asyncio.create_task(
+        worker.save_clip(f"{server.url}/slow.mp4?n=1", {}, tmp_path / "1")
+    )
+    while not worker._lock.locked():
+        await asyncio.sleep(0)
+    archive = asyncio.create_task(
+        worker.save_clip(f"{server.url}/clip.mp4?n=2", {}, tmp_path / "2")
+    )
+    follow_up = asyncio.create_task(
+        worker.send_clip(f"{server.url}/clip.mp4?n=3", {}, "Motion clip.")
+    )
+    await asyncio.sleep(0.05)
+
+    server.release.set()
+    assert await asyncio.gather(running, archive, follow_up) == [True] * 3
+
+    assert server.downloads == ["n=1", "n=3", "n=2"]
+
+
+@pytest.mark.asyncio
+async def test_failed_download_returns_false_and_worker_carries_on(
+    server: FakeServer, worker: MediaWorker, tmp_path: Path
+) -> None:
+    assert not await worker.save_clip(
+        f"{server.url}/missing.mp4", {}, tmp_path / "a.mp4"
+    )
+
+    assert await worker.save_clip(
+        f"{server.url}/clip.mp4", {}, tmp_path / "b.mp4"
+    )
+
+
+@pytest.mark.asyncio
+async def test_worker_is_recycled_after_max_jobs(
+    server: FakeServer, worker: MediaWorker, tmp_path: Path
+) -> None:
+    url = f"{server.url}/clip.mp4"
+    await worker.save_clip(url, {}, tmp_path / "1.mp4")
+    first = worker._process
+    await worker.save_clip(url, {}, tmp_path / "2.mp4")
+
+    # max_jobs=2: the first worker has exited and is no longer held.
+    assert worker._process is None
+    assert first.returncode == 0
+
+    await worker.save_clip(url, {}, tmp_path / "3.mp4")
+    assert worker._process.pid != first.pid
+
+
+@pytest.mark.asyncio
+async def test_dead_worker_returns_false_and_is_restarted(
+    tmp_path: Path,
+) -> None:
+    media_worker = MediaWorker(
+        TOKEN, CHAT_ID, command=[sys.executable, "-c", "pass"]
+    )
+
+    assert not await media_worker.save_clip("url", {}, tmp_path / "a.mp4")
+    assert media_worker._process is None
+    assert not await media_worker.save_clip("url", {}, tmp_path / "a.mp4")
+    await media_worker.close()
@@ -0,0 +1,111 @@
+"""Tests for motion_index.py — persisted delivered-clip index."""
+
+import json
+from pathlib import Path
+
+from motion_index import MotionIndex, clip_id
+
+URL = "https://rest-u1.immedia-semi.com/api/v2/accounts/1/media/clip/{}.mp4"
+
+
+def _make_index(tmp_path: Path, clock, **kwargs):
+    path = tmp_path / "motion_index.json"
+    return MotionIndex(path, clock=clock, **kwargs), path
+
+
+def test_clip_id_ignores_api_host() -> None:
+    other_host = URL.format(7).replace("rest-u1", "rest-e2")
+    assert clip_id(URL.format(7)) == clip_id(other_host)
+    assert clip_id(URL.format(7)) != clip_id(URL.format(8))
+
+
+def test_missing_file_loads_empty(tmp_path: Path, clock) -> None:
+    index, _ = _make_index(tmp_path, clock)
+
+    index.load()
+
+    assert index.last_seen() == {}
+    assert not index.is_tracked("Backyard")
+
+
+def test_round_trip_through_file(tmp_path: Path, clock) -> None:
+    index, path = _make_index(tmp_path, clock)
+    index.track(["Garage"])
+    index.mark_delivered("Backyard", "2024-01-02T00:00:00", URL.format(2))
+    index.mark_delivered("Backyard", "2024-01-01T00:00:00", URL.format(1))
+    index.flush()
+
+    reloaded = MotionIndex(path)
+    reloaded.load()
+
+    assert reloaded.last_seen() == {
+        "Garage": None,
+        "Backyard": "2024-01-02T00:00:00",
+    }
+    assert reloaded.is_delivered("Backyard", URL.format(1))
+    assert not reloaded.is_delivered("Backyard", URL.format(3))
+    assert reloaded.is_tracked("Garage")
+
+
+def test_keeps_only_newest_clips_per_camera(tmp_path: Path, clock) -> None:
+    index, _ = _make_index(tmp_path, clock, max_clips_per_camera=2)
+
+    for day in (1, 2, 3):
+        index.mark_delivered("Backyard", f"2024-01-0{day}", URL.format(day))
+
+    assert not index.is_delivered("Backyard", URL.format(1))
+    assert index.is_delivered("Backyard", URL.format(2))
+    assert index.is_delivered("Backyard", URL.format(3))
+
+
+def test_writes_are_batched_until_flush_interval(tmp_path: Path, clock) -> None:
+    index, path = _make_index(tmp_path, clock, flush_interval_seconds=300)
+
+    index.mark_delivered("Backyard", "2024-01-01T00:00:00", URL.format(1))
+    index.flush_if_due()
+    assert not path.exists()
+
+    clock.now += 300
+    index.flush_if_due()
+    assert path.exists()
+
+    # Nothing changed since: no rewrite, even once the interval passes.
+    path.unlink()
+    clock.now += 300
+    index.flush_if_due()
+    assert not path.exists()
+
+
+def test_track_existing_camera_is_not_a_change(tmp_path: Path, clock) -> None:
+    index, path = _make_index(tmp_path, clock)
+    index.track(["Backyard"])
+    index.flush()
+    path.unlink()
+
+    index.track(["Backyard"])
+    index.flush()
+
+    assert not path.exists()
+
+
+def test_corrupt_file_loads_empty(tmp_path: Path, clock) -> None:
+    index, path = _make_index(tmp_path, clock)
+    path.write_text("{not json", encoding="utf-8")
+
+    index.load()
+
+    assert index.last_seen() == {}
+
+
+def test_file_format_is_compact_pairs(tmp_path: Path, clock) -> None:
+    index, path = _make_index(tmp_path, clock)
+    index.mark_delivered("Backyard", "2024-01-01T00:00:00", URL.format(1))
+    index.flush()
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {
+        "cameras": {
+            "Backyard": [
+                ["2024-01-01T00:00:00", "/api/v2/accounts/1/media/clip/1.mp4"]
+            ]
+        }
+    }
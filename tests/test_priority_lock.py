@@ -0,0 +1,106 @@
+"""Tests for priority_lock.py — PriorityLock."""
+
+import asyncio
+
+import pytest
+
+from priority_lock import Priority, PriorityLock
+
+
+async def _queue(
+    lock: PriorityLock, order: list[str], name: str, priority: Priority
+) -> asyncio.Task[None]:
+    """Start a task that records `name` once it holds the lock, and let
+    it reach the wait queue."""
+
+    async def worker() -> None:
+        async with lock(priority):
+            order.append(name)
+
+    task = asyncio.create_task(worker())
+    await asyncio.sleep(0)
+    return task
+
+
+@pytest.mark.asyncio
+async def test_uncontended_acquire_is_immediate() -> None:
+    lock = PriorityLock()
+
+    async with lock(Priority.MEDIA):
+        assert lock.locked()
+
+    assert not lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_release_serves_most_urgent_waiter_first() -> None:
+    lock = PriorityLock()
+    order: list[str] = []
+    await lock.acquire(Priority.NORMAL)
+    tasks = [
+        await _queue(lock, order, "media", Priority.MEDIA),
+        await _queue(lock, order, "normal", Priority.NORMAL),
+        await _queue(lock, order, "arm", Priority.ARM),
+    ]
+
+    lock.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["arm", "normal", "media"]
+    assert not lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_waiters_of_equal_priority_are_served_in_arrival_order() -> None:
+    lock = PriorityLock()
+    order: list[str] = []
+    await lock.acquire(Priority.ARM)
+    tasks = [
+        await _queue(lock, order, name, Priority.MEDIA)
+        for name in ("first", "second", "third")
+    ]
+
+    lock.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["first", "second", "third"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_is_skipped() -> None:
+    lock = PriorityLock()
+    order: list[str] = []
+    await lock.acquire(Priority.NORMAL)
+    arm = await _queue(lock, order, "arm", Priority.ARM)
+    media = await _queue(lock, order, "media", Priority.MEDIA)
+
+    arm.cancel()
+    await asyncio.sleep(0)
+    lock.release()
+    await media
+
+    assert order == ["media"]
+    assert arm.cancelled()
+    assert not lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_waiter_cancelled_after_grant_passes_lock_on() -> None:
+    lock = PriorityLock()
+    order: list[str] = []
+    await lock.acquire(Priority.NORMAL)
+    arm = await _queue(lock, order, "arm", Priority.ARM)
+    media = await _queue(lock, order, "media", Priority.MEDIA)
+
+    # Grant the lock to `arm`, then cancel it before it gets to run.
+    lock.release()
+    arm.cancel()
+    await media
+
+    assert order == ["media"]
+    assert not lock.locked()
+
+
+def test_release_unlocked_raises() -> None:
+    with pytest.raises(RuntimeError):
+        PriorityLock().release()
@@ -0,0 +1,96 @@
+"""Tests for refresh_scheduler.py — adaptive periodic-refresh cadence."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from refresh_scheduler import RefreshScheduler, parse_retry_after
+
+
+def _make_scheduler(clock, minimum: float = 30, maximum: float = 900):
+    return RefreshScheduler(minimum, maximum, clock=clock)
+
+
+def test_due_immediately_then_every_min_interval(clock) -> None:
+    scheduler = _make_scheduler(clock)
+    assert scheduler.due()
+
+    scheduler.record_refresh()
+
+    clock.now += 29
+    assert not scheduler.due()
+    clock.now += 1
+    assert scheduler.due()
+    assert not scheduler.status().throttled
+
+
+def test_throttle_doubles_interval_up_to_max(clock) -> None:
+    scheduler = _make_scheduler(clock, maximum=100)
+
+    for expected in (60, 100, 100):
+        scheduler.record_throttle()
+        assert scheduler.interval_seconds == expected
+
+    status = scheduler.status()
+    assert status.throttled
+    assert status.next_refresh_in_seconds == 100
+
+
+def test_throttle_waits_for_longer_retry_after(clock) -> None:
+    scheduler = _make_scheduler(clock)
+
+    scheduler.record_throttle(retry_after_seconds=300)
+
+    clock.now += 299
+    assert not scheduler.due()
+    clock.now += 1
+    assert scheduler.due()
+
+
+def test_refresh_does_not_cut_retry_after_short(clock) -> None:
+    scheduler = _make_scheduler(clock)
+    scheduler.record_throttle(retry_after_seconds=300)
+
+    # An explicit refresh lands inside Blink's Retry-After window.
+    scheduler.record_refresh()
+
+    clock.now += 299
+    assert not scheduler.due()
+
+
+def test_clean_refreshes_recover_towards_min_interval(clock) -> None:
+    scheduler = _make_scheduler(clock)
+    scheduler.record_throttle()
+    scheduler.record_throttle()
+    assert scheduler.interval_seconds == 120
+
+    intervals = []
+    for _ in range(6):
+        scheduler.record_refresh()
+        intervals.append(scheduler.interval_seconds)
+
+    assert intervals == [90, 67.5, 50.625, 37.96875, 30, 30]
+    assert not scheduler.status().throttled
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(None, None), ("", None), ("120", 120), (" 2.5 ", 2.5), ("soon", None)],
+)
+def test_parse_retry_after_seconds(
+    value: str | None, expected: float | None
+) -> None:
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date() -> None:
+    moment = datetime.now(timezone.utc) + timedelta(seconds=90)
+
+    seconds = parse_retry_after(format_datetime(moment, usegmt=True))
+
+    assert 85 <= seconds <= 90
+
+
+def test_parse_retry_after_past_date_is_zero() -> None:
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
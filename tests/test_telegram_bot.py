@@ -1,13 +1,19 @@
 """Tests for telegram_bot.py — TelegramBot command router + handlers."""
 
 import asyncio
+import io
 import time
-from unittest.mock import AsyncMock, MagicMock, patch
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
 import pytest
 
-from blink_service import CameraInfo
+from api_metrics import CallOutcome, OperationMetrics
+from blink_service import CameraInfo, CameraTable, RefreshStats
+from circuit_breaker import CircuitState, CircuitStatus
+from clip_index import IndexedClip
 from config import AppConfig, Config
+from refresh_scheduler import RefreshCadence
 from state import AppState
 from telegram_bot import TelegramBot
 
@@ -48,10 +54,22 @@ def mock_blink_service() -> MagicMock:
     svc = MagicMock()
     svc.is_connected = True
     svc.list_all_cameras = MagicMock(return_value=[])
+    # Built from whatever list_all_cameras() is set to return.
+    type(svc).camera_table = PropertyMock(
+        side_effect=lambda: CameraTable.build(1, tuple(svc.list_all_cameras()))
+    )
     svc.has_camera = MagicMock(return_value=True)
     svc.snapshot = AsyncMock(return_value=None)
     svc.get_latest_clip = AsyncMock(return_value=None)
     svc.refresh = AsyncMock()
+    svc.refresh_stats = RefreshStats()
+    svc.refresh_cadence = MagicMock(
+        return_value=RefreshCadence(
+            interval_seconds=30, next_refresh_in_seconds=0, throttled=False
+        )
+    )
+    svc.circuit_status = MagicMock(return_value={})
+    svc.metrics = MagicMock(return_value={})
     svc.arm_cameras = AsyncMock(
         side_effect=lambda names: dict.fromkeys(names, True)
     )
@@ -103,6 +121,7 @@ def _make_context(args: list[str]) -> MagicMock:
     context.bot.send_message = AsyncMock()
     context.bot.send_photo = AsyncMock()
     context.bot.send_video = AsyncMock()
+    context.bot.send_media_group = AsyncMock()
     return context
 
 
@@ -249,6 +268,99 @@ async def test_status_shows_last_iteration_elapsed_time(
     assert "ago" in message.lower()
 
 
+@pytest.mark.asyncio
+async def test_status_shows_refresh_counters(
+    bot: TelegramBot, mock_blink_service: MagicMock
+) -> None:
+    mock_blink_service.refresh_stats = RefreshStats(
+        performed=4, coalesced=2, reused=1
+    )
+    context = await _send_command(bot, ["status"])
+    message = context.bot.send_message.call_args.kwargs["text"]
+    assert "Blink refreshes: 4 performed, 3 saved (2 shared, 1 reused)" in (
+        message
+    )
+
+
+@pytest.mark.asyncio
+async def test_status_shows_refresh_cadence(bot: TelegramBot) -> None:
+    context = await _send_command(bot, ["status"])
+    message = context.bot.send_message.call_args.kwargs["text"]
+    assert "Blink refresh cadence: every 30s\n" in message
+
+
+@pytest.mark.asyncio
+async def test_status_shows_backed_off_refresh_cadence(
+    bot: TelegramBot, mock_blink_service: MagicMock
+) -> None:
+    mock_blink_service.refresh_cadence.return_value = RefreshCadence(
+        interval_seconds=120, next_refresh_in_seconds=45, throttled=True
+    )
+    context = await _send_command(bot, ["status"])
+    message = context.bot.send_message.call_args.kwargs["text"]
+    assert (
+        "Blink refresh cadence: every 120s (backed off after throttling, "
+        "next in 45s)" in message
+    )
+
+
+@pytest.mark.asyncio
+async def test_status_shows_all_circuits_closed_when_healthy(
+    bot: TelegramBot,
+) -> None:
+    context = await _send_command(bot, ["status"])
+    message = context.bot.send_message.call_args.kwargs["text"]
+    assert "Blink API circuits: all closed" in message
+
+
+@pytest.mark.asyncio
+async def test_status_lists_open_circuits(
+    bot: TelegramBot, mock_blink_service: MagicMock
+) -> None:
+    mock_blink_service.circuit_status.return_value = {
+        "refresh": CircuitStatus(
+            state=CircuitState.OPEN,
+            consecutive_failures=3,
+            retry_in_seconds=42.4,
+        )
+    }
+    context = await _send_command(bot, ["status"])
+    message = context.bot.send_message.call_args.kwargs["text"]
+    assert "  refresh: open, retry in 42s (3 failure(s))" in message
+
+
+@pytest.mark.asyncio
+async def test_metrics_with_no_calls_recorded(bot: TelegramBot) -> None:
+    context = await _send_command(bot, ["metrics"])
+    message = context.bot.send_message.call_args.kwargs["text"]
+    assert message == "No Blink API calls recorded yet."
+
+
+@pytest.mark.asyncio
+async def test_metrics_lists_counts_and_percentiles_per_operation(
+    bot: TelegramBot, mock_blink_service: MagicMock
+) -> None:
+    refresh = OperationMetrics()
+    refresh.record(CallOutcome.SUCCESS, 0.2)
+    refresh.record(CallOutcome.TIMEOUT, 30)
+    arm = OperationMetrics()
+    arm.record(CallOutcome.REJECTED, None)
+    mock_blink_service.metrics.return_value = {
+        "refresh": refresh,
+        "arm_camera": arm,
+    }
+
+    context = await _send_command(bot, ["metrics"])
+    message = context.bot.send_message.call_args.kwargs["text"]
+
+    assert "  refresh: 1/1/0/0" in message
+    assert "p50 ≤0.25s, p95 ≤30.00s, max 30.00s, mean 15.10s" in message
+    assert "  arm_camera: 0/0/0/1" in message
+    # No latency line for an operation that never reached the API.
+    assert message.index("arm_camera") < message.index("refresh")
+    assert message.count("p50") == 1
+
+
 @pytest.mark.asyncio
 async def test_status_camera_section_uses_multiline_layout(
     bot: TelegramBot, app_config: AppConfig, mock_blink_service: MagicMock
@@ -794,14 +906,84 @@ async def test_snapshot_when_not_connected(
     assert "not connected" in message.lower()
 
 
+@pytest.mark.asyncio
+async def test_snapshot_all_sends_one_album(
+    bot: TelegramBot, app_config: AppConfig, mock_blink_service: MagicMock
+) -> None:
+    app_config.controlled_cameras = ["Backyard", "Garage", "Porch"]
+    mock_blink_service.snapshots = AsyncMock(
+        return_value={"Backyard": b"a", "Garage": None, "Porch": b"c"}
+    )
+    context = await _send_command(bot, ["snapshot", "all"])
+
+    mock_blink_service.snapshots.assert_awaited_once_with(
+        ["Backyard", "Garage", "Porch"]
+    )
+    mock_blink_service.snapshot.assert_not_awaited()
+    media = context.bot.send_media_group.call_args.kwargs["media"]
+    assert [item.caption for item in media] == ["Backyard", "Porch"]
+    message = context.bot.send_message.call_args.kwargs["text"]
+    assert message == "Could not get snapshot for: Garage."
+
+
+@pytest.mark.asyncio
+async def test_snapshot_all_single_image_sends_photo(
+    bot: TelegramBot, app_config: AppConfig, mock_blink_service: MagicMock
+) -> None:
+    app_config.controlled_cameras = ["Backyard"]
+    mock_blink_service.snapshots = AsyncMock(return_value={"Backyard": b"a"})
+    context = await _send_command(bot, ["snapshot", "ALL"])
+
+    context.bot.send_media_group.assert_not_awaited()
+    context.bot.send_photo.assert_awaited_once_with(
+        chat_id=CHAT_ID, photo=b"a", caption="Backyard"
+    )
+
+
+@pytest.mark.asyncio
+async def test_snapshot_all_splits_albums_of_ten(
+    bot: TelegramBot, app_config: AppConfig, mock_blink_service: MagicMock
+) -> None:
+    names = [f"Cam{i}" for i in range(12)]
+    app_config.controlled_cameras = names
+    mock_blink_service.snapshots = AsyncMock(
+        return_value=dict.fromkeys(names, b"x")
+    )
+    context = await _send_command(bot, ["snapshot", "all"])
+
+    sizes = [
+        len(call.kwargs["media"])
+        for call in context.bot.send_media_group.call_args_list
+    ]
+    assert sizes == [10, 2]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_all_without_controlled_cameras(
+    bot: TelegramBot, app_config: AppConfig, mock_blink_service: MagicMock
+) -> None:
+    app_config.controlled_cameras = []
+    mock_blink_service.snapshots = AsyncMock()
+
+    context = await _send_command(bot, ["snapshot", "all"])
+
+    mock_blink_service.snapshots.assert_not_awaited()
+    message = context.bot.send_message.call_args.kwargs["text"]
+    assert message == "No controlled cameras to snapshot."
+
+
 @pytest.mark.asyncio
 async def test_clip_sends_video(
     bot: TelegramBot, mock_blink_service: MagicMock
 ) -> None:
-    mock_blink_service.get_latest_clip.return_value = b"video"
+    clip_file = io.BytesIO(b"video")
+    mock_blink_service.get_latest_clip.return_value = clip_file
     context = await _send_command(bot, ["clip", "Backyard"])
     mock_blink_service.get_latest_clip.assert_awaited_once_with("Backyard")
     context.bot.send_video.assert_awaited_once()
+    video = context.bot.send_video.call_args.kwargs["video"]
+    assert video.input_file_content is clip_file
+    assert clip_file.closed
 
 
 @pytest.mark.asyncio
@@ -831,6 +1013,85 @@ async def test_clip_unknown_camera_name_sends_not_found(
     assert message == "No camera named 'Nonexistent' found."
 
 
+# --- clips ---
+
+
+def _indexed_clip(clip_time: datetime, local_path: str | None = None):
+    return IndexedClip(
+        camera_name="Front Door",
+        clip_time=clip_time,
+        media_id="1",
+        clip_url="https://rest.example.com/clip/1.mp4",
+        local_path=local_path,
+    )
+
+
+@pytest.mark.asyncio
+async def test_clips_lists_search_results(bot: TelegramBot) -> None:
+    bot.clip_index = MagicMock()
+    moment = datetime(2024, 6, 1, 18, 2, 11, tzinfo=timezone.utc)
+    bot.clip_index.search.return_value = [
+        _indexed_clip(moment, local_path="/mnt/usb/clip.mp4")
+    ]
+
+    context = await _send_command(
+        bot, ["clips", "Front", "Door", "2024-06-01", "2024-06-02T08:00"]
+    )
+
+    args, _ = bot.clip_index.search.call_args
+    name, start, end = args[:3]
+    assert name == "Front Door"
+    assert start == datetime(2024, 6, 1).astimezone()
+    assert end == datetime(2024, 6, 2, 8, 0).astimezone()
+    message = context.bot.send_message.call_args.kwargs["text"]
+    local = moment.astimezone().strftime("%Y-%m-%d %H:%M:%S")
+    assert f"{local} (archived)" in message
+
+
+@pytest.mark.asyncio
+async def test_clips_date_only_end_includes_whole_day(
+    bot: TelegramBot,
+) -> None:
+    bot.clip_index = MagicMock()
+    bot.clip_index.search.return_value = []
+
+    context = await _send_command(
+        bot, ["clips", "Backyard", "2024-06-01", "2024-06-01"]
+    )
+
+    args, _ = bot.clip_index.search.call_args
+    assert args[1:3] == (
+        datetime(2024, 6, 1).astimezone(),
+        datetime(2024, 6, 2).astimezone(),
+    )
+    message = context.bot.send_message.call_args.kwargs["text"]
+    assert message == "No clips found for camera 'Backyard'."
+
+
+@pytest.mark.asyncio
+async def test_clips_truncates_long_results(bot: TelegramBot) -> None:
+    bot.clip_index = MagicMock()
+    moment = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    bot.clip_index.search.return_value = [_indexed_clip(moment)] * 21
+
+    context = await _send_command(bot, ["clips", "Backyard"])
+
+    assert bot.clip_index.search.call_args.args[1:3] == (None, None)
+    message = context.bot.send_message.call_args.kwargs["text"]
+    assert "Showing the newest 20" in message
+
+
+@pytest.mark.asyncio
+async def test_clips_without_name_shows_usage(bot: TelegramBot) -> None:
+    bot.clip_index = MagicMock()
+
+    context = await _send_command(bot, ["clips", "2024-06-01"])
+
+    bot.clip_index.search.assert_not_called()
+    message = context.bot.send_message.call_args.kwargs["text"]
+    assert message.startswith("Usage: clips")
+
+
 # --- alerts on/off ---
 
 